@@ -0,0 +1,70 @@
+"""Comment handling shared by all the teams.
+
+A LaTeX comment starts at a '%' that is not escaped (\\% is a percent sign, \\\\%
+is a line break followed by a comment) and runs to the end of the line.
+All comments of a document are found in one regex pass. The result gives
+  - the list of comment intervals,
+  - a per-character mask answering "is this offset inside a comment" in O(1),
+  - the comment-stripped text and a map from its offsets back to the original."""
+from array import array
+from bisect import bisect_right
+import re
+
+# The even run of backslashes before the '%' belongs to the text, not to the comment
+COMMENT_PATTERN = re.compile(r'(?<!\\)((?:\\\\)*)%[^\n]*')
+
+
+class CommentMask:
+
+    def __init__(self, text):
+        self.text = text
+        self.intervals = []          # (start, end) of each comment, start at '%', end before the newline
+        self.mask = bytearray(len(text))
+        for match in COMMENT_PATTERN.finditer(text):
+            start = match.start() + len(match.group(1))
+            end = match.end()
+            self.intervals.append((start, end))
+            self.mask[start:end] = b'\x01' * (end - start)
+
+        # The stripped text is made of the pieces between comments.
+        # piece_starts[k] is where piece k starts in the stripped text, piece_origins[k] in the original.
+        pieces = []
+        self.piece_starts = array('q')
+        self.piece_origins = array('q')
+        stripped_length = 0
+        previous_end = 0
+        for start, end in self.intervals + [(len(text), len(text))]:
+            if start > previous_end or not pieces:
+                self.piece_starts.append(stripped_length)
+                self.piece_origins.append(previous_end)
+                pieces.append(text[previous_end:start])
+                stripped_length += start - previous_end
+            previous_end = end
+        self.stripped = ''.join(pieces)
+        self.comment_starts = array('q', (start for start, end in self.intervals))
+
+    def is_comment(self, offset):
+        """True when the character at offset belongs to a comment (the '%' included)."""
+        return 0 <= offset < len(self.mask) and self.mask[offset] == 1
+
+    def to_original(self, stripped_offset):
+        """Offset in the original text of a character of the stripped text."""
+        piece = bisect_right(self.piece_starts, stripped_offset) - 1
+        return self.piece_origins[piece] + stripped_offset - self.piece_starts[piece]
+
+    def strip_range(self, start, end):
+        """text[start:end] with the comments inside it removed, newlines are kept."""
+        pieces = []
+        position = start
+        first = max(bisect_right(self.comment_starts, start) - 1, 0)
+        for comment_start, comment_end in self.intervals[first:]:
+            if comment_start >= end:
+                break
+            if comment_end <= position:
+                continue
+            if comment_start > position:
+                pieces.append(self.text[position:comment_start])
+            position = max(position, comment_end)
+        if position < end:
+            pieces.append(self.text[position:end])
+        return ''.join(pieces)
@@ -0,0 +1,164 @@
+"""Structured findings of the teams and their JSON Lines and SARIF writers.
+
+A team builds its output with Findings: the headings, tables and counts of its section are
+text, every finding is a Diagnostic record with a team, a rule id, a line, a column when the
+team knows where the finding sits on its line, a severity and a message. Each record also
+holds the layout of its line in the log ("Line {line}: {message}\n", "ERROR in line:{line}   ..."),
+so the log section is rendered from the records and tools get the findings without parsing it.
+The result cache and the incremental state store the records as they are (see dump_output).
+
+Rule ids are '<check>.<rule>' where <check> is the rule id of the team in Common/registry.py,
+for example 'equation-punctuation.end-punctuation'."""
+import json
+
+from Common import registry
+
+SEVERITIES = ('error', 'warning', 'note')
+
+
+class Diagnostic:
+    # One finding, slotted so that a long list of them stays small
+    __slots__ = ('team', 'rule', 'line', 'column', 'severity', 'message', 'file', 'layout')
+
+    # What the writers and as_dict report, the layout only serves the log
+    FIELDS = ('team', 'rule', 'line', 'column', 'severity', 'message', 'file')
+
+    def __init__(self, team, rule, line, column, severity, message, file=None, layout="{message}\n"):
+        self.team = team
+        self.rule = rule
+        self.line = line            # 1-based, None when the finding is about the whole document
+        self.column = column        # 1-based, None when the team does not report it
+        self.severity = severity    # one of SEVERITIES
+        self.message = message
+        self.file = file            # file of a multi-file paper the line belongs to, None for the analyzed file
+        self.layout = layout        # format of the finding in the log, with {line}, {column} and {message}
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    def render(self):
+        """Text of the finding in the log, a finding without a line is shown on line 0."""
+        return self.layout.format(line=self.line or 0, column=self.column or 0, message=self.message)
+
+    def __eq__(self, other):
+        return isinstance(other, Diagnostic) and self.as_dict() == other.as_dict() and self.layout == other.layout
+
+    def __repr__(self):
+        return f"Diagnostic({self.team}, {self.rule}, line={self.line}, {self.severity}: {self.message!r})"
+
+
+def literal(text):
+    # text as a constant part of a layout, its braces escaped
+    return text.replace('{', '{{').replace('}', '}}')
+
+
+class Findings:
+    """Output of one team as it is built: text and Diagnostic records, in the order of the log.
+
+    append and extend add text as to a list. add builds a finding of the team with its rule
+    (the part after the check id), its message and either its line or its offset in the
+    document, the line and column are then read from the document. The layout and severity
+    given to the constructor are used unless the finding gives its own."""
+
+    def __init__(self, team, document=None, layout="Line {line}: {message}\n", severity='warning'):
+        self.team = team
+        self.check = registry.get(team).rule
+        self.document = document
+        self.layout = layout
+        self.severity = severity
+        self.output = []
+
+    def append(self, text):
+        self.output.append(text)
+
+    def extend(self, texts):
+        self.output.extend(texts)
+
+    def finding(self, rule, message, line=None, offset=None, column=None, severity=None, layout=None, file=None):
+        """The Diagnostic of a finding, without adding it to the output."""
+        if offset is not None:
+            line = self.document.lines.line_of(offset)
+            column = self.document.lines.column_of(offset)
+        return Diagnostic(self.team, f"{self.check}.{rule}", line, column, severity or self.severity, message,
+                          file, layout or self.layout)
+
+    def add(self, rule, message, line=None, offset=None, column=None, severity=None, layout=None, file=None):
+        diagnostic = self.finding(rule, message, line, offset, column, severity, layout, file)
+        self.output.append(diagnostic)
+        return diagnostic
+
+
+def render(output):
+    """The log text of a team output, its findings written with their layout."""
+    return [item.render() if isinstance(item, Diagnostic) else item for item in output]
+
+
+def records(output):
+    """The Diagnostics of a team output."""
+    return [item for item in output if isinstance(item, Diagnostic)]
+
+
+def over_budget(team, message):
+    """Output of a team stopped at its time or memory budget, written by the analyzer in its place."""
+    return [Diagnostic(team, 'analyzer.over-budget', None, None, 'error', message, layout=literal(team) + " : {message}\n")]
+
+
+def dump_output(output):
+    # JSON form of a team output, its findings as objects
+    return [item if isinstance(item, str) else dict(item.as_dict(), layout=item.layout) for item in output]
+
+
+def load_output(stored):
+    return [item if isinstance(item, str) else Diagnostic(**item) for item in stored]
+
+
+def write_jsonl(path, diagnostics, source=None):
+    # One JSON object per line, source is the analyzed file, given to the records without a file
+    with open(path, "w") as jsonl_file:
+        for diagnostic in diagnostics:
+            record = diagnostic.as_dict()
+            if record['file'] is None:
+                record['file'] = source
+            jsonl_file.write(json.dumps(record) + "\n")
+
+
+def sarif_log(diagnostics, source):
+    """SARIF 2.1.0 log of the diagnostics found in source (the path written in the locations)."""
+    rule_ids = sorted({diagnostic.rule for diagnostic in diagnostics})
+    rule_index = {rule: index for index, rule in enumerate(rule_ids)}
+    results = []
+    for diagnostic in diagnostics:
+        location = {"artifactLocation": {"uri": (diagnostic.file or source).replace("\\", "/")}}
+        if diagnostic.line is not None:
+            location["region"] = {"startLine": diagnostic.line}
+            if diagnostic.column is not None:
+                location["region"]["startColumn"] = diagnostic.column
+        results.append({
+            "ruleId": diagnostic.rule,
+            "ruleIndex": rule_index[diagnostic.rule],
+            "level": diagnostic.severity,
+            "message": {"text": diagnostic.message},
+            "locations": [{"physicalLocation": location}],
+            "properties": {"team": diagnostic.team},
+        })
+    return {
+        "$schema": "https://json.schemastore.org/sarif-2.1.0.json",
+        "version": "2.1.0",
+        "runs": [{
+            "tool": {"driver": {
+                "name": "Research-Article-Analyzer",
+                "informationUri": "https://github.com/Sarvendranathiittp/Research-Article-Analyzer",
+                "rules": [{"id": rule} for rule in rule_ids],
+            }},
+            "results": results,
+        }],
+    }
+
+
+def write_sarif(path, diagnostics, source):
+    with open(path, "w") as sarif_file:
+        json.dump(sarif_log(diagnostics, source), sarif_file, indent=2)
+
+
+# Output formats by name, each writer takes (path, diagnostics, source)
+WRITERS = {'jsonl': write_jsonl, 'sarif': write_sarif}
@@ -0,0 +1,234 @@
+"""Parsed view of one LaTeX document shared by all the teams.
+
+The raw code is scanned once when the Document is created. Every piece the teams
+look for (title, authors, abstract, keywords, sections, environments and the
+bibliography) is stored together with its character offsets in the raw code, so a
+team can slice the original text or convert an offset to a line number without
+searching the whole file again.
+
+The references of a paper that uses BibTeX are in the .bbl file next to it. Its text can be
+given with the LaTeX code, it is parsed as a document of its own (Document.bbl) and its
+bibliography is read together with any thebibliography environment of the paper."""
+import re
+from bisect import bisect_right
+from collections import namedtuple
+
+from Common.comments import CommentMask
+from Common.lineindex import LineIndex
+from Common.mathindex import MathIndex
+from Common.sentences import SentenceIndex
+
+# Text of a command argument or environment body and where it sits in the raw code
+Field = namedtuple('Field', ['text', 'start', 'end'])
+
+# \begin{name} ... \end{name} : start/end enclose the whole environment,
+# body_start/body_end only its content
+Environment = namedtuple('Environment', ['name', 'start', 'end', 'body_start', 'body_end'])
+
+# \section{title} : level 1, \subsection 2, \subsubsection 3.
+# start/end cover the heading and the text up to the next heading of the same or a higher level
+Section = namedtuple('Section', ['level', 'command', 'title', 'title_start', 'title_end', 'start', 'end'])
+
+# \bibitem{key} followed by the reference text up to the next \bibitem
+BibItem = namedtuple('BibItem', ['key', 'text', 'start', 'end'])
+
+SECTION_LEVELS = {'section': 1, 'subsection': 2, 'subsubsection': 3}
+
+# One alternation finds every token the model is built from, tokens inside comments are skipped
+_TOKEN_PATTERN = re.compile(
+    r'\\(begin|end)\s*\{([^{}]*)\}'
+    r'|\\(title|author|section|subsection|subsubsection|bibitem)(?![a-zA-Z])\*?'
+)
+
+
+def brace_group(text, index):
+    """Returns (start, end) of the content of the {...} group that opens at or after index,
+    skipping whitespace and one optional [...] argument. Nested braces are balanced.
+    Returns None when no group follows."""
+    length = len(text)
+    while index < length and text[index] in ' \t\n':
+        index += 1
+    if index < length and text[index] == '[':
+        close = text.find(']', index)
+        if close == -1:
+            return None
+        index = close + 1
+        while index < length and text[index] in ' \t\n':
+            index += 1
+    if index >= length or text[index] != '{':
+        return None
+    depth = 0
+    i = index
+    while i < length:
+        char = text[i]
+        if char == '\\':
+            i += 2  # \{ and \} are literal braces
+            continue
+        if char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return index + 1, i
+        i += 1
+    return None
+
+
+class Document:
+
+    def __init__(self, latex_code, bbl_text='', bbl_name=''):
+        self.text = latex_code
+        self.document_start = -1    # index of \begin{document}, -1 when missing
+        self.text_end = len(latex_code)  # where the main text stops: bibliography or \end{document}
+        self.title = None           # Field
+        self.authors = []           # Field for every \author{...}
+        self.abstract = None        # Field
+        self.keywords = None        # Field of the IEEEkeywords body
+        self.sections = []          # Section
+        self.environments = []      # Environment, in order of their \begin
+        self.bibliography = None    # Field of the thebibliography body
+        self.bibitems = []          # BibItem
+        self.lines = LineIndex(latex_code)
+        self.comments = CommentMask(latex_code)
+        self.math = MathIndex(latex_code, self.comments)
+        self._parse()
+        self.bbl = Document(bbl_text) if bbl_text else None  # parsed .bbl file
+        self.bbl_name = bbl_name    # name of the .bbl file, for reporting
+        self._sentences = None
+
+    def _parse(self):
+        text = self.text
+        open_envs = []
+        bibitem_starts = []
+        for match in _TOKEN_PATTERN.finditer(text):
+            if self.comments.is_comment(match.start()):
+                continue
+            if match.group(1):
+                name = match.group(2).strip()
+                if match.group(1) == 'begin':
+                    open_envs.append((name, match.start(), match.end()))
+                else:
+                    # Close the innermost environment with this name, dropping unclosed ones above it
+                    for depth in range(len(open_envs) - 1, -1, -1):
+                        if open_envs[depth][0] == name:
+                            env_name, start, body_start = open_envs[depth]
+                            del open_envs[depth:]
+                            self.environments.append(
+                                Environment(env_name, start, match.end(), body_start, match.start()))
+                            break
+            elif match.group(3):
+                command = match.group(3)
+                if command == 'bibitem':
+                    bibitem_starts.append(match.start())
+                    continue
+                group = brace_group(text, match.end())
+                if group is None:
+                    continue
+                field = Field(text[group[0]:group[1]], group[0], group[1])
+                if command == 'title':
+                    if self.title is None:
+                        self.title = field
+                elif command == 'author':
+                    self.authors.append(field)
+                else:
+                    self.sections.append(Section(SECTION_LEVELS[command], command, field.text,
+                                                 field.start, field.end, match.start(), None))
+        self.environments.sort(key=lambda env: env.start)
+
+        for env in self.environments:
+            body = Field(text[env.body_start:env.body_end], env.body_start, env.body_end)
+            if env.name == 'document' and self.document_start == -1:
+                self.document_start = env.start
+                self.text_end = min(self.text_end, env.body_end)
+            elif env.name == 'abstract' and self.abstract is None:
+                self.abstract = body
+            elif env.name == 'IEEEkeywords' and self.keywords is None:
+                self.keywords = body
+            elif env.name == 'thebibliography' and self.bibliography is None:
+                self.bibliography = body
+                self.text_end = min(self.text_end, env.start)
+        if self.document_start == -1:
+            # \begin{document} without its \end still marks where the text begins
+            for name, start, body_start in open_envs:
+                if name == 'document':
+                    self.document_start = start
+                    break
+
+        self._close_sections()
+        self._collect_bibitems(bibitem_starts)
+
+    def _close_sections(self):
+        # A section runs until the next heading of the same or a higher level
+        closed = []
+        for i, section in enumerate(self.sections):
+            end = self.text_end
+            for following in self.sections[i + 1:]:
+                if following.level <= section.level:
+                    end = following.start
+                    break
+            closed.append(section._replace(end=max(end, section.title_end)))
+        self.sections = closed
+
+    def _collect_bibitems(self, bibitem_starts):
+        if self.bibliography is None:
+            return
+        starts = [start for start in bibitem_starts
+                  if self.bibliography.start <= start < self.bibliography.end]
+        for i, start in enumerate(starts):
+            end = starts[i + 1] if i + 1 < len(starts) else self.bibliography.end
+            group = brace_group(self.text, start + len('\\bibitem'))
+            key = self.text[group[0]:group[1]] if group else ''
+            self.bibitems.append(BibItem(key, self.text[start:end], start, end))
+
+    def bibliography_sources(self):
+        """The documents holding a thebibliography environment: this one, its .bbl file or both."""
+        return [document for document in (self, self.bbl) if document is not None and document.bibliography is not None]
+
+    def bibliography_text(self):
+        """Body of the thebibliography environment, those of the paper and of the .bbl file joined
+        when there are both. None when the paper has no bibliography."""
+        sources = self.bibliography_sources()
+        if not sources:
+            return None
+        return "\n".join(document.bibliography.text.strip() for document in sources)
+
+    def environments_named(self, *names):
+        """Environments with one of the given names, in document order."""
+        return [env for env in self.environments if env.name in names]
+
+    def body(self, env):
+        return self.text[env.body_start:env.body_end]
+
+    def prose_range(self, start, end, replacement=' '):
+        """text[start:end] with its comments removed and every math region replaced by replacement."""
+        cuts = [(region.start, region.end, replacement) for region in self.math.overlapping(start, end)]
+        first = max(bisect_right(self.comments.comment_starts, start) - 1, 0)
+        for comment_start, comment_end in self.comments.intervals[first:]:
+            if comment_start >= end:
+                break
+            if comment_end > start:
+                cuts.append((comment_start, comment_end, ''))
+        cuts.sort()
+        pieces = []
+        position = start
+        for cut_start, cut_end, cut_replacement in cuts:
+            if cut_end <= position:
+                continue
+            if cut_start > position:
+                pieces.append(self.text[position:cut_start])
+            pieces.append(cut_replacement)
+            position = cut_end
+        if position < end:
+            pieces.append(self.text[position:end])
+        return ''.join(pieces)
+
+    @property
+    def sentences(self):
+        """SentenceIndex of the body, built the first time a team asks for it."""
+        if self._sentences is None:
+            self._sentences = SentenceIndex(self)
+        return self._sentences
+
+    def line_of(self, offset):
+        """1-based line number of a character offset in the raw code."""
+        return self.lines.line_of(offset)
@@ -0,0 +1,166 @@
+"""Incremental re-analysis between revisions of the same paper.
+
+After a run, the state of the document is stored next to its log. For every team it holds
+a fingerprint of the regions the team reads and the output the team produced.
+On the next revision the fingerprints are computed again. A team whose regions did not
+change is not run, its stored output is reused with the line numbers moved to where the
+same lines sit in the new revision (the old and new lines are matched with difflib): the line
+of every finding, and the line references written in the text and the messages."""
+import difflib
+import hashlib
+import json
+import os
+import re
+
+from Common.diagnostics import Diagnostic, dump_output, load_output
+
+STATE_FORMAT = 2
+
+# Regions read by each team, a team missing here depends on the whole text.
+# team_5 is not listed: besides the equations it reads the first word after each of them.
+TEAM_REGIONS = {
+    'team_1': ('title', 'authors'),
+    'team_6': ('sections',),
+    'team_8': ('bibliography', 'citations'),
+}
+
+# Directories whose code decides the output, relative to the Main folder
+CHECKER_DIRECTORIES = ('Common', 'Team_1', 'Team_2', 'Team_3', 'Team_4', 'Team_5', 'Team_6',
+                       'Team_7', 'Team_8')
+
+_CITE_PATTERN = re.compile(r'\\cite{([^}]+)}')
+
+# "Line 12", "line no is 12", "line no is: 12", "ERROR in line:12", "at lines 12, 40, 41"
+LINE_REFERENCE = re.compile(r'(Line |line no is:? |ERROR in line:)(\d+)|(at lines )(\d+(?:, \d+)*)')
+
+_checker_version = None
+
+
+def checker_version():
+    """Hash of the source code of every checker, a change in any of them invalidates stored outputs."""
+    global _checker_version
+    if _checker_version is None:
+        main_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        digest = hashlib.sha256()
+        for directory in CHECKER_DIRECTORIES:
+            for root, dirs, files in sorted(os.walk(os.path.join(main_dir, directory))):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.endswith('.py'):
+                        with open(os.path.join(root, name), 'rb') as source:
+                            digest.update(name.encode())
+                            digest.update(source.read())
+        _checker_version = digest.hexdigest()
+    return _checker_version
+
+
+def region_pieces(document, region):
+    """Pieces of text that make up one region of the document."""
+    if region == 'title':
+        return [document.title.text] if document.title else []
+    if region == 'authors':
+        return [author.text for author in document.authors]
+    if region == 'sections':
+        return [section.command + '{' + section.title + '}' for section in document.sections]
+    if region == 'bibliography':
+        return [document.bibliography_text() or '']
+    if region == 'citations':
+        return _CITE_PATTERN.findall(document.text)
+    return [document.text]
+
+
+def fingerprint(document, begin_index, team_name):
+    """Hash of everything a team reads from the document."""
+    digest = hashlib.sha256(str(begin_index).encode())
+    for region in TEAM_REGIONS.get(team_name, ('text',)):
+        digest.update(b'\x00' + region.encode())
+        for piece in region_pieces(document, region):
+            digest.update(b'\x01' + piece.encode('utf-8', 'surrogatepass'))
+    return digest.hexdigest()
+
+
+def line_map(old_text, new_text):
+    """Maps the 1-based number of every unchanged old line to its number in the new text."""
+    matcher = difflib.SequenceMatcher(None, old_text.split('\n'), new_text.split('\n'), autojunk=False)
+    mapping = {}
+    for tag, old_start, old_end, new_start, new_end in matcher.get_opcodes():
+        if tag == 'equal':
+            for offset in range(old_end - old_start):
+                mapping[old_start + offset + 1] = new_start + offset + 1
+    return mapping
+
+
+def _moved(number, mapping):
+    new_number = mapping.get(int(number))
+    if new_number is None:
+        raise KeyError(number)
+    # Keep the zero padding of formats such as {line:04d}
+    return str(new_number).zfill(len(number)) if number.startswith('0') else str(new_number)
+
+
+def remap_lines(output, mapping):
+    """output with every line number moved through mapping.
+    Returns None when one of the lines does not exist any more, the team must then run again."""
+    def replace(match):
+        if match.group(1):
+            return match.group(1) + _moved(match.group(2), mapping)
+        return match.group(3) + ', '.join(_moved(number, mapping) for number in match.group(4).split(', '))
+
+    def moved(item):
+        if isinstance(item, str):
+            return LINE_REFERENCE.sub(replace, item)
+        line = item.line
+        if line is not None and item.file is None:  # a line of the .bbl file does not move with the paper
+            line = mapping.get(line)
+            if line is None:
+                raise KeyError(item.line)
+        return Diagnostic(item.team, item.rule, line, item.column, item.severity,
+                          LINE_REFERENCE.sub(replace, item.message), item.file, item.layout)
+
+    try:
+        return [moved(item) for item in output]
+    except KeyError:
+        return None
+
+
+def load_state(path):
+    """Stored state of a previous run, None when there is none or it was made by other checkers."""
+    try:
+        with open(path, 'r', encoding='utf-8') as state_file:
+            state = json.load(state_file)
+    except (OSError, ValueError):
+        return None
+    if state.get('format') != STATE_FORMAT or state.get('version') != checker_version():
+        return None
+    return state
+
+
+def save_state(path, text, begin_index, fingerprints, outputs):
+    # outputs holds the output of every team that ran without error, by team name
+    state = {
+        'format': STATE_FORMAT,
+        'version': checker_version(),
+        'text': text,
+        'begin_index': begin_index,
+        'teams': {name: {'fingerprint': fingerprints[name], 'output': dump_output(output)}
+                  for name, output in outputs.items()},
+    }
+    with open(path, 'w', encoding='utf-8') as state_file:
+        json.dump(state, state_file)
+
+
+def reusable_outputs(state, text, fingerprints):
+    """Outputs of the previous run that are still valid for text, by team name."""
+    if state is None:
+        return {}
+    unchanged = {name: load_output(team['output']) for name, team in state['teams'].items()
+                 if fingerprints.get(name) == team['fingerprint']}
+    if not unchanged or state['text'] == text:
+        return unchanged
+    mapping = line_map(state['text'], text)
+    reused = {}
+    for name, output in unchanged.items():
+        remapped = remap_lines(output, mapping)
+        if remapped is not None:
+            reused[name] = remapped
+    return reused
@@ -0,0 +1,44 @@
+"""Offset to line number conversion shared by all the teams.
+
+The offsets where each line starts are computed once and kept in a compact
+array, so finding the line of any character is a binary search instead of
+counting newlines from the start of the file."""
+from array import array
+from bisect import bisect_right
+import re
+
+_NEWLINE = re.compile('\n')
+
+
+class LineIndex:
+
+    def __init__(self, text):
+        self.length = len(text)
+        # starts[k] is the offset of the first character of line k + 1
+        self.starts = array('q', [0])
+        self.starts.extend(match.end() for match in _NEWLINE.finditer(text))
+
+    def __len__(self):
+        # Number of lines, a trailing newline opens an empty last line
+        return len(self.starts)
+
+    def line_of(self, offset):
+        """1-based line number of the character at offset.
+        Offsets before the text are on line 1, offsets past its end on the last line."""
+        if offset < 0:
+            return 1
+        return bisect_right(self.starts, offset)
+
+    def line_start(self, line):
+        """Offset of the first character of a 1-based line."""
+        return self.starts[line - 1]
+
+    def line_end(self, line):
+        """Offset just past the last character of a 1-based line, its newline excluded."""
+        if line < len(self.starts):
+            return self.starts[line] - 1
+        return self.length
+
+    def column_of(self, offset):
+        """1-based column of the character at offset."""
+        return offset - self.starts[self.line_of(offset) - 1] + 1
@@ -0,0 +1,114 @@
+"""Math regions of a LaTeX document, found in a single pass.
+
+Every region is tagged with its kind:
+  'inline'   for $...$, \\(...\\) and \\begin{math}...\\end{math},
+  'display'  for $$...$$ and \\[...\\],
+  the environment name for display environments such as 'equation' or 'align*'.
+The regions are kept sorted and do not overlap (a nested environment belongs to the
+region that contains it), so "is this offset inside math" is a binary search."""
+from array import array
+from bisect import bisect_right
+from collections import namedtuple
+import re
+
+# start/end enclose the delimiters, body_start/body_end only the math
+MathRegion = namedtuple('MathRegion', ['kind', 'start', 'end', 'body_start', 'body_end'])
+
+MATH_ENVIRONMENTS = (
+    'equation', 'align', 'gather', 'multline', 'flalign', 'alignat', 'eqnarray',
+    'IEEEeqnarray', 'displaymath', 'math',
+)
+
+INLINE = 'inline'
+DISPLAY = 'display'
+
+# \\ and \$ are consumed first so that a line break followed by [ and an escaped dollar
+# are never taken for math delimiters
+_MATH_TOKEN = re.compile(
+    r'\\\\|\\\$'
+    r'|\\(begin|end)\s*\{((?:' + '|'.join(MATH_ENVIRONMENTS) + r')\*?)\}'
+    r'|\$\$|\$|\\\(|\\\)|\\\[|\\\]'
+)
+
+# Closing token expected for each opening token
+_CLOSERS = {'$': '$', '$$': '$$', '\\(': '\\)', '\\[': '\\]'}
+
+
+class MathIndex:
+
+    def __init__(self, text, comments=None):
+        self.text = text
+        self.regions = []
+        opened = None   # (kind, closing token, start, body_start)
+        for match in _MATH_TOKEN.finditer(text):
+            token = match.group(0)
+            if token == '\\\\' or token == '\\$':
+                continue
+            if comments is not None and comments.is_comment(match.start()):
+                continue
+            if opened is None:
+                if match.group(1) == 'begin':
+                    name = match.group(2)
+                    kind = INLINE if name == 'math' else name
+                    opened = (kind, '\\end{' + name + '}', match.start(), match.end())
+                elif token in _CLOSERS:
+                    kind = INLINE if token in ('$', '\\(') else DISPLAY
+                    opened = (kind, _CLOSERS[token], match.start(), match.end())
+            else:
+                closer = '\\end{' + match.group(2) + '}' if match.group(1) == 'end' else token
+                if closer == opened[1]:
+                    kind, closing, start, body_start = opened
+                    self.regions.append(MathRegion(kind, start, match.end(), body_start, match.start()))
+                    opened = None
+        self.starts = array('q', (region.start for region in self.regions))
+
+    def region_at(self, offset):
+        """The region whose delimiters enclose offset, or None."""
+        k = bisect_right(self.starts, offset) - 1
+        if k >= 0 and offset < self.regions[k].end:
+            return self.regions[k]
+        return None
+
+    def is_math(self, offset):
+        """True when offset is inside the body of a math region."""
+        region = self.region_at(offset)
+        return region is not None and region.body_start <= offset < region.body_end
+
+    def is_inline(self, offset):
+        region = self.region_at(offset)
+        return region is not None and region.kind == INLINE and region.body_start <= offset < region.body_end
+
+    def is_display(self, offset):
+        region = self.region_at(offset)
+        return region is not None and region.kind != INLINE and region.body_start <= offset < region.body_end
+
+    def inline(self):
+        return [region for region in self.regions if region.kind == INLINE]
+
+    def display(self):
+        """$$...$$, \\[...\\] and the display environments."""
+        return [region for region in self.regions if region.kind != INLINE]
+
+    def overlapping(self, start, end):
+        """Regions that share at least one character with text[start:end]."""
+        k = max(bisect_right(self.starts, start) - 1, 0)
+        found = []
+        for region in self.regions[k:]:
+            if region.start >= end:
+                break
+            if region.end > start:
+                found.append(region)
+        return found
+
+    def strip_range(self, start, end, replacement=' '):
+        """text[start:end] with every math region (delimiters included) replaced by replacement."""
+        pieces = []
+        position = start
+        for region in self.overlapping(start, end):
+            if region.start > position:
+                pieces.append(self.text[position:region.start])
+            pieces.append(replacement)
+            position = max(position, region.end)
+        if position < end:
+            pieces.append(self.text[position:end])
+        return ''.join(pieces)
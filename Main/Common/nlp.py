@@ -0,0 +1,96 @@
+"""Lazy, offline access to NLTK and tabulate.
+
+Importing a team must stay cheap, so neither library is imported before a check needs it.
+NLTK resources are looked up in the bundled Resources/nltk_data directory first (then in the
+usual NLTK locations and $NLTK_DATA). Nothing is ever downloaded: a missing resource raises a
+LookupError that says which resource to add to the bundled directory. The entry points call
+require_all before a run that includes an 'nlp' check, so missing data stops the run at once
+with one message instead of failing inside each team."""
+import os
+
+NLTK_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                             'Resources', 'nltk_data')
+
+# Resource path for each NLTK feature used by the teams, several names are accepted
+# because the resources were renamed across NLTK versions
+RESOURCES = {
+    'tokenizer': ('tokenizers/punkt_tab/english/', 'tokenizers/punkt/english.pickle'),
+    'tagger': ('taggers/averaged_perceptron_tagger_eng/', 'taggers/averaged_perceptron_tagger/'),
+}
+
+_nltk = None
+_tabulate = None
+_found = set()   # features whose resource was already found
+
+
+def nltk():
+    """The nltk module, imported on first use with the bundled data directory searched first."""
+    global _nltk
+    if _nltk is None:
+        import nltk as nltk_module
+        if NLTK_DATA_DIR not in nltk_module.data.path:
+            nltk_module.data.path.insert(0, NLTK_DATA_DIR)
+        _nltk = nltk_module
+    return _nltk
+
+
+def _installed(feature):
+    module = nltk()
+    for resource in RESOURCES[feature]:
+        try:
+            module.data.find(resource)
+            return True
+        except LookupError:
+            continue
+    return False
+
+
+def _install_hint(names):
+    return (f"NLTK resource(s) {', '.join(repr(name) for name in names)} not found. Add them to {NLTK_DATA_DIR} with\n"
+            f"    python -m nltk.downloader -d {NLTK_DATA_DIR} {' '.join(names)}")
+
+
+def missing_resources():
+    """Names of the NLTK resources needed by the teams that are not installed."""
+    missing = []
+    for feature in RESOURCES:
+        if feature in _found or _installed(feature):
+            _found.add(feature)
+        else:
+            missing.append(RESOURCES[feature][0].split('/')[1])
+    return missing
+
+
+def require_all():
+    """Raises LookupError naming every missing resource, so a run can stop before any team starts."""
+    missing = missing_resources()
+    if missing:
+        raise LookupError(_install_hint(missing))
+
+
+def require(feature):
+    """Raises LookupError when no version of the resource behind feature is installed."""
+    if feature in _found:
+        return
+    if _installed(feature):
+        _found.add(feature)
+        return
+    raise LookupError(_install_hint([RESOURCES[feature][0].split('/')[1]]))
+
+
+def word_tokenize(text):
+    require('tokenizer')
+    return nltk().word_tokenize(text)
+
+
+def pos_tag(tokens):
+    require('tagger')
+    return nltk().pos_tag(tokens)
+
+
+def tabulate(*args, **kwargs):
+    global _tabulate
+    if _tabulate is None:
+        from tabulate import tabulate as tabulate_function
+        _tabulate = tabulate_function
+    return _tabulate(*args, **kwargs)
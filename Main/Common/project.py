@@ -0,0 +1,198 @@
+"""Papers split across several files with \\input, \\include and \\subfile.
+
+The main file and every file it includes, recursively, are read side by side on a thread pool,
+one level of the include tree at a time. The include commands are then replaced by the text of
+their files, giving one virtual document that the teams analyze as if it were a single file.
+A source map remembers where every piece of the virtual text was copied from, so a line of the
+virtual document can be reported at its original file and line.
+
+Includes inside comments are ignored. An include of a file that cannot be found, or of a file
+that is already being expanded (a cycle), is left as it is and reported in Project.problems.
+So is a second include of a file already expanded: its text is analyzed once, and every
+finding in it is reported once, at its original file and line."""
+import os
+import re
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+
+from Common.comments import CommentMask
+from Common.incremental import LINE_REFERENCE
+from Common.lineindex import LineIndex
+
+_INCLUDE = re.compile(r'\\(input|include|subfile)\s*\{([^{}#]*)\}')
+_DOCUMENT_BODY = re.compile(r'\\begin\s*\{document\}(.*?)\\end\s*\{document\}', re.DOTALL)
+
+READ_THREADS = 8
+
+
+def _read(path):
+    try:
+        with open(path, 'r', errors='ignore') as file:
+            return file.read()
+    except OSError:
+        return None
+
+
+def _includes(text):
+    # (match, command, name) of every include outside comments
+    comments = CommentMask(text)
+    return [(match, match.group(1), match.group(2).strip()) for match in _INCLUDE.finditer(text)
+            if not comments.is_comment(match.start())]
+
+
+def _resolve(name, including_dir, root_dir):
+    """Path of an included file, None when it does not exist. Like LaTeX, 'name.tex' is tried
+    before 'name', next to the including file, then next to the main file."""
+    names = [name] if name.endswith('.tex') else [name + '.tex', name]
+    for directory in dict.fromkeys((including_dir, root_dir)):
+        for candidate in names:
+            path = os.path.normpath(os.path.join(directory, candidate))
+            if os.path.isfile(path):
+                return path
+    return None
+
+
+class SourceMap:
+    """Where every piece of the virtual text comes from.
+    Piece k starts at virtual_starts[k] and was copied from files[file_indexes[k]] at file_starts[k]."""
+
+    def __init__(self):
+        self.files = []
+        self.texts = []
+        self.virtual_starts = array('q')
+        self.file_indexes = array('i')
+        self.file_starts = array('q')
+        self._line_indexes = {}
+
+    def add(self, virtual_start, path, text, file_start):
+        if path not in self.files:
+            self.files.append(path)
+            self.texts.append(text)
+        self.virtual_starts.append(virtual_start)
+        self.file_indexes.append(self.files.index(path))
+        self.file_starts.append(file_start)
+
+    def locate(self, offset):
+        """(path, offset in that file) of an offset of the virtual text."""
+        k = max(bisect_right(self.virtual_starts, offset) - 1, 0)
+        return self.files[self.file_indexes[k]], self.file_starts[k] + offset - self.virtual_starts[k]
+
+    def line_in_file(self, path, offset):
+        lines = self._line_indexes.get(path)
+        if lines is None:
+            lines = self._line_indexes[path] = LineIndex(self.texts[self.files.index(path)])
+        return lines.line_of(offset)
+
+
+class Project:
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self.root_dir = os.path.dirname(self.root)
+        self.problems = []      # one sentence for every include that could not be expanded
+        self.sources = SourceMap()
+        texts = self._read_all()
+        if texts[self.root] is None:
+            raise OSError(f"Cannot read {root}")
+        pieces = []
+        self._length = 0
+        self._expanded = {}  # path of every included file -> where it was included first
+        self._expand(self.root, texts[self.root], 0, len(texts[self.root]), texts, [self.root], pieces)
+        if not pieces:
+            self.sources.add(0, self.root, texts[self.root], 0)
+        self.text = "".join(pieces)
+        self.lines = LineIndex(self.text)
+        # Every file read for the project, the main file first
+        self.files = [path for path, text in texts.items() if text is not None]
+
+    def _read_all(self):
+        # Text of every reachable file by path (None when it cannot be read), read one level at a time
+        texts = {}
+        self._includes = {}  # path -> (match, command, name, resolved path) of each of its includes
+        level = [self.root]
+        with ThreadPoolExecutor(max_workers=READ_THREADS) as pool:
+            while level:
+                next_level = []
+                for path, text in zip(level, pool.map(_read, level)):
+                    texts[path] = text
+                    includes = []
+                    for match, command, name in _includes(text or ''):
+                        target = _resolve(name, os.path.dirname(path), self.root_dir)
+                        includes.append((match, command, name, target))
+                        if target is not None and target not in texts and target not in level \
+                                and target not in next_level:
+                            next_level.append(target)
+                    self._includes[path] = includes
+                level = next_level
+        return texts
+
+    def _copy(self, path, text, start, end, pieces):
+        if end > start:
+            self.sources.add(self._length, path, text, start)
+            pieces.append(text[start:end])
+            self._length += end - start
+
+    def _expand(self, path, text, start, end, texts, stack, pieces):
+        # Copies text[start:end] of path into pieces, with its includes replaced by their text
+        position = start
+        for match, command, name, target in self._includes[path]:
+            if match.start() < start or match.end() > end:
+                continue
+            line = text.count('\n', 0, match.start()) + 1
+            where = f"line {line} of {self.relative(path)}"
+            if target is None:
+                self.problems.append(f"\\{command}{{{name}}} ({where}) : file not found.")
+                continue
+            if target in stack:
+                cycle = " -> ".join(self.relative(file) for file in stack[stack.index(target):] + [target])
+                self.problems.append(f"\\{command}{{{name}}} ({where}) : include cycle {cycle}.")
+                continue
+            if target in self._expanded:
+                self.problems.append(f"\\{command}{{{name}}} ({where}) : already included at {self._expanded[target]}.")
+                continue
+            included = texts[target]
+            if included is None:
+                self.problems.append(f"\\{command}{{{name}}} ({where}) : file cannot be read.")
+                continue
+            self._expanded[target] = where
+            self._copy(path, text, position, match.start(), pieces)
+            body_start, body_end = 0, len(included)
+            if command == 'subfile':
+                # A subfile is a complete document, only its body is part of the main one
+                body = _DOCUMENT_BODY.search(included)
+                if body:
+                    body_start, body_end = body.span(1)
+            self._expand(target, included, body_start, body_end, texts, stack + [target], pieces)
+            position = match.end()
+        self._copy(path, text, position, end, pieces)
+
+    def relative(self, path):
+        return os.path.relpath(path, self.root_dir)
+
+    def origin(self, line):
+        """(path, line) in the original file of a 1-based line of the virtual document."""
+        path, offset = self.sources.locate(self.lines.line_start(min(max(line, 1), len(self.lines))))
+        return path, self.sources.line_in_file(path, offset)
+
+    def is_multi_file(self):
+        # True when the virtual document holds text of more than one file
+        return len(self.sources.files) > 1
+
+    def where(self, line):
+        path, original_line = self.origin(line)
+        return f"{original_line} ({self.relative(path)})"
+
+    def annotate(self, output):
+        """output with every line number of the virtual document replaced by the original file and line."""
+        def replace(match):
+            if match.group(1):
+                return match.group(1) + self.where(int(match.group(2)))
+            return match.group(3) + ', '.join(self.where(int(number)) for number in match.group(4).split(', '))
+
+        return [LINE_REFERENCE.sub(replace, log) for log in output]
+
+
+def load_project(root):
+    """The Project of a main .tex file, with every included file expanded."""
+    return Project(root)
@@ -0,0 +1,83 @@
+"""Registry of the checks the analyzer can run.
+
+Every check is registered with a rule id, the team class that implements it, the module that
+class lives in and a cost class. Registering a check imports nothing: the module of a check is
+imported the first time the check runs, so a check left out of a run costs neither startup nor
+run time. The rule id of a check is also the prefix of the rules of the Diagnostics it reports.
+
+A run selects checks by rule id, by team name or by cost class:
+
+    select(include=['equation-punctuation', 'bibliography'])
+    select(exclude=['nlp'])"""
+import importlib
+from collections import namedtuple
+
+Check = namedtuple('Check', ['rule', 'team', 'module', 'cost', 'title'])
+
+# fast : linear scans of the text
+# slow : noticeably slower on long papers (seconds on a full journal article, or superlinear)
+# nlp  : loads the NLTK tokenizer and tagger
+COST_CLASSES = ('fast', 'slow', 'nlp')
+
+# Registered checks, in the order their sections appear in the log
+CHECKS = []
+
+_classes = {}   # team name -> class, filled as the modules are imported
+
+
+def register(rule, team, module, cost, title):
+    if cost not in COST_CLASSES:
+        raise ValueError(f"Unknown cost class '{cost}' for rule '{rule}'")
+    if any(check.rule == rule or check.team == team for check in CHECKS):
+        raise ValueError(f"Rule '{rule}' or team '{team}' is already registered")
+    check = Check(rule, team, module, cost, title)
+    CHECKS.append(check)
+    return check
+
+
+register('title-authors', 'team_1', 'Team_1.Task', 'nlp', "Title and authors")
+register('acronyms', 'team_2', 'Team_2.task', 'fast', "Abstract, keywords and acronyms")
+register('scientist-names', 'team_3', 'Team_3.task', 'slow', "Scientist names")
+register('units', 'team_4', 'Team_4.task', 'fast', "Units and ellipses")
+register('equation-punctuation', 'team_5', 'Team_5.task', 'slow', "Equation punctuation")
+register('heading-case', 'team_6', 'Team_6.task', 'nlp', "Title case of headings")
+register('math-style', 'team_7', 'Team_7.main', 'fast', "Numbers and inline math")
+register('bibliography', 'team_8', 'Team_8.code_tex', 'fast', "Bibliography and citations")
+
+
+def get(team):
+    """The Check of a team name, None when no such team is registered."""
+    for check in CHECKS:
+        if check.team == team:
+            return check
+    return None
+
+
+def load(team):
+    """The team class of a check, its module is imported on first use."""
+    team_class = _classes.get(team)
+    if team_class is None:
+        check = get(team)
+        if check is None:
+            raise KeyError(f"No check is registered for '{team}'")
+        team_class = getattr(importlib.import_module(check.module), check.team)
+        _classes[team] = team_class
+    return team_class
+
+
+def _matches(check, name):
+    return name in (check.rule, check.team, check.cost)
+
+
+def select(include=(), exclude=()):
+    """The registered checks matching any name of include (all of them when include is empty)
+    and none of exclude. Names are rule ids, team names or cost classes.
+    Raises ValueError on a name that matches nothing."""
+    known = {name for check in CHECKS for name in (check.rule, check.team)} | set(COST_CLASSES)
+    unknown = [name for name in list(include) + list(exclude) if name not in known]
+    if unknown:
+        raise ValueError(f"Unknown rule(s) {', '.join(unknown)}, "
+                         f"known rules are {', '.join(check.rule for check in CHECKS)}")
+    return [check for check in CHECKS
+            if (not include or any(_matches(check, name) for name in include))
+            and not any(_matches(check, name) for name in exclude)]
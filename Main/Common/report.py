@@ -0,0 +1,44 @@
+"""Report sink that streams the team outputs to every destination in one pass.
+
+A section (the output list of one team) is written as soon as the team finishes, to the
+log file, to any extra copy of it and to the listeners such as the GUI text view.
+Nothing is kept in memory once a section is written. A transform, when given, rewrites every
+section before it is written (to show the original files of a multi-file paper)."""
+
+SECTION_END = "\n\n"
+
+
+class ReportSink:
+
+    def __init__(self, path, copies=(), listeners=(), transform=None):
+        self.paths = [path] + [copy for copy in copies if copy]
+        self.listeners = list(listeners)  # called with the text of every section
+        self.transform = transform
+        self.files = []
+        try:
+            for sink_path in self.paths:
+                self.files.append(open(sink_path, "w"))
+        except OSError:
+            self.close()
+            raise
+
+    def write_section(self, logs):
+        if self.transform is not None:
+            logs = self.transform(logs)
+        text = "".join(logs) + SECTION_END
+        for sink_file in self.files:
+            sink_file.write(text)
+            sink_file.flush()  # readers of the log see the section right away
+        for listener in self.listeners:
+            listener(text)
+
+    def close(self):
+        for sink_file in self.files:
+            sink_file.close()
+        self.files = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
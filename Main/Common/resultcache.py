@@ -0,0 +1,91 @@
+"""Persistent cache of the team outputs, addressed by the content of the document.
+
+The key of an entry is a hash of the LaTeX code (with its .bbl file), the index where the text
+begins and the version of the checker code, so the same paper under another name (or a duplicate in a
+corpus) is a hit and any change to a checker invalidates every entry.
+Each entry is one JSON file holding the output of every team that ran without error, its findings
+as Diagnostic records (see Common/diagnostics.py).
+Reading an entry refreshes its modification time, and when the directory grows past its size
+bound the least recently used entries are removed first."""
+import hashlib
+import json
+import os
+import sys
+import tempfile
+
+from Common.diagnostics import dump_output, load_output
+from Common.incremental import checker_version
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    'ANALYZER_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'research_article_analyzer'))
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class ResultCache:
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, text, begin_index, bbl_text=''):
+        digest = hashlib.sha256(checker_version().encode())
+        digest.update(str(begin_index).encode())
+        digest.update(text.encode('utf-8', 'surrogatepass'))
+        if bbl_text:
+            digest.update(b'\x00' + bbl_text.encode('utf-8', 'surrogatepass'))
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.json')
+
+    def get(self, key):
+        """Stored outputs by team name, None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as entry:
+                outputs = json.load(entry)
+            os.utime(path)  # most recently used
+            outputs = {name: load_output(output) for name, output in outputs.items()}
+        except (OSError, ValueError, TypeError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return outputs
+
+    def put(self, key, outputs):
+        # Written to a temporary file first so that a worker never reads a half written entry
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as entry:
+                json.dump({name: dump_output(output) for name, output in outputs.items()}, entry)
+            os.replace(temp_path, self._path(key))
+        except OSError as e:
+            print(f"Result cache could not be written : {e}", file=sys.stderr)
+            return
+        self.evict()
+
+    def evict(self):
+        """Removes the least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        total = 0
+        try:
+            with os.scandir(self.directory) as scan:
+                for item in scan:
+                    if item.name.endswith('.json'):
+                        stat = item.stat()
+                        entries.append((stat.st_mtime, stat.st_size, item.path))
+                        total += stat.st_size
+        except OSError:
+            return
+        entries.sort()
+        for mtime, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue  # already removed by another worker
+            total -= size
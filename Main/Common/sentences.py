@@ -0,0 +1,157 @@
+"""Where the sentences of the prose of a document start.
+
+The body of the document is read once. Comments are skipped and math regions are opaque, so a
+period inside an inline equation never ends a sentence, while a displayed equation that ends
+with a period ends its sentence. A sentence ends at '.', '?' or '!' followed by a blank, at a
+paragraph break, at a heading, at an \\item and at the \\begin or \\end of an environment.
+
+A period does not end a sentence after an abbreviation such as "Fig.", "Eq." or "i.e.", after
+an initial ("B. M. Sadler"), when it is tied to the next word ("et al.\\ ", "Fig.~3") or when
+the next word is in lower case. "et al." and "etc." end a sentence only before a capital letter.
+Tables, code listings and pictures are not prose and hold no sentence."""
+from array import array
+from bisect import bisect_right
+import re
+
+from Common.mathindex import INLINE
+
+# End of a sentence or of a block of prose, the end of the match is where the next sentence may start
+_BOUNDARY = re.compile(
+    r'(?P<stop>[.?!])[\'")\]}]*(?=\s)'
+    r'|\n[ \t]*\n'
+    r'|\\(?P<heading>(?:sub){0,2}section|paragraph|chapter)\*?(?![a-zA-Z])'
+    r'|\\(?:item|par|caption|begin\s*\{[^{}]*\}(?:\s*\[[^\]\n]*\])?|end\s*\{[^{}]*\})(?![a-zA-Z])'
+)
+
+# Abbreviations that never end a sentence, they are followed by a number or a reference
+_ABBREVIATIONS = frozenset((
+    'fig', 'figs', 'eq', 'eqs', 'sec', 'secs', 'ref', 'refs', 'tab', 'tabs', 'thm', 'lem', 'def',
+    'prop', 'cor', 'ch', 'chap', 'app', 'alg', 'no', 'nos', 'vol', 'pp', 'p', 'vs', 'cf', 'e.g',
+    'i.e', 'viz', 'approx', 'resp', 'w.r.t', 'a.k.a', 'dr', 'prof', 'mr', 'ms', 'st', 'ed', 'eds',
+    'jan', 'feb', 'mar', 'apr', 'jun', 'jul', 'aug', 'sep', 'sept', 'oct', 'nov', 'dec',
+))
+# Abbreviations that may close a sentence
+_FINAL_ABBREVIATIONS = frozenset(('al', 'etc', 'i.i.d'))
+
+_WORD_BEFORE = re.compile(r'[A-Za-z.]*[A-Za-z]$')
+
+# Label of an enumerated case such as "1." or "(a)", the sentence starts after it
+_LABEL = re.compile(r'(?:\d{1,2}[.)]|\(\d{1,2}\)|\(?[a-z]\))\s+')
+
+# What a displayed equation may hold after its final period
+_EQUATION_TAIL = re.compile(r'(?:\s|\\label\s*\{[^{}]*\}|\\nonumber|\\notag|\\\\)*')
+
+# Commands that print nothing before the first word of a sentence
+_SILENT_START = re.compile(r'\\(?:noindent|indent|medskip|smallskip|bigskip|maketitle|label\s*\{[^{}]*\})(?![a-zA-Z])|[{(`\'"]')
+
+# Environments whose content is not prose
+NON_PROSE_ENVIRONMENTS = (
+    'tabular', 'tabular*', 'tabularx', 'array', 'verbatim', 'lstlisting', 'algorithmic', 'algorithm',
+    'tikzpicture', 'thebibliography',
+)
+
+
+class SentenceIndex:
+
+    def __init__(self, document, start=None, end=None):
+        self.text = document.text
+        self.comments = document.comments
+        self.math = document.math
+        self.starts = array('q')    # offset of the first character of every sentence, in order
+        if start is None:
+            start = document.document_start if document.document_start >= 0 else 0
+        end = document.text_end if end is None else end
+        excluded = [(env.start, env.end) for env in document.environments if env.name in NON_PROSE_ENVIRONMENTS]
+        excluded_starts = [interval[0] for interval in excluded]
+
+        def in_excluded(offset):
+            k = bisect_right(excluded_starts, offset) - 1
+            return k >= 0 and offset < excluded[k][1]
+
+        self._add(self._first_word(start, end), end, in_excluded)
+        for match in _BOUNDARY.finditer(self.text, start, end):
+            position = match.start()
+            if self.comments.is_comment(position):
+                continue
+            boundary = match.end()
+            region = self.math.region_at(position)
+            if region is not None:
+                # Only the final period of a displayed equation ends a sentence inside math
+                if match.group('stop') != '.' or region.kind == INLINE or \
+                        _EQUATION_TAIL.fullmatch(self.text, match.end(), region.body_end) is None:
+                    continue
+                boundary = region.end
+            if match.group('stop') == '.' and not self._ends_sentence(position, boundary, end):
+                continue
+            if match.group('heading'):
+                boundary = self._after_argument(boundary, end)
+            self._add(self._first_word(boundary, end), end, in_excluded)
+
+    def _add(self, offset, end, in_excluded):
+        label = _LABEL.match(self.text, offset, end)
+        if label:
+            offset = self._first_word(label.end(), end)
+        if offset >= end or (self.starts and offset <= self.starts[-1]) or in_excluded(offset):
+            return
+        if self.text[offset] == '\\' and _BOUNDARY.match(self.text, offset, end):
+            return  # a heading or an environment, the sentence starts after it
+        region = self.math.region_at(offset)
+        if region is not None and region.kind != INLINE:
+            return  # a displayed equation does not start a sentence
+        self.starts.append(offset)
+
+    def _first_word(self, position, end):
+        # First printed character at or after position, blanks, comments and silent commands skipped
+        while position < end:
+            if self.text[position].isspace() or self.comments.is_comment(position):
+                position += 1
+                continue
+            silent = _SILENT_START.match(self.text, position, end)
+            if silent is None:
+                break
+            position = silent.end()
+        return position
+
+    def _after_argument(self, position, end):
+        # Skips the [short title] and the {title} of a heading
+        while position < end and self.text[position].isspace():
+            position += 1
+        if position < end and self.text[position] == '[':
+            close = self.text.find(']', position, end)
+            position = close + 1 if close != -1 else position
+        while position < end and self.text[position].isspace():
+            position += 1
+        if position < end and self.text[position] == '{':
+            depth = 0
+            for i in range(position, end):
+                char = self.text[i]
+                if char == '{' and self.text[i - 1] != '\\':
+                    depth += 1
+                elif char == '}' and self.text[i - 1] != '\\':
+                    depth -= 1
+                    if depth == 0:
+                        return i + 1
+        return position
+
+    def _ends_sentence(self, period, boundary, end):
+        # A period followed by a blank, abbreviations, initials and lower case continuations excluded
+        word = _WORD_BEFORE.search(self.text, max(period - 12, 0), period)
+        word = word.group(0).lower() if word else ''
+        if word in _ABBREVIATIONS:
+            return False
+        if len(word) == 1 and self.text[period - 1].isupper():
+            return False  # an initial
+        following = self._first_word(boundary, end)
+        if following < end:
+            char = self.text[following]
+            if char.islower():
+                return False
+            if word in _FINAL_ABBREVIATIONS and not char.isupper():
+                return False
+        return True
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __iter__(self):
+        return iter(self.starts)
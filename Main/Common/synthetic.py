@@ -0,0 +1,178 @@
+"""Synthetic IEEEtran documents for stress tests and benchmarks.
+
+generate() writes a complete IEEEtran paper (title, authors, abstract, keywords, sections,
+subsections, equations, a thebibliography) whose feature densities are chosen by the caller,
+for example
+
+    generate(seed=7, sections=40, align_blocks_per_section=3, bibitems=2000)
+
+The same seed and densities always give the same text, and nothing is read from disk or the
+network, so tests and benchmarks can run offline."""
+import random
+
+# Number of each feature, per section when the name says so
+DEFAULT_FEATURES = {
+    'sections': 6,
+    'subsections_per_section': 2,
+    'paragraphs_per_subsection': 2,
+    'sentences_per_paragraph': 5,
+    'inline_math_per_paragraph': 2,
+    'equations_per_section': 1,
+    'align_blocks_per_section': 1,
+    'multline_blocks_per_section': 1,
+    'comments_per_section': 2,
+    'acronyms': 8,
+    'citations_per_paragraph': 1,
+    'bibitems': 30,
+}
+
+_WORDS = (
+    'channel', 'signal', 'receiver', 'transmitter', 'antenna', 'power', 'noise', 'estimate',
+    'probability', 'error', 'system', 'model', 'scheme', 'proposed', 'performance', 'analysis',
+    'optimal', 'threshold', 'fading', 'bound', 'rate', 'capacity', 'selection', 'feedback',
+    'energy', 'simulation', 'result', 'method', 'network', 'user', 'symbol', 'detector',
+)
+_CONNECTIVES = ('the', 'of', 'and', 'for', 'with', 'in', 'is', 'a', 'to', 'by', 'that', 'on')
+_NAMES = ('Alice Smith', 'Bob Kumar', 'Carol Zhang', 'David Rossi', 'Eve Tanaka', 'Frank Novak')
+_SYMBOLS = ('x', 'y', 'h', 'g', 'n', 's', 'w', 'z')
+
+
+class _Writer:
+
+    def __init__(self, seed, features):
+        self.random = random.Random(seed)
+        self.features = features
+        self.acronyms = self._make_acronyms(features['acronyms'])
+        self.defined = set()    # acronyms already expanded once
+        self.equation_count = 0
+
+    def _make_acronyms(self, count):
+        acronyms = {}
+        while len(acronyms) < count:
+            words = [self.random.choice(_WORDS) for _ in range(self.random.randint(2, 4))]
+            short = ''.join(word[0].upper() for word in words)
+            if short not in acronyms and len(short) >= 2:
+                acronyms[short] = ' '.join(word.capitalize() for word in words)
+        return acronyms
+
+    def word(self):
+        if self.acronyms and self.random.random() < 0.05:
+            short = self.random.choice(sorted(self.acronyms))
+            if short not in self.defined:
+                self.defined.add(short)
+                return f"{self.acronyms[short].lower()} ({short})"
+            return short
+        if self.random.random() < 0.3:
+            return self.random.choice(_CONNECTIVES)
+        return self.random.choice(_WORDS)
+
+    def inline_math(self):
+        a, b = self.random.sample(_SYMBOLS, 2)
+        return f"${a}_{{{self.random.randint(1, 9)}}} = {self.random.randint(0, 9)}.{self.random.randint(1, 9)} {b}$"
+
+    def sentence(self, math_spans=0, citations=0):
+        words = [self.word() for _ in range(self.random.randint(8, 16))]
+        for _ in range(math_spans):
+            words.insert(self.random.randrange(len(words)), self.inline_math())
+        for _ in range(citations):
+            words[-1] += f"~\\cite{{ref{self.random.randint(1, max(self.features['bibitems'], 1))}}}"
+        text = ' '.join(words)
+        return text[0].upper() + text[1:] + '.'
+
+    def paragraph(self):
+        count = self.features['sentences_per_paragraph']
+        math_left = self.features['inline_math_per_paragraph']
+        citations_left = self.features['citations_per_paragraph'] if self.features['bibitems'] else 0
+        count = max(count, 1)
+        # Spread the math spans and citations over the sentences of the paragraph
+        math_at = [self.random.randrange(count) for _ in range(math_left)]
+        cited_at = [self.random.randrange(count) for _ in range(citations_left)]
+        sentences = [self.sentence(math_at.count(i), cited_at.count(i)) for i in range(count)]
+        return ' '.join(sentences) + '\n'
+
+    def terms(self, count):
+        terms = []
+        for _ in range(count):
+            symbol = self.random.choice(_SYMBOLS)
+            terms.append(f"{self.random.choice(_SYMBOLS)}_{{{self.random.randint(1, 9)}}} {symbol}")
+        return ' + '.join(terms)
+
+    def equation(self, environment):
+        self.equation_count += 1
+        label = f"\\label{{eq:{self.equation_count}}}\n"
+        if environment == 'align':
+            rows = [f"{self.random.choice(_SYMBOLS)} &= {self.terms(2)}" for _ in range(self.random.randint(2, 4))]
+            body = ',\\\\\n'.join(rows)
+        elif environment == 'multline':
+            body = f"{self.random.choice(_SYMBOLS)} = {self.terms(3)} \\\\\n + {self.terms(2)}"
+        else:
+            body = f"{self.random.choice(_SYMBOLS)} = {self.terms(self.random.randint(1, 3))}"
+        end = self.random.choice((',', '.'))
+        following = 'where ' + self.word() + ' ' + self.word() if end == ',' else self.sentence()
+        return f"\\begin{{{environment}}}\n{label}{body}{end}\n\\end{{{environment}}}\n{following}\n"
+
+    def comment(self):
+        return '% ' + ' '.join(self.word() for _ in range(6)) + '\n'
+
+    def section(self, number):
+        features = self.features
+        blocks = ([self.equation('equation') for _ in range(features['equations_per_section'])]
+                  + [self.equation('align') for _ in range(features['align_blocks_per_section'])]
+                  + [self.equation('multline') for _ in range(features['multline_blocks_per_section'])]
+                  + [self.comment() for _ in range(features['comments_per_section'])])
+        subsections = []
+        for _ in range(max(features['subsections_per_section'], 1)):
+            subsections.append([self.paragraph() for _ in range(features['paragraphs_per_subsection'])])
+        # Equations and comments go between the paragraphs
+        for block in blocks:
+            paragraphs = self.random.choice(subsections)
+            paragraphs.insert(self.random.randint(0, len(paragraphs)), block)
+
+        parts = [f"\\section{{{self.title_words(3).title()}}}\n\\label{{sec:{number}}}\n"]
+        for paragraphs in subsections:
+            if features['subsections_per_section']:
+                parts.append(f"\\subsection{{{self.title_words(4).title()}}}\n")
+            parts.append('\n'.join(paragraphs) + '\n')
+        return ''.join(parts)
+
+    def title_words(self, count):
+        return ' '.join(self.random.choice(_WORDS) for _ in range(count))
+
+    def bibitem(self, number):
+        authors = ', '.join(self.random.sample(_NAMES, self.random.randint(1, 3)))
+        title = self.title_words(6).capitalize()
+        return (f"\\bibitem{{ref{number}}}\n{authors}, ``{title},'' \\emph{{IEEE Trans. Commun.}}, "
+                f"vol.~{self.random.randint(1, 70)}, no.~{self.random.randint(1, 12)}, "
+                f"pp.~{self.random.randint(1, 900)}--{self.random.randint(901, 999)}, {self.random.randint(1990, 2024)}.\n")
+
+    def document(self):
+        features = self.features
+        authors = ', '.join(self.random.sample(_NAMES, 3))
+        parts = [
+            "\\documentclass[journal]{IEEEtran}\n",
+            "\\usepackage{amsmath,amssymb}\n",
+            "\\usepackage{cite}\n\n",
+            "\\begin{document}\n\n",
+            f"\\title{{{self.title_words(7).title()}}}\n",
+            f"\\author{{{authors}}}\n",
+            "\\maketitle\n\n",
+            "\\begin{abstract}\n" + self.paragraph() + "\\end{abstract}\n\n",
+            "\\begin{IEEEkeywords}\n" + ', '.join(self.title_words(2) for _ in range(4)) + ".\n\\end{IEEEkeywords}\n\n",
+        ]
+        for number in range(1, features['sections'] + 1):
+            parts.append(self.section(number) + '\n')
+        if features['bibitems']:
+            parts.append(f"\\begin{{thebibliography}}{{{features['bibitems']}}}\n\n")
+            parts.extend(self.bibitem(number) + '\n' for number in range(1, features['bibitems'] + 1))
+            parts.append("\\end{thebibliography}\n\n")
+        parts.append("\\end{document}\n")
+        return ''.join(parts)
+
+
+def generate(seed=0, **features):
+    """A synthetic IEEEtran document, the densities not given come from DEFAULT_FEATURES."""
+    unknown = set(features) - set(DEFAULT_FEATURES)
+    if unknown:
+        raise ValueError(f"Unknown synthetic document features : {', '.join(sorted(unknown))}")
+    chosen = dict(DEFAULT_FEATURES, **features)
+    return _Writer(seed, chosen).document()
@@ -0,0 +1,93 @@
+"""Wall time, CPU time and call counts of the teams and of their check methods.
+
+While a team runs, every method defined on its class is wrapped so that each call adds to a
+record of that method. The records of one team look like
+
+    {"wall": 0.41, "cpu": 0.40, "calls": 1,
+     "checks": {"check_punctuation_align": {"wall": 0.12, "cpu": 0.12, "calls": 1}, ...}}
+
+Times are inclusive: a check that calls another check also counts the time of the callee."""
+import functools
+import inspect
+import json
+import time
+from contextlib import contextmanager
+
+
+def new_record():
+    return {"wall": 0.0, "cpu": 0.0, "calls": 0}
+
+
+def _timed(function, record):
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            record["wall"] += time.perf_counter() - wall_start
+            record["cpu"] += time.process_time() - cpu_start
+            record["calls"] += 1
+    return wrapper
+
+
+@contextmanager
+def timed_methods(cls, checks, skip=("run",)):
+    """Records every call of the methods defined on cls into checks, by method name.
+    The original methods are put back on exit."""
+    originals = {}
+    for name, member in list(vars(cls).items()):
+        if name.startswith("__") or name in skip or not inspect.isfunction(member):
+            continue
+        originals[name] = member
+        setattr(cls, name, _timed(member, checks.setdefault(name, new_record())))
+    try:
+        yield checks
+    finally:
+        for name, member in originals.items():
+            setattr(cls, name, member)
+
+
+def run_timed(team_class, *args):
+    """Creates the team and runs it. Returns its output and its timing record."""
+    record = new_record()
+    record["checks"] = {}
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        with timed_methods(team_class, record["checks"]):
+            output = team_class(*args).run()
+    finally:
+        record["wall"] = time.perf_counter() - wall_start
+        record["cpu"] = time.process_time() - cpu_start
+        record["calls"] = 1
+        # Checks never called are left out of the report
+        record["checks"] = {name: check for name, check in record["checks"].items() if check["calls"]}
+    return output, record
+
+
+def write_timings(path, timings):
+    # timings maps each team name to its record, teams read from a cache are marked "cached"
+    with open(path, "w") as timing_file:
+        json.dump({"teams": timings,
+                   "total": {"wall": sum(record.get("wall", 0.0) for record in timings.values()),
+                             "cpu": sum(record.get("cpu", 0.0) for record in timings.values())}},
+                  timing_file, indent=2)
+
+
+def summary(timings, limit=3):
+    """One line per team, slowest first, with its slowest checks."""
+    lines = []
+    for name, record in sorted(timings.items(), key=lambda item: -item[1].get("wall", 0.0)):
+        if record.get("cached"):
+            lines.append(f"{name} : cached")
+            continue
+        if record.get("over_budget"):
+            lines.append(f"{name} : stopped, over its {record['over_budget']} budget")
+            continue
+        checks = sorted(record.get("checks", {}).items(), key=lambda item: -item[1]["wall"])[:limit]
+        details = ", ".join(f"{check} {value['wall']:.2f} s ({value['calls']} calls)" for check, value in checks)
+        lines.append(f"{name} : {record['wall']:.2f} s wall, {record['cpu']:.2f} s CPU"
+                     + (f" - {details}" if details else ""))
+    return lines
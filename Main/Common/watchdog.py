@@ -0,0 +1,177 @@
+"""Persistent worker processes running calls under a time and a memory budget.
+
+Every worker runs one call at a time. A worker still busy when the time of its call is up is
+killed and replaced by a fresh one, the other workers and what they have loaded are kept.
+The memory budget is set as an address space limit (RLIMIT_AS) in the worker, on top of
+what the worker uses once its initializer has run, so a runaway allocation raises
+MemoryError inside the worker instead of exhausting the machine. That worker is replaced
+as well. The memory budget needs the resource module and is ignored where it does not
+exist (Windows)."""
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import Future
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class BudgetExceeded(Exception):
+
+    def __init__(self, kind, limit):
+        # kind is 'time' (limit in seconds) or 'memory' (limit in bytes)
+        self.kind = kind
+        self.limit = limit
+        if kind == 'time':
+            message = f"timed out after {limit:g} s"
+        else:
+            message = f"ran out of memory (budget {limit / (1024 * 1024):.0f} MB)"
+        super().__init__(message)
+
+
+def _address_space():
+    # Virtual size of this process in bytes, 0 when it cannot be read
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+def _limit_memory(memory_limit):
+    if resource is None:
+        return
+    limit = _address_space() + memory_limit
+    soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _serve(connection, initializer, initargs, memory_limit):
+    # Body of a worker process: answers (function, args) calls until it receives None
+    if initializer is not None:
+        initializer(*initargs)
+    if memory_limit:
+        _limit_memory(memory_limit)
+    while True:
+        try:
+            call = connection.recv()
+        except EOFError:
+            break
+        if call is None:
+            break
+        function, args = call
+        try:
+            connection.send((function(*args), None))
+        except MemoryError:
+            connection.send((None, 'memory'))
+            break  # replaced by the pool, its heap may be left in pieces
+        except Exception as e:
+            connection.send((None, f"{type(e).__name__}: {e}"))
+    connection.close()
+
+
+class _Worker:
+
+    def __init__(self, initializer, initargs, memory_limit):
+        self.memory_limit = memory_limit
+        self.connection, child_connection = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=_serve, daemon=True,
+                                               args=(child_connection, initializer, initargs, memory_limit))
+        self.process.start()
+        child_connection.close()
+        self.alive = True
+
+    def call(self, function, args, time_limit):
+        """The return value of function(*args). Raises BudgetExceeded when the worker went over
+        a budget and RuntimeError when the function raised or the worker died. alive is False
+        afterwards when the worker has to be replaced."""
+        self.connection.send((function, args))
+        if not self.connection.poll(time_limit or None):
+            self.stop(kill=True)
+            raise BudgetExceeded('time', time_limit)
+        try:
+            value, failure = self.connection.recv()
+        except EOFError:
+            # The worker died without answering, killed by the system when memory runs out
+            self.stop(kill=True)
+            if self.memory_limit and self.process.exitcode is not None and self.process.exitcode < 0:
+                raise BudgetExceeded('memory', self.memory_limit)
+            raise RuntimeError(f"worker stopped with exit code {self.process.exitcode}")
+        if failure == 'memory':
+            self.stop(kill=True)
+            if self.memory_limit:
+                raise BudgetExceeded('memory', self.memory_limit)
+            raise MemoryError()
+        if failure:
+            raise RuntimeError(failure)
+        return value
+
+    def stop(self, kill=False):
+        if kill:
+            self.process.kill()
+        else:
+            try:
+                self.connection.send(None)
+            except OSError:
+                pass
+        self.process.join()
+        self.connection.close()
+        self.alive = False
+
+
+class WorkerPool:
+    """Worker processes kept between calls, started with the pool. submit() returns a
+    concurrent.futures.Future like a ProcessPoolExecutor, its exception is BudgetExceeded
+    for a call that went over the time_limit (seconds) or the memory_limit (bytes)."""
+
+    def __init__(self, workers, initializer=None, initargs=(), time_limit=None, memory_limit=None):
+        self.workers = workers
+        self.time_limit = time_limit
+        self.memory_limit = memory_limit
+        self.initializer = initializer
+        self.initargs = initargs
+        self.calls = queue.SimpleQueue()
+        # One thread per worker hands it the calls one at a time and watches its time
+        self.feeders = [threading.Thread(target=self._feed, daemon=True) for _ in range(workers)]
+        for feeder in self.feeders:
+            feeder.start()
+
+    def _start(self):
+        return _Worker(self.initializer, self.initargs, self.memory_limit)
+
+    def _feed(self):
+        worker = self._start()
+        while True:
+            call = self.calls.get()
+            if call is None:
+                break
+            future, function, args = call
+            if not future.set_running_or_notify_cancel():
+                continue
+            if worker.alive and not worker.process.is_alive():
+                worker.stop(kill=True)  # died between two calls
+            if not worker.alive:
+                worker = self._start()
+            try:
+                future.set_result(worker.call(function, args, self.time_limit))
+            except BaseException as e:
+                future.set_exception(e)
+        if worker.alive:
+            worker.stop()
+
+    def submit(self, function, *args):
+        future = Future()
+        self.calls.put((future, function, args))
+        return future
+
+    def shutdown(self):
+        """Stops the workers once the calls already submitted are done."""
+        for _ in self.feeders:
+            self.calls.put(None)
+        for feeder in self.feeders:
+            feeder.join()
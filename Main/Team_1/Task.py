@@ -5,15 +5,12 @@ To run this file
         Then import it ...because we can easily detect the parts of speech of each word easily.
 """
 
-import nltk     #importing module nltk containing parts of speech
-from nltk import pos_tag, word_tokenize
+from Common.nlp import pos_tag, word_tokenize     # nltk parts of speech, loaded on first use from the bundled data
 
 
 import re;      #importing module regular expression
-try:
-    nltk.data.find('taggers/averaged_perceptron_tagger_eng/averaged_perceptron_tagger_eng.pickle')
-except LookupError:
-    nltk.download('averaged_perceptron_tagger_eng')
+from Common.document import Document
+from Common.diagnostics import Findings
 
 INs={ 'for', 'in', 'on', 'at', 'to', 'by', 'with', 'about', 'between','into',
 'through', 'during', 'before', 'after', 'from', 'of'} #prepositions
@@ -23,53 +20,36 @@ CCs={"and", "or", "but", "nor", "for", "yet", "so", "after", "although", "as", "
 
 
 class team_1:
-    def __init__(self, latex_code, text_begin):
+    def __init__(self, latex_code, text_begin, document=None):
         self.latex_code = latex_code    # The entire LaTex code is in the form of string in the latex_code string
         self.text_begin = text_begin    # location of \begin
+        self.document = document if document is not None else Document(latex_code)    # title and author blocks with their offsets
         
     def run(self):      # will be invoked by wrapper, shouldn't take arguments
-        output = []     # The output list with the errors to be returned
+        output = Findings('team_1', self.document, " Line {line} : {message}\n")     # The output with the errors to be returned
         text=self.latex_code
         self.author_analysis(text,output)
         self.title_analysis(text,output)
-        return output
+        return output.output
     
     #function to analyse title text. 
     def title_analysis(self,latex_content,output):
         
         output.append('='*50+"\n\t\t Title Related Comments \n"+'='*50+'\n')
         
-        # Initialize error variable
-        error = ''
+        # Initialize error variable, the title errors are written after the spacing warning
+        error = []
         corrected_title = ''
         
-        # Remove all comments (anything after % on a line) for processing
-        lines = self.latex_code.split('\n')
-        no_comment_lines = []
-        for line in lines:
-            if '%' in line:
-                line = line.split('%', 1)[0]
-            no_comment_lines.append(line)
-        latex_content = '\n'.join(no_comment_lines)
-        
-         # Define a regular expression to match LaTeX Title
-        title_pattern = re.compile(r'\\title{([^}]+)}')
-        
-         # Finding title pattern in latex content
-        title_match = re.search(title_pattern, latex_content)
-
-        title_index = latex_content.find(r'\title')
+        title = self.document.title
 
         self.line_number=0
-
         
-        self.line_number = self.latex_code.count('\n', 0, title_index) + 1
-        print(self.line_number)
-        
-        if title_match:
+        if title is not None:
+            self.line_number = self.document.line_of(title.start)
              
-              # Extract and return the title text
-            title_text = title_match.group(1).strip()
+              # Extract and return the title text, without the comments written inside it
+            title_text = self.document.comments.strip_range(title.start, title.end).strip()
 
              # Tokenize the title_text into words
             wordss = word_tokenize(title_text)
@@ -113,7 +93,6 @@ class team_1:
             pos_tags=corrected_pos_tags
 
             count=0
-            error=''
             error_triggered=False
              
              # Filter words that are tagged (NN, NNS, etc.)
@@ -153,25 +132,25 @@ class team_1:
                 error_triggered=False
                 if word == words[0] or word == words[-1]:   # initial & final word should be capital in a title
                     if not word.istitle() and (not word.isupper() and not word.istitle()):
-                        error += f" Line {self.line_number} : In Word {word} first letter need to be capitalized.\n"
+                        error.append(output.finding('capitalization', f"In Word {word} first letter need to be capitalized.", self.line_number))
                         error_triggered = True
                         # checking if it's a plural acronym
                         if (word[:len(word)-1].isupper() and not word[len(word)-1].islower()) or (not word[:len(word)-1].isupper() and not word[len(word)-1].islower()):
-                            error += f" Line {self.line_number} : In Word {word} last letter should be in lowercase if it's an acro.\n"
+                            error.append(output.finding('capitalization', f"In Word {word} last letter should be in lowercase if it's an acro.", self.line_number))
                 # Finding Nouns, Adjectives, Verbs, Adverbs & Pronouns and checking the condition
                 elif pos.startswith('N') or pos.startswith('J') or pos.startswith('V') or pos.startswith('R') or pos.startswith('P'):
                     if not word[0].isupper():
-                        error += f" Line {self.line_number} : In Word {word} first letter need to be capitalized.\n"
+                        error.append(output.finding('capitalization', f"In Word {word} first letter need to be capitalized.", self.line_number))
                         error_triggered = True
                 # Finding Coordinate Conjunctions, Articles, prepositions         
                 elif pos == 'CC' or pos == 'DT' or (pos == 'IN' and len(word) < 4):
                     if not word.islower() and not (i > 0 and words[i-1] == ':'):
-                        error += f" Line {self.line_number} : Word {word} need to be in lower case.\n"
+                        error.append(output.finding('capitalization', f"Word {word} need to be in lower case.", self.line_number))
                         error_triggered = True
                 # finding prepositions of length greater than 3
                 elif pos == 'IN' and len(word) > 3:
                     if not word[0].isupper():
-                        error += f" Line {self.line_number} : In Word {word} first letter need to be capitalized.\n"
+                        error.append(output.finding('capitalization', f"In Word {word} first letter need to be capitalized.", self.line_number))
                         error_triggered = True
                 count = 0
                 for i in range(1, len(word)):
@@ -180,17 +159,20 @@ class team_1:
                 if count>0 and not word.isupper():
                     count_word=num_to_words(count)
                     plural="letter is" if count==1 else "letters are"
+                    message = f"In the word {word}, {count_word} {plural} unnecessarily capitalized."
                     if error_triggered:
-                        error+=f"            In the word {word}, {count_word} {plural} unnecessarily capitalized.\n"
+                        # continues the error above it, on the same line
+                        error.append(output.finding('capitalization', message, self.line_number, layout="            {message}\n"))
                     else:
-                        error+=f" Line {self.line_number} : In the word {word}, {count_word} {plural} unnecessarily capitalized.\n"
+                        error.append(output.finding('capitalization', message, self.line_number))
 
              #Checking Whether extra spaces are added in title text.
             self.spaces_count(title_text,output) 
  
         else:
-            error+=" Error : No Title Found in the Latex Code\n"
-        output.append(error)
+            error.append(output.finding('missing-title', "No Title Found in the Latex Code", severity='error',
+                                        layout=" Error : {message}\n"))
+        output.extend(error)
         output.append(f"\n Corrected Title:\n {corrected_title} \n")
 
     author_text=''    
@@ -198,100 +180,57 @@ class team_1:
     def author_analysis(self,latex_content,output):
         output.append('='*50+"\n\t\t Author Related Comments \n"+'='*50+'\n')
         
-        # Remove all comments (anything after % on a line) for processing
-        lines = self.latex_code.split('\n')
-        no_comment_lines = []
-        for line in lines:
-            if '%' in line:
-                line = line.split('%', 1)[0]
-            no_comment_lines.append(line)
-        latex_content = '\n'.join(no_comment_lines)
-        
-        # Remove all \thanks{...} blocks before processing author text
-        latex_content = re.sub(r'\\thanks\s*{[^{}]*({[^{}]*}[^{}]*)*[^{}]*}', '', latex_content, flags=re.DOTALL)
-        
-        # Find all author blocks and handle nested braces properly
-        author_positions = []
-        start_pos = 0
-        while True:
-            author_start = latex_content.find(r'\author', start_pos)
-            if author_start == -1:
-                break
-            author_positions.append(author_start)
-            start_pos = author_start + 1
-        
-        for author_start in author_positions:
-            # Find the opening brace after \author
-            brace_start = latex_content.find('{', author_start)
-            if brace_start != -1:
-                # Count braces to find the matching closing brace
-                brace_count = 0
-                brace_end = brace_start
-                for i in range(brace_start, len(latex_content)):
-                    if latex_content[i] == '{':
-                        brace_count += 1
-                    elif latex_content[i] == '}':
-                        brace_count -= 1
-                        if brace_count == 0:
-                            brace_end = i
-                            break
-                
-                # Extract the author content
-                author_text = latex_content[brace_start + 1:brace_end]
-                
-                # Find the corresponding position in the original self.latex_code
-                # by matching the first 20 characters of author_text in self.latex_code after the author command
-                search_window = author_text.strip()[:20]
-                orig_author_start = self.latex_code.find(r'\author')
-                orig_brace_start = self.latex_code.find('{', orig_author_start)
-                orig_search_start = orig_brace_start + 1 if orig_brace_start != -1 else 0
-                orig_content_pos = self.latex_code.find(search_window, orig_search_start)
-                if orig_content_pos != -1:
-                    self.line_number = self.latex_code.count('\n', 0, orig_content_pos) + 1
-                else:
-                    self.line_number = self.latex_code.count('\n', 0, orig_author_start) + 1
-                
-                # Convert multi-line author text to single line
-                single_line_author = re.sub(r'\s*\n\s*', ' ', author_text)
-                single_line_author = re.sub(r'\s+', ' ', single_line_author).strip()
-                processed_author_text = single_line_author + "}"
-                words = word_tokenize(processed_author_text)
-                name_count=0
-                author_indices=[]
-                author_indices.append(0)
-                author_flag=0
+        for author in self.document.authors:
+            # Remove all comments and \thanks{...} blocks before processing author text
+            author_text = self.document.comments.strip_range(author.start, author.end)
+            author_text = re.sub(r'\\thanks\s*{[^{}]*({[^{}]*}[^{}]*)*[^{}]*}', '', author_text, flags=re.DOTALL)
 
-                #Verifying the author text with IEEE rules
-                for i in range(len(words)):
-                    j=i-1
-                    name_parts=[]
-                    while j>=0 and words[j].lower() not in [',','and','}','{']:
-                        name_parts.insert(0,words[j])
-                        j-=1
-                    full_name=' '.join(name_parts)
-                    if re.match(r'^[a-zA-Z]+$', words[i]) and not words[i]=='and':
-                        if not words[i][0].isupper():
-                            output.append(f" Line {self.line_number} : In Word '"+words[i]+"' first letter need to be capitalized.\n")
-                    if words[i]=='{':
-                        author_flag =1
-                        if not words[i-1]==',':
-                            output.append(f" Line {self.line_number} : A comma is missing after the author name '{full_name}', and before the author affiliation.\n")
-                        if not words[i+1]=='\\it':
-                            output.append(f" Line {self.line_number} : [Warning] Use \\it for italic style when writing the author affiliation.\n")
-                    if words[i]==',':
-                        if not words[i+1]=='{' and author_flag==0:
-                            author_indices.append(i+1)
-                    if words[i]=='}'and not i==len(words)-1 and not words[i+1]=='}':
-                        author_flag=0
-                        if not words[i+1]==',' and not words[i+1]=='and' :
-                            output.append(f" Line {self.line_number} : Insert a comma between author names.\n")
-                            author_indices.append(i+1)
-                    if words[i]=='and' and not words[i-1]==',':
-                        author_indices.append(i)
-                # Note: checking_and_word errors are excluded as requested
-                # self.checking_and_word(words,author_indices,output)
-                self.spaces_count(processed_author_text,output)
-                
+            # Line of the first written character of the author block
+            first_char = len(author.text) - len(author.text.lstrip())
+            self.line_number = self.document.line_of(author.start + first_char)
+            
+            # Convert multi-line author text to single line
+            single_line_author = re.sub(r'\s*\n\s*', ' ', author_text)
+            single_line_author = re.sub(r'\s+', ' ', single_line_author).strip()
+            processed_author_text = single_line_author + "}"
+            words = word_tokenize(processed_author_text)
+            name_count=0
+            author_indices=[]
+            author_indices.append(0)
+            author_flag=0
+
+            #Verifying the author text with IEEE rules
+            for i in range(len(words)):
+                j=i-1
+                name_parts=[]
+                while j>=0 and words[j].lower() not in [',','and','}','{']:
+                    name_parts.insert(0,words[j])
+                    j-=1
+                full_name=' '.join(name_parts)
+                if re.match(r'^[a-zA-Z]+$', words[i]) and not words[i]=='and':
+                    if not words[i][0].isupper():
+                        output.add('capitalization', "In Word '"+words[i]+"' first letter need to be capitalized.", self.line_number)
+                if words[i]=='{':
+                    author_flag =1
+                    if not words[i-1]==',':
+                        output.add('author-punctuation', f"A comma is missing after the author name '{full_name}', and before the author affiliation.", self.line_number)
+                    if not words[i+1]=='\\it':
+                        output.add('affiliation-style', "Use \\it for italic style when writing the author affiliation.", self.line_number,
+                                   layout=" Line {line} : [Warning] {message}\n")
+                if words[i]==',':
+                    if not words[i+1]=='{' and author_flag==0:
+                        author_indices.append(i+1)
+                if words[i]=='}'and not i==len(words)-1 and not words[i+1]=='}':
+                    author_flag=0
+                    if not words[i+1]==',' and not words[i+1]=='and' :
+                        output.add('author-punctuation', "Insert a comma between author names.", self.line_number)
+                        author_indices.append(i+1)
+                if words[i]=='and' and not words[i-1]==',':
+                    author_indices.append(i)
+            # Note: checking_and_word errors are excluded as requested
+            # self.checking_and_word(words,author_indices,output)
+            self.spaces_count(processed_author_text,output)
+            
     # Function to verify whether unnecessary spaces are given or not    
     def spaces_count(self,text,output):
             spaces_count=0
@@ -303,7 +242,8 @@ class team_1:
                 
                 #if there are more than 2 spaces we will through a warning
                 if(spaces_count>2):
-                    output.append(f" Line {self.line_number} : [Warning] Unnecessary spaces found between words\n")
+                    output.add('spacing', "Unnecessary spaces found between words", self.line_number,
+                               layout=" Line {line} : [Warning] {message}\n")
                     break
                     
 # Function to verify 'and' word is at right place
@@ -312,21 +252,21 @@ class team_1:
         #verifying conditions if only two authors are present 
         if len(author_indices)==2: 
             if not words[author_indices[1]]=='and':
-                output.append(f" Line {self.line_number} : If only two authors are present, the format should be \\author(author1 and author2).\n\t    Remove the comma between the authors and add 'and'.\n")
+                output.add('author-format', f"If only two authors are present, the format should be \\author(author1 and author2).\n\t    Remove the comma between the authors and add 'and'.", self.line_number)
             
             elif words[author_indices[1]-1]==',':
-                output.append(f" Line {self.line_number} : If only two authors are present, then the format should be \\author(author1 and author2).\n\t    Here comma should be removed.\n")
+                output.add('author-format', f"If only two authors are present, then the format should be \\author(author1 and author2).\n\t    Here comma should be removed.", self.line_number)
     
     #verifying conditions if more than two authors are present 
         else:
             for i in author_indices:
                 if words[i]=='and' and not i==author_indices[-1]:
-                    output.append(f" Line {self.line_number} : If number of authors are more than 2 then format is : \\author(author1, author2, and author3).\n\t    Try to remove 'and' between  all authors except last author.\n")
+                    output.add('author-format', f"If number of authors are more than 2 then format is : \\author(author1, author2, and author3).\n\t    Try to remove 'and' between  all authors except last author.", self.line_number)
                     break
             
             #checking whether there is ", and " before last author   
             if not words[author_indices[-1]]=='and' or not words[author_indices[-1]-1]==',':
-                    output.append(f" Line {self.line_number} : If number of authors are more than 2 then format is : \\author(author1, author2, and author3).\n\t    So make sure there is ', and' before last author.\n") 
+                    output.add('author-format', f"If number of authors are more than 2 then format is : \\author(author1, author2, and author3).\n\t    So make sure there is ', and' before last author.", self.line_number) 
         
 def num_to_words(n):
     num_words={1:"one",2:"two",3:"three",4:"four",5:"five",6:"six",7:"seven",8:"eight",9:"nine",10:"ten"}
@@ -16,7 +16,9 @@ Comments Type
     # eliminate the confusion between the actual symbol of ’ and the mistaken symbol  '
  '''
 import re
-from tabulate import tabulate
+from Common.nlp import tabulate
+from Common.document import Document
+from Common.diagnostics import Findings
 
 acronyms_dict = {
     "AF": "Audio frequency",
@@ -169,9 +171,10 @@ acronyms_dict = {
 
 
 class team_2:
-    def __init__(self, latex_content, begin_document_index):
+    def __init__(self, latex_content, begin_document_index, document=None):
 
         self.latex_content = latex_content
+        self.document = document if document is not None else Document(latex_content)
 
         title_index = latex_content.find(r'\title{')
         begin_document_index = latex_content.find(r'\begin{document}')
@@ -206,70 +209,38 @@ class team_2:
         self.warnings_maintext = []
         self.acronym_line_map = {}
         self.acronym_first_flags = {}
+        self.findings = Findings('team_2', self.document, "\nLine {line:04d} : [Warning] {message}")
 
-    def extract_title(self, title_command=r'\title', opening_brace='{', closing_brace='}'):
-        # Find the index of the title command using the given begin_document_index
-        begin_title_index = self.latex_content.find(title_command, self.begin_document_index)
+    def warning(self, rule, line_number, message):
+        # A finding of the keyword and acronym checks, -1 is the line of an acronym that was not found in a line
+        return self.findings.finding(rule, message, line=int(line_number) if int(line_number) > 0 else None)
 
-        # Find the index of the opening curly brace after the title command
-        opening_brace_index = self.latex_content.find(opening_brace, begin_title_index)
-
-        # Initialize variables to track the depth of nested curly braces
-        depth = 0
-        current_index = opening_brace_index
-
-        # Iterate through characters starting from the opening brace
-        while current_index < len(self.latex_content):
-            current_char = self.latex_content[current_index]
-
-            if current_char == opening_brace:
-                depth += 1
-            elif current_char == closing_brace:
-                depth -= 1
-
-            # Check if the closing brace is found and the depth becomes zero
-            if depth == 0 and current_char == closing_brace:
-                title_content = self.latex_content[opening_brace_index + 1:current_index].strip()
-                return title_content
-
-            current_index += 1
-
-        return None
+    def extract_title(self):
+        # Title text with nested braces kept, as found by the shared document model
+        title = self.document.title
+        if title is None:
+            return None
+        return title.text.strip()
 
     def extract_abstract(self):
-        # Find the index of \begin{abstract} using the given begin_document_index
-        begin_abstract_index = self.latex_content.find(r'\begin{abstract}', self.begin_document_index)
+        # Abstract content without \begin{abstract} and \end{abstract}
+        abstract = self.document.abstract
+        if abstract is not None:
+            # Line number of \begin{abstract}
+            self.line_number = self.document.line_of(abstract.start)
 
-        # Find the index of \end{abstract}
-        end_abstract_index = self.latex_content.find(r'\end{abstract}', begin_abstract_index)
-
-        # Extract the abstract content without \begin{abstract} and \end{abstract}
-        if begin_abstract_index != -1 and end_abstract_index != -1:
-            abstract_content = self.latex_content[begin_abstract_index + len(r'\begin{abstract}'):end_abstract_index]
-
-            # Count the number of newlines before the abstract_start_index to get the line number
-            self.line_number = self.latex_content.count('\n', 0, begin_abstract_index) + 1
-
-            return abstract_content
+            return abstract.text
         else:
             return None
 
     def extract_keywords(self):
-        # Find the index of \begin{IEEEkeywords} using the given begin_document_index
-        begin_keywords_index = self.latex_content.find(r'\begin{IEEEkeywords}', self.begin_document_index)
-
-        # Find the index of \end{IEEEkeywords}
-        end_keywords_index = self.latex_content.find(r'\end{IEEEkeywords}', begin_keywords_index)
-
-        # Extract the abstract content without \begin{IEEEkeywords} and \end{IEEEkeywords}
-        if begin_keywords_index != -1 and end_keywords_index != -1:
-            keywords_content = self.latex_content[
-                               begin_keywords_index + len(r'\begin{IEEEkeywords}'):end_keywords_index]
-
-            # Count the number of newlines before the begin_keywords_index to get the line number
-            self.keyword_line = self.latex_content.count('\n', 0, begin_keywords_index) + 1
+        # Keywords content without \begin{IEEEkeywords} and \end{IEEEkeywords}
+        keywords = self.document.keywords
+        if keywords is not None:
+            # Line number of \begin{IEEEkeywords}
+            self.keyword_line = self.document.line_of(keywords.start)
 
-            return keywords_content
+            return keywords.text
         else:
             return None
 
@@ -359,10 +330,9 @@ class team_2:
                 if cumulative_chars >= content_end:
                     break
 
-            # Remove LaTeX comments
-            comment_index = raw_line.find('%')
-            if comment_index != -1 and (comment_index == 0 or raw_line[comment_index - 1] != '\\'):
-                raw_line = raw_line[:comment_index]
+            # Remove LaTeX comments (\% is kept as a percent sign) and math, found in the document indexes
+            line_start = self.document.lines.line_start(line_number)
+            raw_line = self.document.prose_range(line_start, line_start + len(raw_line), '')
 
             cleaned = self.remove_latex_commands2(raw_line)
             if cleaned.strip():
@@ -401,8 +371,7 @@ class team_2:
 
     def remove_latex_commands2(self, text):
 
-        # Remove LaTeX math environments
-        text = re.sub(r'\$.*?\$', '', text)
+        # Math is already removed by extract_main_text, drop the environments left on a single line
         text = re.sub(r'\\begin\{.*?\}.*?\\end\{.*?\}', '', text, flags=re.DOTALL)
 
         # Remove inline LaTeX commands
@@ -536,7 +505,7 @@ class team_2:
                 key = (acronym, "expanded_no_parens")
                 if key not in self.issued_warnings:
                     self.warnings1.append(
-                        f"\nLine {line_number:04d} : [Warning] Acronym '{acronym}' is expanded but not enclosed in parentheses at first occurrence."
+                        self.warning('first-use', line_number, f"Acronym '{acronym}' is expanded but not enclosed in parentheses at first occurrence.")
                     )
                     self.issued_warnings.add(key)
 
@@ -544,7 +513,7 @@ class team_2:
                 key = (acronym, "enclosed_no_expand")
                 if key not in self.issued_warnings:
                     self.warnings1.append(
-                        f"\nLine {line_number:04d} : [Warning] Acronym '{acronym}' is enclosed in parentheses but not properly expanded at first occurrence."
+                        self.warning('first-use', line_number, f"Acronym '{acronym}' is enclosed in parentheses but not properly expanded at first occurrence.")
                     )
                     self.issued_warnings.add(key)
 
@@ -552,7 +521,7 @@ class team_2:
                 key = (acronym, "no_expand_no_enclose")
                 if key not in self.issued_warnings:
                     self.warnings1.append(
-                        f"\nLine {line_number:04d} : [Warning] Acronym '{acronym}' is not properly expanded and not enclosed in parentheses at the first occurrence."
+                        self.warning('first-use', line_number, f"Acronym '{acronym}' is not properly expanded and not enclosed in parentheses at the first occurrence.")
                     )
                     self.issued_warnings.add(key)
 
@@ -592,15 +561,15 @@ class team_2:
 
                     if expanded and not enclosed:
                         self.warnings1.append(
-                            f"\nLine {line_number:04d} : [Warning] Acronym '{warning_acronym}' is expanded but not enclosed in parentheses at first occurrence."
+                            self.warning('first-use', line_number, f"Acronym '{warning_acronym}' is expanded but not enclosed in parentheses at first occurrence.")
                         )
                     elif not expanded and enclosed:
                         self.warnings1.append(
-                            f"\nLine {line_number:04d} : [Warning] Acronym '{warning_acronym}' is enclosed in parentheses but not properly expanded at first occurrence."
+                            self.warning('first-use', line_number, f"Acronym '{warning_acronym}' is enclosed in parentheses but not properly expanded at first occurrence.")
                         )
                     elif not expanded and not enclosed:
                         self.warnings1.append(
-                            f"\nLine {line_number:04d} : [Warning] Acronym '{warning_acronym}' is not properly expanded and not enclosed in parentheses at the first occurrence."
+                            self.warning('first-use', line_number, f"Acronym '{warning_acronym}' is not properly expanded and not enclosed in parentheses at the first occurrence.")
                         )
 
                     self.issued_warnings.add((normalized,))
@@ -658,7 +627,7 @@ class team_2:
                 ]
                 if line_numbers:
                     warning_list.append(
-                        f"\nLine {line_numbers[0]} : [Warning] Full form '{full_form}' (for acronym '{acronym}') is expanded {count} times at lines {', '.join(line_numbers)}."
+                        self.warning('repeated-definition', line_numbers[0], f"Full form '{full_form}' (for acronym '{acronym}') is expanded {count} times at lines {', '.join(line_numbers)}.")
                     )
                     issued.add(key)
 
@@ -692,7 +661,7 @@ class team_2:
 
             if count > 1:
                 warning_list.append(
-                    f"\nLine {line_numbers[0]} : [Warning] Acronym '{acronym}' is enclosed in parentheses {count} times at lines {', '.join(line_numbers)}."
+                    self.warning('repeated-definition', line_numbers[0], f"Acronym '{acronym}' is enclosed in parentheses {count} times at lines {', '.join(line_numbers)}.")
                 )
             checked.add(norm_acro)
 
@@ -705,7 +674,7 @@ class team_2:
         main_text_raw = self.extract_main_text()
         main_text = self.remove_latex_commands2(main_text_raw)
 
-        output = [] 
+        output = self.findings
 
         if title:
 
@@ -742,19 +711,19 @@ class team_2:
         # Check if keywords are in alphabetical order
         if keyword_list != sorted(keyword_list, key=str.lower):
             self.warnings.append(
-                f"\nLine {self.keyword_line:04d} : [Warning] IEEE Style Violation: Keywords are not in alphabetical order.")
+                self.warning('keywords', self.keyword_line, "IEEE Style Violation: Keywords are not in alphabetical order."))
 
         # Check if last keyword ends with a full stop
         if keyword_list:
             last_keyword = keyword_list[-1].strip()
             if not last_keyword.endswith('.'):
                 self.warnings.append(
-                    f"\nLine {self.keyword_line:04d} : [Warning] IEEE Style Violation: Last keyword '{last_keyword}' should end with a full stop.")
+                    self.warning('keywords', self.keyword_line, f"IEEE Style Violation: Last keyword '{last_keyword}' should end with a full stop."))
 
             # Check if first keyword starts with a capital letter
             if not keyword_list[0][0].isupper():
                 self.warnings.append(
-                    f"\nLine {self.keyword_line:04d} : [Warning] IEEE Style Violation: The first keyword should begin with a capital letter.")
+                    self.warning('keywords', self.keyword_line, "IEEE Style Violation: The first keyword should begin with a capital letter."))
 
             # Check remaining keywords for lowercase
             for i, keyword in enumerate(keyword_list[1:], start=2):  # start=2 for second keyword
@@ -770,7 +739,7 @@ class team_2:
                     else:
                         # Capitalized non-acronym word found → generate warning
                         self.warnings.append(
-                            f"\nLine {self.keyword_line:04d} : [Warning] IEEE Style Violation: In Keyword {i} ('{keyword}'), the word '{word}' should be entirely lowercase.Only the first keyword is capitalized."
+                            self.warning('keywords', self.keyword_line, f"IEEE Style Violation: In Keyword {i} ('{keyword}'), the word '{word}' should be entirely lowercase.Only the first keyword is capitalized.")
                         )
                         break
 
@@ -790,7 +759,7 @@ class team_2:
         keyword_style_warnings = []
         # Collect keyword style warnings
         for warning in self.warnings:
-            if "keyword" in warning.lower():
+            if "keyword" in warning.message.lower():
                 keyword_style_warnings.append(warning)
         if keyword_style_warnings:
             output.append("\n--- Warnings ---")
@@ -878,4 +847,4 @@ class team_2:
 
         else:
             output.append("\n No acronyms found in main text.")
-        return output
\ No newline at end of file
+        return output.output
\ No newline at end of file
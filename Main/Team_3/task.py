@@ -7,14 +7,17 @@ To list the names of all Scientists used in the research paper
 and to check if they are started with a capital letter since they are proper names
 * More Scientist names can be added to the list at line 38"""
 import re
+from Common.document import Document
+from Common.diagnostics import Findings
 class team_3:
     #Constructor
-    def __init__(self, latex_code, text_begin):
+    def __init__(self, latex_code, text_begin, document=None):
         self.latex_code = latex_code # The entire LaTex code is in the form of string in the latex_code string
         self.text_begin = text_begin # location of \begin
+        self.document = document if document is not None else Document(latex_code) # shared parsed document
 
     def run(self): # will be invoked by wrapper, shouldn't take arguments
-        output = []
+        output = Findings('team_3', self.document, " Line {line} : {message}\n")
         text = self.latex_code
         # use self
         str = '='*50
@@ -22,7 +25,7 @@ class team_3:
         self.scientistName(text,output)
         #output.append('\n'+str+'\n\tAcronym Related Comments\n'+str)
         self.acron(text,output)
-        return output
+        return output.output
     
     def scientistName(self,text,output):
         location=dict()
@@ -92,8 +95,8 @@ class team_3:
             if has_lowercase:  # Only print once per scientist name
                 pattern = r'\b' + re.escape(word) + r'\b'
                 for match in re.finditer(pattern, text):
-                    line = self.lineNumber(match.start())
-                    output.append(" Line " + str(line) + " : All words in scientist name '" + word + "' should start with a capital letter.\n")
+                    output.add('capitalization', "All words in scientist name '" + word + "' should start with a capital letter.",
+                               offset=match.start())
                     break  # Only print once per occurrence
 
         if str1=='':
@@ -107,10 +110,8 @@ class team_3:
         return any(search_string in my_list for my_list in lists)
    
     def acron(self,text,output):
-        start_index = text.find(r"\begin{IEEEkeywords}")        
-        end_index = text.find(r"\end{IEEEkeywords}") 
-        index_text = text[start_index+21:end_index].rstrip() 
-        index_text = index_text.strip()
+        keywords = self.document.keywords
+        index_text = keywords.text.strip() if keywords is not None else ''
         acronym_word = []
         text1=index_text.replace(","," ")
         text2=text1.replace("."," ")
@@ -126,13 +127,8 @@ class team_3:
 
 
     def lineNumber(self,target_index):
-        line_count=0
-        current_index=0
-        while current_index<=target_index:
-            if self.latex_code[current_index]=='\n':
-                line_count+=1
-            current_index+=1
-        return line_count+1
+        # Binary search in the line index of the shared document
+        return self.document.line_of(target_index)
     
     # For Finding Mispelled Names
     def levenshtein_distance(self,str1, str2):
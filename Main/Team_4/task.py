@@ -1,4 +1,6 @@
 import re
+from Common.document import Document
+from Common.diagnostics import Findings
 
 class team_4:
     """
@@ -21,17 +23,20 @@ class team_4:
     The script generates a categorized report of all issues found, with line numbers to help locate them in the source file.
     """
     
-    def __init__(self, latex_code, text_begin):
+    def __init__(self, latex_code, text_begin, document=None):
         """
         Initializes the checker with LaTeX code.
         
         Args:
             latex_code (str): The string containing the LaTeX document.
             text_begin (int): The line number where the main text begins (e.g., at \\begin{document}).
+            document (Document, optional): The parsed document shared by all teams.
+                It is built from latex_code when not given.
         """
         # Store the LaTeX code and the starting line number of the main text.
         self.latex_code = latex_code
         self.text_begin = text_begin
+        self.document = document if document is not None else Document(latex_code)
         # Split the LaTeX code into a list of lines for easier processing.
         self.lines = self.latex_code.splitlines()
         
@@ -57,12 +62,7 @@ class team_4:
         }
         
         # Pre-compile regex patterns for efficiency
-        math_environments = ['equation', 'align', 'gather', 'multline', 'flalign', 'alignat']
-        self.begin_env_pattern = re.compile(fr'\\begin\{{({"|".join(math_environments)})\*?}}')
-        self.end_env_pattern = re.compile(fr'\\end\{{({"|".join(math_environments)})\*?}}')
-        self.inline_math_pattern = re.compile(r'\$.*?\$')
-        self.display_math_pattern = re.compile(r'\\\[.*?\\\]')
-
+        # (math regions are looked up in the math index of the document)
         units_pattern = '|'.join(self.units)
         self.regex_no_space = re.compile(r"(\d+(?:\.\d+)?)(" + units_pattern + r")\b")
         self.regex_wrong_space = re.compile(r"(\d+(?:\.\d+)?)\s+(" + units_pattern + r")\b")
@@ -83,21 +83,21 @@ class team_4:
         Runs all checks on the LaTeX code and returns a formatted report.
         
         Returns:
-            list: A list of strings forming a report of issues found.
+            list: The report, its text lines and its findings (Diagnostic records).
         """
         unit_issues = []
         sequence_issues = []
         
+        lines = self.document.lines
         doc_start_line = 0
-        for i, line in enumerate(self.lines):
-            if r'\begin{document}' in line:
-                doc_start_line = i
-                break
-        
-        in_math_env = False
-        for line_num, line_content in enumerate(self.lines[doc_start_line:], start=doc_start_line + 1):
-            non_math_text, in_math_env = self._get_non_math_text(line_content, in_math_env)
-            
+        if self.document.document_start != -1:
+            doc_start_line = lines.line_of(self.document.document_start) - 1
+
+        for line_num in range(doc_start_line + 1, len(lines) + 1):
+            line_start, line_end = lines.line_start(line_num), lines.line_end(line_num)
+            line_content = self.latex_code[line_start:line_end].rstrip('\r')
+            non_math_text = self.document.math.strip_range(line_start, line_end)
+
             if non_math_text.strip():
                 unit_issues.extend(self._check_spacing_and_units(non_math_text, line_num))
                 unit_issues.extend(self._check_full_unit_names(non_math_text, line_num))
@@ -105,7 +105,7 @@ class team_4:
             sequence_issues.extend(self._check_ellipsis(line_content, line_num))
             sequence_issues.extend(self._check_cdot_in_sequences(line_content, line_num))
 
-        report_lines = []
+        report_lines = Findings('team_4', self.document)
         
         # Units section
         report_lines.extend([
@@ -117,7 +117,7 @@ class team_4:
         if not unit_issues:
             report_lines.append("No unit-related issues found.")
         else:
-            report_lines.extend(sorted(list(set(unit_issues))))
+            self._add_findings(report_lines, unit_issues)
             
         # Sequence section
         report_lines.extend([
@@ -130,43 +130,20 @@ class team_4:
         if not sequence_issues:
             report_lines.append("No sequence-related issues found.")
         else:
-            report_lines.extend(sorted(list(set(sequence_issues))))
+            self._add_findings(report_lines, sequence_issues)
             
-        return [line + '\n' for line in report_lines]
+        return [line + '\n' if isinstance(line, str) else line for line in report_lines.output]
 
-    def _get_non_math_text(self, line, in_math_env):
+    def _add_findings(self, findings, issues):
         """
-        Filters out LaTeX math environments from a line, handling multi-line environments.
+        Adds (line, column, rule, message) issues to the findings, one per line and message
+        (at its first column), in the order of their lines in the report.
         """
-        if in_math_env:
-            end_match = self.end_env_pattern.search(line)
-            if end_match:
-                line = line[end_match.end():]
-                in_math_env = False
-            else:
-                return "", True
-
-        processed_line = ""
-        while True:
-            begin_match = self.begin_env_pattern.search(line)
-            if not begin_match:
-                processed_line += line
-                break
-            
-            processed_line += line[:begin_match.start()]
-            
-            end_match = self.end_env_pattern.search(line, begin_match.end())
-            if end_match:
-                line = line[end_match.end():]
-            else:
-                in_math_env = True
-                line = ""
-                break
-        
-        final_line = self.inline_math_pattern.sub(' ', processed_line)
-        final_line = self.display_math_pattern.sub(' ', final_line)
-        
-        return final_line, in_math_env
+        first = {}
+        for line_num, column, rule, message in issues:
+            first.setdefault((line_num, message), (column, rule))
+        for (line_num, message), (column, rule) in sorted(first.items(), key=lambda item: f"Line {item[0][0]}: {item[0][1]}"):
+            findings.add(rule, message, line=line_num, column=column)
 
     def _check_spacing_and_units(self, line, line_num):
         """
@@ -180,13 +157,13 @@ class team_4:
         for match in self.regex_no_space.finditer(line):
             value, unit = match.groups()
             latex_unit = self.latex_equivalents.get(unit, unit)
-            issues.append(f"Line {line_num}: [Spacing] Insert a tilde (~) between the quantity and the unit : {value}~{latex_unit}.")
+            issues.append((line_num, None, 'unit-spacing', f"[Spacing] Insert a tilde (~) between the quantity and the unit : {value}~{latex_unit}."))
 
         for match in self.regex_wrong_space.finditer(line):
             if '~' not in match.group(0):
                 value, unit = match.groups()
                 latex_unit = self.latex_equivalents.get(unit, unit)
-                issues.append(f"Line {line_num}: [Spacing] Insert a tilde (~) between the quantity and the unit : {value}~{latex_unit}.")
+                issues.append((line_num, None, 'unit-spacing', f"[Spacing] Insert a tilde (~) between the quantity and the unit : {value}~{latex_unit}."))
         return issues
 
     def _check_full_unit_names(self, line, line_num):
@@ -201,7 +178,7 @@ class team_4:
             value, unit_name = match.groups()
             correct_unit = self.unit_full_names.get(unit_name.lower(), unit_name)
             latex_unit = self.latex_equivalents.get(correct_unit, correct_unit)
-            issues.append(f"Line {line_num}: [Symbol Use] Use the unit symbol instead of spelling out the unit name: {value}~{latex_unit}.")
+            issues.append((line_num, None, 'unit-symbol', f"[Symbol Use] Use the unit symbol instead of spelling out the unit name: {value}~{latex_unit}."))
         return issues
 
     def _check_ellipsis(self, line, line_num):
@@ -218,7 +195,7 @@ class team_4:
 
             # Rule: Detect literal '...' or '…' and suggest replacement.
             if ellipsis_str in ['...', '…']:
-                issues.append(f"Line {line_num}: [Three dots] Replace the dots written manually (...) with the correct LaTeX command : \\ldots.")
+                issues.append((line_num, start_pos + 1, 'ellipsis', f"[Three dots] Replace the dots written manually (...) with the correct LaTeX command : \\ldots."))
                 continue
 
             # Determine if the ellipsis is used in an operational context (e.g., sums, products).
@@ -228,10 +205,10 @@ class team_4:
             # Rule: Flag incorrect ellipsis command for the context.
             # Suggests \cdots for operational use and \ldots for sequential use.
             if is_operational and ellipsis_str == r'\ldots':
-                issues.append(f"Line {line_num}: [Math Formatting] Replace the dots (...) with \\cdots when they appear between mathematical operators.")
+                issues.append((line_num, start_pos + 1, 'ellipsis', f"[Math Formatting] Replace the dots (...) with \\cdots when they appear between mathematical operators."))
             
             if not is_operational and ellipsis_str == r'\cdots':
-                issues.append(f"Line {line_num}: [Math Formatting]Replace the dots (...) with \\ldots when they appear between mathematical operators")
+                issues.append((line_num, start_pos + 1, 'ellipsis', f"[Math Formatting]Replace the dots (...) with \\ldots when they appear between mathematical operators"))
 
             # Rule: Ensure at least two terms precede an ellipsis.
             # This applies to both \ldots and \cdots.
@@ -240,21 +217,21 @@ class team_4:
                 elements = [e for e in elements if e and not e.endswith('(')]
                 if len(elements) < 2:
                     if not pre_text.endswith('('):
-                        issues.append(f"Line {line_num}: [Math Formatting] Make sure to write at least two terms before using the ellipsis (e.g., write a + b + \cdots instead of just a + \cdots).")
+                        issues.append((line_num, start_pos + 1, 'ellipsis', f"[Math Formatting] Make sure to write at least two terms before using the ellipsis (e.g., write a + b + \cdots instead of just a + \cdots)."))
 
             # Rule: Check for missing commas around \ldots in sequences.
             # This ensures proper punctuation in lists like 'x_1, ..., x_n'.
             if ellipsis_str == r'\ldots' and not is_operational:
                 if pre_text and post_text and pre_text[-1].isalnum() and post_text[0].isalnum():
                      if not (pre_text.endswith(',') or post_text.startswith(',')):
-                        issues.append(f"Line {line_num}: [Math Formatting]Add commas around \\ldots when it appears in a list (e.g., x_1, x_2, \ldots, x_n).")
+                        issues.append((line_num, start_pos + 1, 'ellipsis', f"[Math Formatting]Add commas around \\ldots when it appears in a list (e.g., x_1, x_2, \ldots, x_n)."))
 
-        return list(set(issues))
+        return issues
 
     def _check_cdot_in_sequences(self, line, line_num):
         """Checks for sequences that might require \\cdot."""
         issues = []
         for match in self.cdot_regex.finditer(line):
             var1, var2 = match.groups()
-            issues.append(f"Line {line_num}: [Math Formatting] Use \cdot between two variables to show multiplication: {var1} \\cdot {var2}.")
+            issues.append((line_num, match.start() + 1, 'multiplication-dot', f"[Math Formatting] Use \cdot between two variables to show multiplication: {var1} \\cdot {var2}."))
         return issues
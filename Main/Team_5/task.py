@@ -1,65 +1,42 @@
 import re
+from Common.document import Document
+from Common.diagnostics import Findings
 class team_5:
     
-    def __init__(self, latex_code, text_begin):
+    def __init__(self, latex_code, text_begin, document=None):
         self.latex_code = latex_code
         self.text_begin = text_begin
+        self.document = document if document is not None else Document(latex_code)
+        self.equation_starts = {}  # equation body -> offset of its first occurrence in latex_code
+        self.findings = Findings('team_5', self.document, "Warning: {message}\n")
+
+    def environment_bodies(self, name, column_spec=''):
+        # Bodies of every \begin{name}...\end{name} found by the shared document model.
+        # With column_spec (e.g. '{ll}' for arrays) only environments opening with it are kept, without it.
+        bodies = []
+        for env in self.document.environments_named(name):
+            body = self.document.body(env)
+            if body.startswith(column_spec):
+                body = body[len(column_spec):]
+                self.equation_starts.setdefault(body, env.body_start + len(column_spec))
+                bodies.append(body)
+        return bodies
     
     
-    # def find_line_number_for_equation(self, latex_code, equation):
-    #    lines = latex_code.split('\n')
-    #    equation_lines = equation.split('\n')
-    #    print(equation)
-    #    print(equation_lines)
-    #    for i, line in enumerate(lines, start=1):
-    #     # Check if the first line of the equation is present in the current line
-    #     if equation_lines[0] in line:
-    #         # Check if all lines of the equation are in continuous order
-    #         print(equation_lines[0])
-    #         continuous_order = all(equation_lines[j] in lines[i + j] for j in range(len(equation_lines)))
-            
-    #         if continuous_order:
-    #             return i
-
-    #     return None
-   
     def find_line_number_for_equation(self, latex_code, equation):
-        # Remove spaces and empty lines from the LaTeX code
-        #    lines = [line.strip() for line in latex_code.split('\n') if line.strip()]
-       lines = [line for line in latex_code.split('\n')]
-
-       # Remove spaces and empty lines from the equation
-       equation_lines = [line for line in equation.split('\n') if line.strip()]
-
-       for i, line in enumerate(lines, start=1):
-        # Check if the first line of the equation is present in the current line
+        # Line of the first non-empty line of the equation, looked up from its offset
+        start = self.equation_starts.get(equation)
+        if start is None or not equation.strip():
+            return None
+        first_char = len(equation) - len(equation.lstrip())
+        return self.document.line_of(start + first_char)
         
-        if equation_lines and equation_lines[0] in line:
-            # Check if all lines of the equation are in continuous order
-            continuous_order = all(equation_lines[j] == lines[i-1+ j] for j in range(len(equation_lines)))
-            # if not continuous_order:
-            #     print(f"Lines not matching at line {i}:")
-            #     for j in range(len(equation_lines)):
-            #         if equation_lines[j] != lines[i - 1 + j]:
-            #             print(f"Expected: {equation_lines[j]}")
-            #             print(f"Actual  : {lines[i - 1 + j]}")
-            # print(continuous_order)
-            # print(line)
-            # print('&')
-            # print(lines[i-1])
-            # print('$')
-            # print(equation_lines[0])
-            # print(equation_lines)
-            # print('%')
-            # for j in range(len(equation_lines)):
-            #     print(equation_lines[j]) 
-            #     print('@')
-            #     print(lines[i-1+j])
-            if continuous_order:
-                return i
+    def equation_finding(self, rule, message, equation, severity='warning', layout=None):
+        # Diagnostic about an equation, placed at the first written character of its body
+        start = self.equation_starts[equation]
+        offset = start + len(equation) - len(equation.lstrip())
+        return self.findings.finding(rule, message, offset=offset, severity=severity, layout=layout)
 
-       return None
-        
     def skip_line_by_first_word(self,text, first_word_to_skip):
         # Split the text into lines
         lines = text.split('\n')
@@ -77,8 +54,7 @@ class team_5:
         result = []
         punc = False
         char_next = False
-        equation_pattern = re.compile(r'\\begin{align}(.*?)\\end{align}',re.DOTALL)
-        equations = re.findall(equation_pattern, latex_content)
+        equations = self.environment_bodies('align')
         for equation in equations:
             if(equation.strip().split()[0].startswith('%')):
                 continue
@@ -112,7 +88,7 @@ class team_5:
                     if(line_no==None):
                             continue
                     # result.append("here , is placed at the end of one of the equation, but it is not expexted there. The equation is  "+equation+"\n")
-                    result.append(f"Warning: Unexpected punction (',') is seen at the end of an equation whose line no is: {line_no}\n")
+                    result.append(self.equation_finding('end-punctuation', f"Unexpected punction (',') is seen at the end of an equation whose line no is: {line_no}", equation))
                 if char_next and (not punc):
                     # print("bye")
                     line_no = self.find_line_number_for_equation(latex_content,equation)
@@ -121,7 +97,7 @@ class team_5:
                     # print(equation)
                     # print(char_next)
                     # print(equation[len(equation)-2])
-                    result.append(f"Warning: punction (',') is missing at the end of an equation whose line no is: {line_no}\n")
+                    result.append(self.equation_finding('end-punctuation', f"punction (',') is missing at the end of an equation whose line no is: {line_no}", equation))
                 char_next=False
                 punc=False   
         return result;  
@@ -130,8 +106,7 @@ class team_5:
         result = []
         punc = False
         char_next = False
-        equation_pattern = re.compile(r'\\begin{array}{ll}(.*?)\\end{array}',re.DOTALL)
-        equations = re.findall(equation_pattern, latex_content)
+        equations = self.environment_bodies('array', '{ll}')
         for equation in equations:
             if(equation.strip().split()[0].startswith('%')):
                 continue
@@ -168,27 +143,23 @@ class team_5:
                     line_no = self.find_line_number_for_equation(latex_content,equation)
                     if(line_no==None):
                             continue                    
-                    result.append(f"Warning: Unexpected punction (',') is seen at the end of an equation whose line no is: {line_no}\n")
+                    result.append(self.equation_finding('end-punctuation', f"Unexpected punction (',') is seen at the end of an equation whose line no is: {line_no}", equation))
                 if char_next and (not punc):
                     # print("bye")
                     # print(equation)
                     line_no = self.find_line_number_for_equation(latex_content,equation)
                     if(line_no==None):
                             continue           
-                    print(char_next)  
-                    print(equation[len(equation)-1])       
-                    result.append(f"Warning: punction (',') is missing at the end of an equation whose line no is: {line_no}\n")
+                    result.append(self.equation_finding('end-punctuation', f"punction (',') is missing at the end of an equation whose line no is: {line_no}", equation))
                 char_next=False
                 punc=False   
         return result; 
                                  
     def check_punctuation(self,latex_content):
         self.latex_content = latex_content
-            # Define a regular expression to match LaTeX equations and labels
-        equation_pattern = re.compile(r'\\begin{equation}(.*?)\\end{equation}', re.DOTALL)
         result=[]
-        # Find all equations in the LaTeX file
-        equations = re.findall(equation_pattern, latex_content)
+        # All equations in the LaTeX file
+        equations = self.environment_bodies('equation')
     
         for equation in equations:
             if(equation.strip().split()[0].startswith('%')):
@@ -309,7 +280,7 @@ class team_5:
                                           continue                                
                                 # print("The word after \\end{equation} starts with a capital letter, but the punctuation is not a full stop.")
                                 # result.append("The word after \\end{equation} starts with a capital letter, but the punctuation is not a full stop."+equation+"next word is:"+word_after_end+"\n"+"\n")
-                                result.append(f"Error: ',' is seen instead of '.'  at the end of equation whose line no is {line_no}\n")
+                                result.append(self.equation_finding('end-punctuation', f"',' is seen instead of '.'  at the end of equation whose line no is {line_no}", equation, 'error', "Error: {message}\n"))
                         else:
                             if last_char != ',':
                                 line_no = self.find_line_number_for_equation(latex_content,equation)
@@ -318,7 +289,7 @@ class team_5:
                                 # print("The word after \\end{equation} does not start with a capital letter, but the punctuation is not a comma.")
                                 # print(word_after_end)
                                 # print(equation)
-                                result.append(f"Error: '.' is seen instead of ',' of at the end of equation whose line no is {line_no}\n")
+                                result.append(self.equation_finding('end-punctuation', f"'.' is seen instead of ',' of at the end of equation whose line no is {line_no}", equation, 'error', "Error: {message}\n"))
                     
                     elif word_after_end:
                         # word_after_end = match.group()
@@ -364,18 +335,18 @@ class team_5:
                                    continue
                                 # print("The word after \\end{equation} starts with a capital letter, but the punctuation is not a full stop.")
                                 # result.append("The word after \\end{equation} starts with a capital letter, but the punctuation is not a full stop."+equation+"next word is:"+word_after_end+"\n"+"\n")
-                                result.append("Warning: '.' is not seen at the end of equation whose line no is {line_no}\n")
+                                result.append(self.equation_finding('end-punctuation', f"'.' is not seen at the end of equation whose line no is {line_no}", equation))
                         else:
                             if last_char != ',':
                                 line_no = self.find_line_number_for_equation(latex_content,equation)
                                 # print(word_after_end)
                                 # print("***")
-                                # result.append("Warning: ',' is not seen at the end of equation whose line no is {line_no}\n")
+                                # result.append(self.equation_finding('end-punctuation', f"',' is not seen at the end of equation whose line no is {line_no}", equation))
                                 if(line_no==None):
                                   continue
                                 # print("The word after \\end{equation} does not start with a capital letter, but the punctuation is not a comma.")
                                 # result.append("The word after \\end{equation} does not start with a capital letter, but the punctuation is not a comma."+equation+"next word is:"+word_after_end+"\n"+"\n")
-                                result.append(f"Warning: ',' is not seen at the end of equation whose line no is {line_no}\n")
+                                result.append(self.equation_finding('end-punctuation', f"',' is not seen at the end of equation whose line no is {line_no}", equation))
                     else:
                         print(f"Error: Word after end of equation not found.")
                 else:
@@ -387,15 +358,13 @@ class team_5:
                     continue                
                 # if(line_no==None):
                 #     print("****")
-                result.append(f"Warning: Punctuation not found at the end of the equation whose line no is {line_no}\n")
+                result.append(self.equation_finding('end-punctuation', f"Punctuation not found at the end of the equation whose line no is {line_no}", equation))
         return result     
     def check_punctuation_align(self,latex_content):
         self.latex_content = latex_content
-            # Define a regular expression to match LaTeX equations and labels
-        equation_pattern = re.compile(r'\\begin{align}(.*?)\\end{align}', re.DOTALL)
         result=[]
-        # Find all equations in the LaTeX file
-        equations = re.findall(equation_pattern, latex_content)
+        # All align equations in the LaTeX file
+        equations = self.environment_bodies('align')
 
         for equation in equations:
             if(equation.strip().split()[0].startswith('%')):
@@ -481,7 +450,7 @@ class team_5:
                                     continue
                                 # print("The word after \\end{equation} starts with a capital letter, but the punctuation is not a full stop.")
                                 # result.append("The word after \\end{equation} starts with a capital letter, but the punctuation is not a full stop."+equation+"next word is:"+word_after_end+"\n"+"\n")
-                                result.append(f"Error: ',' is seen instead of '.'  at the end of equation whose line no is {line_no}\n")
+                                result.append(self.equation_finding('end-punctuation', f"',' is seen instead of '.'  at the end of equation whose line no is {line_no}", equation, 'error', "Error: {message}\n"))
                         else:
                             if last_char != ',':
                                 line_no = self.find_line_number_for_equation(latex_content,equation)
@@ -489,7 +458,7 @@ class team_5:
                                     continue
                                 # print(word_after_end)
                                 # print("The word after \\end{equation} does not start with a capital letter, but the punctuation is not a comma.")
-                                result.append(f"Error: '.' is seen instead of ',' of at the end of equation whose line no is {line_no}\n")
+                                result.append(self.equation_finding('end-punctuation', f"'.' is seen instead of ',' of at the end of equation whose line no is {line_no}", equation, 'error', "Error: {message}\n"))
                     
                     elif word_after_end:
                         # word_after_end = match.group()
@@ -537,18 +506,18 @@ class team_5:
                                     continue
                                 # print("The word after \\end{equation} starts with a capital letter, but the punctuation is not a full stop.")
                                 # result.append("The word after \\end{equation} starts with a capital letter, but the punctuation is not a full stop."+equation+"next word is:"+word_after_end+"\n"+"\n")
-                                result.append(f"Warning: '.' is not seen at the end of equation whose line no is {line_no}\n")
+                                result.append(self.equation_finding('end-punctuation', f"'.' is not seen at the end of equation whose line no is {line_no}", equation))
                         else:
                             if last_char != ',':
                                 line_no = self.find_line_number_for_equation(latex_content,equation)
                                 # print(word_after_end)
                                 # print("***")
-                                # result.append("Warning: ',' is not seen at the end of equation whose line no is {line_no}\n")
+                                # result.append(self.equation_finding('end-punctuation', f"',' is not seen at the end of equation whose line no is {line_no}", equation))
                                 if(line_no==None):
                                     continue
                                 # print("The word after \\end{equation} does not start with a capital letter, but the punctuation is not a comma.")
                                 # result.append("The word after \\end{equation} does not start with a capital letter, but the punctuation is not a comma."+equation+"next word is:"+word_after_end+"\n"+"\n")
-                                result.append(f"Warning: ',' is not seen at the end of equation whose line no is {line_no}\n")
+                                result.append(self.equation_finding('end-punctuation', f"',' is not seen at the end of equation whose line no is {line_no}", equation))
                     else:
                         print(f"Error: Word after end of align equation not found.")
                 else:
@@ -560,17 +529,16 @@ class team_5:
                 # print("Warning: Punctuation not found at the end of the equation (if any).")
                 # if(line_no==None):
                 #    print("&&&&")
-                result.append(f"Warning: Punctuation not found at the end of the equation whose line no is {line_no}\n")
+                result.append(self.equation_finding('end-punctuation', f"Punctuation not found at the end of the equation whose line no is {line_no}", equation))
         return result    
     def check_math_operator(self,latex_content):
         self.latex_content=latex_content
-        equation_pattern=re.compile(r'\\begin{multline}(.*?)\\end{multline}', re.DOTALL)
         result=[]
         math_operator=["+","-",">","<","=","/","\times"]
         # other_operator=["\leq","\geq"]
         other_operator = [r"\leq", r"\geq"]
 
-        equations = re.findall(equation_pattern,latex_content)
+        equations = self.environment_bodies('multline')
         for equation in equations:
            dupeq=equation
            if(equation.strip().split()[0].startswith('%')):
@@ -594,12 +562,13 @@ class team_5:
                            line_no = self.find_line_number_for_equation(latex_content,dupeq)
                            if(line_no==None):
                                 continue
-                           result.append(f"The math operator should not be there before in this equation whose line no is {line_no}\n")
+                           result.append(self.equation_finding('operator-line-break', f"The math operator should not be there before in this equation whose line no is {line_no}",
+                                                               dupeq, layout="{message}\n"))
         return result
 
     def run(self):  # The function which is going to be invoked in the wrapper class should contain no arguments
 
-        output = [] # The output list with the errors to be returned
+        output = self.findings # The output with the errors to be returned
         text = self.latex_code
         result1=self.check_punctuation(text) 
         result2=self.check_punctuation_align(text) 
@@ -614,11 +583,11 @@ class team_5:
 ===============================================================
                 Math operator related comments
 ===============================================================\n"""
-        output.extend(start)
+        output.append(start)
         output.extend(result1)
         output.extend(result2)    
         output.extend(result3)
         output.extend(result4)
-        output.extend(oprel)
+        output.append(oprel)
         output.extend(result5)
-        return output
\ No newline at end of file
+        return output.output
\ No newline at end of file
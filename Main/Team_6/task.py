@@ -1,49 +1,33 @@
 #team 6
 import re
-import nltk
-nltk.download('punkt')
-nltk.download('averaged_perceptron_tagger')
-from nltk.corpus import words
-from nltk import word_tokenize , pos_tag
+from Common.nlp import word_tokenize , pos_tag
+from Common.document import Document
+from Common.diagnostics import Findings
 
 
 
 class team_6:
 
-    def __init__(self, latex_code, text_begin):
+    def __init__(self, latex_code, text_begin, document=None):
         self.latex_code = latex_code 
         self.text_begin = text_begin
+        self.document = document if document is not None else Document(latex_code)
     
 
     def run(self):
         
-        output=[] #creating a list to store the output errors.
+        output=Findings('team_6', self.document, "ERROR in line:{line}   {message}\n", 'error') #collects the text and the errors
 
         output.append('='*50+"\n\t Sections and Subsections related Comments \n"+'='*50+'\n')
-        #the words we are looking for.
-        word_1="\subsection" 
-        word_2="\subsubsection"
-
-        lines = self.latex_code.splitlines()  # splitting the code into lines.
-        indices = []
-
-        # Finding the index of each line containing either word_1 or word_2
-        for index, line in enumerate(lines):
-            if word_1 in line or word_2 in line:
-                indices.append(index)  # storing the indices of word_1 and word_2 in the list.
-
-        for index in indices:
-            line1 = lines[index]
-            
-            char1 = '}'
-            char2 = '~'
-
-            # Finding the substring between '}' or '~' and the end of the line
-            a = 12 if word_1 in line1 else 15 if word_2 in line1 else 0
-            b = line1.find(char2, a) if char2 in line1[a:] else line1.find(char1, a)
-            
-            if b != -1 and line1[0] != '%':
-                  line = line1[a:b]
+        x=0
+        # Headings of the subsections and subsubsections, commented ones are not part of the document model
+        for section in self.document.sections:
+            if section.command not in ('subsection', 'subsubsection'):
+                continue
+
+            # The heading text up to a '~' if there is one
+            line = section.title.split('~')[0]
+            index = self.document.line_of(section.start)
             #output.append(line)
            # output.append(line+'\n')
             tokens= word_tokenize(line) #tokenising parts of speech.
@@ -55,31 +39,30 @@ class team_6:
             pos_list2={'CC','DT'}
             #Prepositions of more than three words
          #   list3={'before','from','through','with','versus','among','under','between','without'}
-            index+=1
             x=0 
             for word, pos in postag:
                 if pos in pos_list1 and word[0].islower():
-                    output.append(('ERROR in line:'+str(index)+"   "+"Word {"+word+'}'+" need to be Capitalized since it is a "+ get_pos_full_form(pos)+"\n"))
+                    output.add('capitalization', "Word {"+word+'}'+" need to be Capitalized since it is a "+ get_pos_full_form(pos), index)
                     x=1
             # for word,pos in postag:
                 elif pos in pos_list2 :
                     if word[0].islower() and word!=tokens[0] and word!=tokens[-1]:
                         pass
                     else:
-                        output.append(('ERROR in line:'+str(index)+"   "+"Word {"+word+'}'+" need to be in lower case since it is a "+ get_pos_full_form(pos)+"\n"))
+                        output.add('lower-case', "Word {"+word+'}'+" need to be in lower case since it is a "+ get_pos_full_form(pos), index)
                         x = 2
             # for word in tokens:
                  #finding prepostions of length greater than 3
                 elif pos=='IN' and len(word)>3 :
                         if not word[0].isUpper():
-                            output.append(('ERROR in line:'+str(index)+"   "+"Word {"+word+'}'+" need to be capitalised since it is a "+ get_pos_full_form(pos)+"\n"))
+                            output.add('capitalization', "Word {"+word+'}'+" need to be capitalised since it is a "+ get_pos_full_form(pos), index)
                             x=3
         if x == 0:
          output.append("No errors found in Subsections and Subsubsections")
         output.append("\n")
                                    
         output.append('='*50+"\n")
-        return output
+        return output.output
 
 
 def get_pos_full_form(pos_tag):
@@ -1,49 +1,88 @@
+import re
+from collections import namedtuple
+
+from Team_7.zero import zero
+
+# \frac{numerator}{denominator} in inline math: start is the index of the backslash,
+# the spans cover the content of the arguments without their braces
+Fraction = namedtuple('Fraction', ['start', 'numerator_start', 'numerator_end', 'denominator_start', 'denominator_end'])
+
+_FRACTION = re.compile(r'\\[dt]?frac(?![a-zA-Z])')
+_CONTROL_WORD = re.compile(r'\\(?:[a-zA-Z]+|.)')
+
+
+def brace_table(code, spans):
+    """{index of '{': index of its matching '}'} for the braces inside the given [start, end] spans,
+    escaped braces are skipped. Unbalanced braces are left out."""
+    matches = {}
+    for start, end in spans:
+        opened = []
+        i = start
+        while i < end:
+            char = code[i]
+            if char == '\\':
+                i += 2
+                continue
+            if char == '{':
+                opened.append(i)
+            elif char == '}' and opened:
+                matches[opened.pop()] = i
+            i += 1
+    return matches
+
+
 class Inline:
-    def __init__(self, code, begin_index):
+    def __init__(self, code, begin_index, document=None, z=None):
         self.code=code
         self.begin_index = begin_index
+        self.z = z if z is not None else zero(code, begin_index, document)
+        self.document = self.z.document
+
+    def argument(self, index, end, braces):
+        # (start, end) of the content of the argument at index (a {group}, a control word or one character)
+        # and the index after the argument, None when there is none
+        while index < end and self.code[index].isspace():
+            index += 1
+        if index >= end:
+            return None
+        if self.code[index] == '{':
+            close = braces.get(index)
+            return (index + 1, close, close + 1) if close is not None and close < end else None
+        if self.code[index] == '\\':
+            word_end = _CONTROL_WORD.match(self.code, index, end).end()
+            return index, word_end, word_end
+        return index, index + 1, index + 1
+
     def getfrac(self):
-        # Generates a list containing beginning and ending index of fraction block
-        fractions =[]
-        found=False
-        current_fraction =[]
-        for i in range(self.begin_index,len(self.code)):
-            if self.code[i:i + len("\\frac")] == "\\frac":
-                for j in range(2):
-                    while not(self.code[i]=='{'):
-                        i+=1
-                    ind1 = i
-                    while not(self.code[i]=='}'):
-                        i+=1
-                    ind2=i
-                    current_fraction.append(ind1)
-                    current_fraction.append(ind2)
-                    fractions.append(current_fraction)
-                    current_fraction = []
+        # \frac, \dfrac and \tfrac of the inline equations, with the spans of their numerator and denominator
+        spans = self.z.get_inline_equations()
+        braces = brace_table(self.code, spans)
+        fractions = []
+        for start, end in spans:
+            for match in _FRACTION.finditer(self.code, start, end):
+                if self.document.comments.is_comment(match.start()):
+                    continue
+                numerator = self.argument(match.end(), end, braces)
+                denominator = self.argument(numerator[2], end, braces) if numerator else None
+                if denominator is not None:
+                    fractions.append(Fraction(match.start(), *numerator[:2], *denominator[:2]))
         return fractions
 
+    def get_builtup(self, fractions):
+        # Beginning index of every built-up fraction, inline math should use the slashed form a/b
+        return [fraction.start for fraction in fractions]
 
     def get_paren(self, fractions):
-        # Generates a list containing beginning index of expressions without parenthesis
+        # Beginning index of the numerators and denominators that hold an operation without parenthesis
         paren_index = []
-        for current_fraction in fractions:
-            len_expr = 0
-            for ind in range(current_fraction[0], current_fraction[1] + 1):
-                paren_status = False
-                op_status = False
-                left = ind
-                if self.code[ind] == '{':
-                    while not(self.code[ind] == '}'):
-                        if self.code[ind]=='(':
-                            paren_status=True
-                        if isop(self.code[ind]):
-                            op_status=True
-                        ind+=1
-                    if ind-left-2 > 1 and (not(paren_status))  and (op_status):
-                        paren_index.append(ind-2)
-
-
+        for fraction in fractions:
+            for start, end in ((fraction.numerator_start, fraction.numerator_end),
+                               (fraction.denominator_start, fraction.denominator_end)):
+                expression = self.code[start:end].strip().lstrip('+-')
+                if len(expression) > 1 and '(' not in expression and any(isop(ch) for ch in expression):
+                    paren_index.append(start)
         return paren_index
+
     def get_exp(self):
     # Geneartes a list of indices which are at exponential functions
         exp_index =[]
@@ -53,24 +92,11 @@ class Inline:
 
         return exp_index
     def get_line(self, index):
-        line = 1
-        for i in range(0, len(self.code)):
-            if i == index:
-                return line
-            elif self.code[i] == '\n':
-                line += 1
-        return None
-    
+        if not 0 <= index < len(self.code):
+            return None
+        return self.document.line_of(index)
+
 def isop(ch):
     if ch=='+' or ch=='-' or ch=='/' or ch=='%':
         return True
     return False
-
-
-
-
-
-
-
-
-
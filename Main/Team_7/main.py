@@ -1,86 +1,65 @@
 from Team_7.Inlinemath import Inline
-from Team_7.task2 import Task_2
 from Team_7.task4 import Task_4
 from Team_7.zero import zero
 from Team_7.numstart import NumStart
+from Common.document import Document
+from Common.diagnostics import Findings
 
 
 class team_7:
-    def __init__(self, latex_code, text_begin):
+    def __init__(self, latex_code, text_begin, document=None):
         self.latex_code = latex_code
         self.text_begin = text_begin
+        self.document = document if document is not None else Document(latex_code)
         self.n = len(self.latex_code)
 
     def run(self):
-        z = zero(self.latex_code, self.text_begin)
+        z = zero(self.latex_code, self.text_begin, self.document)
         s1, s1_ = z.run()
-        n = NumStart(self.latex_code, self.text_begin)
-        t2 = Task_2(self.latex_code, self.text_begin)
-        s2 = t2.run()
-        inmath = Inline(self.latex_code, self.text_begin)
-        s3 = inmath.get_paren(inmath.getfrac())
+        n = NumStart(self.latex_code, self.text_begin, self.document)
+        s2 = n.run()
+        inmath = Inline(self.latex_code, self.text_begin, self.document, z)
+        fractions = inmath.getfrac()
+        s3 = inmath.get_paren(fractions)
+        s3b = inmath.get_builtup(fractions)
         s3_ = inmath.get_exp()
-        t4 = Task_4(self.latex_code,self.text_begin)
+        t4 = Task_4(self.latex_code, self.text_begin, self.document, z)
         s4, s4_ = t4.run
-        t2 = Task_2(self.latex_code,self.text_begin)
-        s2 = t2.run()
-        error_string=[]
-        error_string = error_string + ['='*50 + "\n"]
-        error_string =error_string + self.create_error_msg(s1,"Leading zero error.")
-        error_string = error_string + self.create_error_msg(s1_, "Trailing zero error.")
-        error_string = error_string + self.create_error_msg(s2, "Sentence starting with number warning.")
-        error_string = error_string + self.create_error_msg(s3, "No Parenthesis warning.")
-        error_string = error_string + self.create_error_msg(s3_, "Long Exponential expression warning.")
-        error_string = error_string + self.create_error_msg(s4, "No comma before condition warning.")
-        error_string = error_string + self.create_error_msg(s4_, "No required space at expression and condition.")
-        str= ''
-        pruned_error_str = []
-        for i in error_string:
-            if i not in pruned_error_str:
-                pruned_error_str.append(i)
-        return pruned_error_str
+        findings = Findings('team_7', self.document)
+        findings.append('='*50 + "\n")
+        self.add_findings(findings, s1, 'leading-zero', "Leading zero error.", 'error')
+        self.add_findings(findings, s1_, 'trailing-zero', "Trailing zero error.", 'error')
+        self.add_findings(findings, s2, 'sentence-number', "Sentence starting with number warning.")
+        self.add_findings(findings, s3b, 'inline-fraction', "Built-up fraction in inline math warning.")
+        self.add_findings(findings, s3, 'fraction-parentheses', "No Parenthesis warning.")
+        self.add_findings(findings, s3_, 'long-exponent', "Long Exponential expression warning.")
+        self.add_findings(findings, s4, 'condition-comma', "No comma before condition warning.")
+        self.add_findings(findings, s4_, 'condition-space', "No required space at expression and condition.")
+        return findings.output
     # Calculates the line at which the index is present
     def get_line(self, index):
-        line = 1
-        for i in range(0, self.n):
-            if i == index:
-                return line
-            elif self.latex_code[i] == '\n':
-                line += 1
-        return None
+        if not 0 <= index < self.n:
+            return None
+        return self.document.line_of(index)
 
-    def create_error_msg(self,error_index_list, error_type):
-        string_list = []
+    def add_findings(self, findings, error_index_list, rule, error_type, severity='warning'):
+        # One finding per index outside the comments, a second finding on a line already reported is left out
+        shown = set()
         for i in error_index_list:
-            if not self.is_in_comment(i):
-                error_string = f"Line {self.get_line(i)}: {error_type}\n"
-                string_list.append(error_string)
-        return string_list
+            if self.is_in_comment(i):
+                continue
+            line = self.get_line(i)
+            if line in shown:
+                continue
+            shown.add(line)
+            if line is None:
+                findings.add(rule, error_type, severity=severity)
+            else:
+                findings.add(rule, error_type, offset=i, severity=severity)
 
     def get_comment_list(self):
-        is_in_comment = False
-        comment_list = []
-        comment_indices = []
-        for i in range(self.n):
-            if self.latex_code[i] == '%' and not is_in_comment:
-                is_in_comment = True
-                comment_indices.append(i)
-            elif self.latex_code[i] == '\n' and is_in_comment:
-                is_in_comment = False
-                comment_indices.append(i)
-                comment_list.append(comment_indices)
-                comment_indices = []
-        return comment_list
+        # [index of '%', index of the end of the comment] for every comment, from the shared comment mask
+        return [[start, end] for start, end in self.document.comments.intervals]
 
     def is_in_comment(self, index):
-        in_comment = False
-        c_list = self.get_comment_list()
-        for i in c_list:
-            if i[0]<=index<=i[1]:
-                in_comment = True
-        return in_comment
-
-
-
-
-
+        return self.document.comments.is_comment(index)
@@ -1,16 +1,24 @@
+from Common.document import Document
+from Common.mathindex import INLINE
+
+
 class NumStart:
-    def __init__(self, code, begin_index):
+    # Sentences of the text that start with a numeral, written as text (20 apples) or in math ($20$ apples)
+    def __init__(self, code, begin_index, document=None):
         self.code = code
         self.begin_index = begin_index
+        self.document = document if document is not None else Document(code)
 
     def run(self):
         error_index = []
-        for i in range(len(self.code)):
-            if self.code[i] == '.':
-                j = i + 1
-                while not self.code[j].isalphanum:
-                    if self.code[j] == '$':
-                        error_index.append(j)
-                    else:
-                        j += 1
+        for start in self.document.sentences:
+            if start < self.begin_index:
+                continue
+            if self.code[start].isdigit():
+                error_index.append(start)
+                continue
+            region = self.document.math.region_at(start)
+            if region is not None and region.kind == INLINE and region.start == start and \
+                    self.code[region.body_start:region.body_end].lstrip()[:1].isdigit():
+                error_index.append(start)
         return error_index
@@ -1,64 +1,130 @@
+import re
+
 from Team_7.zero import zero
 
+# Start of a condition written after the main expression of a displayed equation:
+# \text{for ...}, \mbox{if ...}, \text{, \quad otherwise}, \forall ...
+# group 'inside' holds what the text box puts before the condition word (a comma or a \quad)
+_CONDITION = re.compile(
+    r'\\(?:text|mbox|textrm|mathrm|textnormal)\s*\{(?P<inside>(?:[\s,~]|\\q?quad\b)*)'
+    r'(?:for|if|when|whenever|where|otherwise|unless|provided|subject\s+to|such\s+that|s\.t\.)(?![a-zA-Z])'
+    r'|\\forall(?![a-zA-Z])'
+)
+
+CASES_ENVIRONMENTS = ('cases', 'cases*', 'dcases', 'dcases*', 'rcases', 'rcases*')
+
+# Spacing that may stand between the expression and its condition, the two-em space first
+_WIDE_SPACES = ('\\qquad', '\\quad')
+_NARROW_SPACES = ('\\,', '\\;', '\\:', '\\!', '\\ ', '~')
+_ROW_END = '\\\\'
+# Commands that print nothing, skipped like blanks
+_SILENT = ('\\nonumber', '\\notag')
+
 
 class Task_4:
-    def __init__(self, code, begin_index):
+    """Conditions in displayed equations. The main expression is followed by a comma (or the
+    condition is in parentheses) and a \\quad before the condition, as in
+        x_n = 0, \\quad \\text{for } n < 0
+    Rows of a cases environment need the comma before the & of the condition.
+
+    run gives [positions of missing commas, positions of conditions without \\quad]. A missing comma
+    is reported where it should be inserted, a missing \\quad at the start of the condition."""
+
+    def __init__(self, code, begin_index, document=None, z=None):
         self.code = code
+        self.document = document
         self.begin_index = begin_index
+        self.z = z if z is not None else zero(code, begin_index, document)
 
     @property
     def run(self):
-        z = zero(self.code, self.begin_index)
-        equations = z.display_equations() + z.get_inline_equations()
-        error_index = []
+        document = self.z.document
         comma_index = []
-        for eq in equations:
-            comma_status = False
-            for i in range(eq[0], eq[1]):
-                if self.code[i] == '.' and (not comma_status):
+        space_index = []
+        regions = [region for region in document.math.display() if region.start >= self.begin_index]
+        cases = [env for env in document.environments_named(*CASES_ENVIRONMENTS) if env.start >= self.begin_index]
+        for region in regions:
+            inside = [env for env in cases if region.body_start <= env.start < region.body_end]
+            for env in inside:
+                self.check_cases(env, comma_index)
+            position = region.body_start
+            for env in inside + [None]:
+                end = env.start if env is not None else region.body_end
+                self.check_conditions(position, end, comma_index, space_index)
+                if env is not None:
+                    position = env.end
+        return [comma_index, space_index]
+
+    def check_conditions(self, start, end, comma_index, space_index):
+        # One pass of _CONDITION over code[start:end], the first condition of each row is checked
+        row_checked = -1
+        for match in _CONDITION.finditer(self.code, start, end):
+            if self.is_comment(match.start()):
+                continue
+            row_start = max(self.code.rfind(_ROW_END, start, match.start()) + len(_ROW_END), start)
+            if row_start == row_checked:
+                continue  # the rest of the row belongs to the condition already checked
+            row_checked = row_start
+            has_comma = ',' in (match.group('inside') or '')
+            has_space = '\\quad' in (match.group('inside') or '') or '\\qquad' in (match.group('inside') or '')
+            position, wide, aligned = self.skip_spacing(row_start, match.start())
+            if position == row_start:
+                continue  # the condition opens the row, no expression before it
+            before = self.code[position - 1]
+            if before == '(':
+                # (\text{for } ...) : the parenthesis replaces the comma, the spacing is before it
+                opening = position - 1 - (len('\\left') if self.code.endswith('\\left', row_start, position - 1) else 0)
+                position, wide_before, aligned_before = self.skip_spacing(row_start, opening)
+                wide, aligned = wide or wide_before, aligned or aligned_before
+            if not (has_comma or before == ',' or before == '('):
+                comma_index.append(position)
+            if not (has_space or wide or aligned):
+                space_index.append(match.start())
+
+    def check_cases(self, env, comma_index):
+        # expression & condition \\ on every row, the expression ends with a comma
+        row_start = env.body_start
+        while row_start < env.body_end:
+            row_end = self.code.find(_ROW_END, row_start, env.body_end)
+            if row_end == -1:
+                row_end = env.body_end
+            ampersand = self.code.find('&', row_start, row_end)
+            if ampersand != -1 and not self.is_comment(ampersand) and self.code[ampersand + 1:row_end].strip():
+                position, wide, aligned = self.skip_spacing(row_start, ampersand)
+                if position > row_start and self.code[position - 1] != ',':
+                    comma_index.append(position)
+            row_start = row_end + len(_ROW_END)
+
+    def skip_spacing(self, start, position):
+        """Walks back from position over blanks, comments, spacing commands, labels and alignment points.
+        Returns (where the expression ends, a \\quad was passed, an & was passed)."""
+        wide = aligned = False
+        while position > start:
+            char = self.code[position - 1]
+            if char.isspace() or self.is_comment(position - 1):
+                position -= 1
+                continue
+            if char == '&':
+                aligned = True
+                position -= 1
+                continue
+            for token in _WIDE_SPACES + _NARROW_SPACES + _SILENT:
+                if self.code.endswith(token, start, position):
+                    wide = wide or token in _WIDE_SPACES
+                    position -= len(token)
                     break
-                if self.code[i] == ',':
-                    comma_index.append(i)
-                    comma_status = True
-                if (self.code[i: len("\\case")] == "\\case") and (not comma_status):
-                    j = i + len("\\case")
-                    forall = False
-                    while not ((self.code[j: len("\\\\")] == "\\\\") and (self.code[j: len("\\newline")] == "\\newline") and (self.code[j: len("\\linebreak")] == "\\linebreak")) and (self.code[j] == '.'):
-                        if self.code[j: len("\\forall")] == "\\forall":
-                            forall = True
-                            break
-                        j=j+1
-                    if not forall:
-                        error_index.append(i)
-                elif (self.code[i: len("\\text")] == "\\text") and (not comma_status):
-                    j = i + len("\\text")
-                    forall = False
-                    while not ((self.code[j: len("\\\\")] == "\\\\") and (self.code[j: len("\\newline")] == "\\newline") and (self.code[j: len("\\linebreak")] == "\\linebreak")) and (self.code[j] == '.'):
-                        if self.code[j: len("\\forall")] == "\\forall":
-                            forall = True
-                            break
-                        j = j + 1
-                    if not forall:
-                        error_index.append(i)
-                elif (self.code[i: len("\\mbox")] == "\\mbox") and (not comma_status):
-                    j = i + len("\\mbox")
-                    forall = False
-                    while not ((self.code[j: len("\\\\")] == "\\\\") and (self.code[j: len("\\newline")] == "\\newline") and (self.code[j: len("\\linebreak")] == "\\linebreak")) and (self.code[j] == '.'):
-                        if self.code[j: len("\\forall")] == "\\forall":
-                            forall = True
-                            break
-                        j = j + 1
-                    if not forall:
-                        error_index.append(i)
-        error_index2 = []
-        for ind in comma_index:
-            if z.is_in_equation(ind, z.display_equations()):
-                count = 0
-                i = ind+1
-                while self.code[i] == ' ':
-                    count += 1
-                    i += 1
-                else:
-                    if (self.code[i] not in ['\n', '\\']) and (self.code[ind-1] != "\\") and count != 1:
-                        error_index2.append(ind)
-        return [error_index, error_index2]
+            else:
+                if char == '}':
+                    # \hspace{2em}, \hspace*{2em} or \label{...}
+                    opening = self.code.rfind('{', start, position)
+                    command = self.code.rfind('\\', start, opening) if opening != -1 else -1
+                    name = self.code[command + 1:opening].strip() if command != -1 else ''
+                    if name in ('hspace', 'hspace*', 'label'):
+                        wide = wide or name != 'label'
+                        position = command
+                        continue
+                return position, wide, aligned
+        return position, wide, aligned
+
+    def is_comment(self, index):
+        return self.z.document.comments.is_comment(index)
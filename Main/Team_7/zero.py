@@ -1,55 +1,79 @@
+import re
+from collections import namedtuple
+
+from Common.document import Document
+from Common.mathindex import INLINE
+
+# A decimal number such as 0.25, .5, 1.200 or \,.5 : integer and fraction are its digits
+# around the point, region is 'prose', 'inline' or 'display'
+NumericLiteral = namedtuple('NumericLiteral', ['start', 'end', 'integer', 'fraction', 'region'])
+
+PROSE = 'prose'
+
+# Version and section numbers (1.2.10) are not decimals, neither are the digits of a longer word
+_DECIMAL = re.compile(r'(?<![\w.])(?P<integer>\d*)\.(?P<fraction>\d+)(?!\w|\.\d)')
+
+# Lengths and key=value options written in the text (\vspace{-.5em}, width=.8\linewidth, scale=.5)
+# are LaTeX settings, not numbers of the paper
+_LENGTH_UNIT = re.compile(r'\s*(?:em|ex|pt|in|cm|mm|bp|pc|sp|mu|\\[a-zA-Z]*(?:width|height|skip))(?![a-zA-Z])')
+_SETTING = re.compile(r'=\s*-?$')
+
+# Keys and file names given to reference, label and file commands (\ref{eq:1.0}, \label{sec:2.10})
+_KEY_ARGUMENT = re.compile(
+    r'\\(?:label|ref|eqref|pageref|autoref|[cC]ref|nameref|cite[a-zA-Z]*|nocite|bibitem|url|href'
+    r'|input|include|includegraphics)\*?\s*(?:\[[^\]]*\]\s*)?\{[^{}]*$')
+
+
 class zero:
-    def __init__(self, code, begin_index):
+    def __init__(self, code, begin_index, document=None):
         self.code = code
         self.begin_index = begin_index
+        self.document = document if document is not None else Document(code)
+        # [index of the opening delimiter, index of the closing delimiter] of the equations after begin_index,
+        # taken once from the math index of the document and shared by the tasks given this zero
+        regions = [region for region in self.document.math.regions if region.start >= begin_index]
+        self.inline_spans = [[region.start, region.body_end] for region in regions if region.kind == INLINE]
+        self.display_spans = [[region.start, region.body_end] for region in regions if region.kind != INLINE]
+
+    def numeric_literals(self):
+        """Every decimal number between begin_index and the bibliography, in prose and in math,
+        found in one regex pass. Comments, LaTeX lengths and settings and the keys of references
+        and labels are left out."""
+        literals = []
+        math = self.document.math
+        comments = self.document.comments
+        for match in _DECIMAL.finditer(self.code, self.begin_index, max(self.document.text_end, self.begin_index)):
+            start = match.start()
+            if comments.is_comment(start) or _KEY_ARGUMENT.search(self.code, max(start - 100, 0), start):
+                continue
+            region = math.region_at(start)
+            if region is not None and region.body_start <= start < region.body_end:
+                kind = INLINE if region.kind == INLINE else 'display'
+            elif region is None:
+                kind = PROSE
+                if _LENGTH_UNIT.match(self.code, match.end()) or \
+                        _SETTING.search(self.code, max(start - 4, 0), start):
+                    continue
+            else:
+                continue  # inside a delimiter
+            literals.append(NumericLiteral(start, match.end(), match.group('integer'), match.group('fraction'), kind))
+        return literals
 
     def run(self):
+        # Index of the point of every decimal without a leading zero and of every trailing zero
         leading_dot_index = []
         trailing_dot_index = []
-        equations = self.get_inline_equations() + self.display_equations()
-        for i in range(self.begin_index, len(self.code)):
-            if (self.code[i] == '.') and (self.code[i + 1].isdigit()) and self.is_in_equation(i, equations):
-                if not self.code[i-1].isdigit():
-                    leading_dot_index.append(i)
-                j = i+1
-                while self.code[j].isdigit():
-                    j += 1
-                else:
-                    if self.code[j-1] == '0':
-                        trailing_dot_index.append(j-1)
+        for literal in self.numeric_literals():
+            if not literal.integer:
+                leading_dot_index.append(literal.start)
+            if literal.fraction.endswith('0'):
+                trailing_dot_index.append(literal.end - 1)
         return leading_dot_index, trailing_dot_index
 
     # A function that generates a list containing starting and ending indices of only inline equations
+    # Each entry is [index of the opening delimiter, index of the closing delimiter]
     def get_inline_equations(self):
-        equations = []
-        found = False
-        current_equation = []
-        for i in range(self.begin_index, len(self.code)):
-            if self.code[i] == '$':
-                current_equation.append(i)
-                if not found:
-                    found = True
-                else:
-                    equations.append(current_equation)
-                    current_equation = []
-                    found = False
-            elif not found and self.code[i:i+len("\\(")] == "\\(":
-                current_equation.append(i)
-                found = True
-            elif found and self.code[i:i+len("\\)")] == "\\)":
-                current_equation.append(i)
-                equations.append(current_equation)
-                found = False
-                current_equation = []
-            elif not found and self.code[i:i + len("\\begin{math}")] == "\\begin{math}":
-                current_equation.append(i)
-                found = True
-            elif found and self.code[i:i + len("\\end{math}")] == "\\end{math}":
-                current_equation.append(i)
-                equations.append(current_equation)
-                found = False
-                current_equation = []
-        return equations
+        return self.inline_spans
 
     def is_in_equation(self, x, equations):
         for i in equations:
@@ -58,88 +82,16 @@ class zero:
         else:
             return False
 
+    # True when x is inside an equation of the text, a binary search in the math index of the document
+    def is_in_math(self, x, display_only=False):
+        region = self.document.math.region_at(x)
+        if region is None or region.start < self.begin_index:
+            return False
+        if display_only and region.kind == INLINE:
+            return False
+        return region.body_start <= x < region.body_end
+
     # Function that generates list containing indices of equations
+    # Each entry is [index of the opening delimiter or \begin{env}, index of the closing one]
     def display_equations(self):
-        equations = []
-        found = False
-        current_equation = []
-        for i in range(self.begin_index, len(self.code)):
-            if not found and self.code[i:i + len("\\begin{equation}")] == "\\begin{equation}" :
-                current_equation.append(i)
-                found = True
-            elif found and self.code[i:i + len("\\end{equation}")] == "\\end{equation}" :
-                current_equation.append(i)
-                equations.append(current_equation)
-                found = False
-                current_equation = []
-            elif not found and self.code[i:i + len("\\begin{align}")] == "\\begin{align}" :
-                current_equation.append(i)
-                found = True
-            elif found and self.code[i:i + len("\\end{align}")] == "\\end{align}" :
-                current_equation.append(i)
-                equations.append(current_equation)
-                found = False
-                current_equation = []
-            elif not found and self.code[i:i + len("\\begin{align*}")] == "\\begin{align*}" :
-                current_equation.append(i)
-                found = True
-            elif found and self.code[i:i + len("\\end{align*}")] == "\\end{align*}" :
-                current_equation.append(i)
-                equations.append(current_equation)
-                found = False
-                current_equation = []
-            elif not found and self.code[i:i + len("\\begin{bmatrix}")] == "\\begin{bmatrix}" :
-                current_equation.append(i)
-                found = True
-            elif found and self.code[i:i + len("\\end{bmatrix}")] =="\\end{bmatrix}" :
-                current_equation.append(i)
-                equations.append(current_equation)
-                found = False
-                current_equation = []
-            elif not found and self.code[i:i + len("\\begin{multiline}")] == "\\begin{multiline}" :
-                current_equation.append(i)
-                found = True
-            elif found and self.code[i:i + len("\\end{multiline}")] =="\\end{multiline}" :
-                current_equation.append(i)
-                equations.append(current_equation)
-                found = False
-                current_equation = []
-            elif not found and self.code[i:i + len("\\begin{multiline*}")] == "\\begin{multiline*}" :
-                current_equation.append(i)
-                found = True
-            elif found and self.code[i:i + len("\\end{multiline*}")] =="\\end{multiline*}" :
-                current_equation.append(i)
-                equations.append(current_equation)
-                found = False
-                current_equation = []
-            elif not found and self.code[i:i + len("\\begin{gather}")] == "\\begin{gather}":
-                current_equation.append(i)
-                found = True
-            elif found and self.code[i:i + len("\\end{gather}")] == "\\end{gather}":
-                current_equation.append(i)
-                equations.append(current_equation)
-                found = False
-                current_equation = []
-            elif not found and self.code[i:i + len("\\begin{gather*}")] == "\\begin{gather*}":
-                current_equation.append(i)
-                found = True
-            elif found and self.code[i:i + len("\\end{gather*}")] == "\\end{gather*}":
-                current_equation.append(i)
-                equations.append(current_equation)
-                found = False
-                current_equation = []
-            elif not found and self.code[i:i + len("\\begin{tabular}")] == "\\begin{tabular}":
-                current_equation.append(i)
-                found = True
-            elif found and self.code[i:i + len("\\end{tabular}")] == "\\end{tabular}":
-                current_equation.append(i)
-                equations.append(current_equation)
-                found = False
-                current_equation = []
-        return equations
-
-
-
-
-
-
+        return self.display_spans
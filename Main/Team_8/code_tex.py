@@ -6,32 +6,39 @@
    4.To find and print number of times a each reference has been cited in the latex document
    5.To print the total number of references"""
 import re
+from Common.diagnostics import Findings, literal
+from Common.document import Document
 class team_8:
     # Constructor
-    def __init__(self, latex_code,text_begin):
+    def __init__(self, latex_code,text_begin,document=None):
         self.latex_code = latex_code  # The entire LaTex code is in the form of string in the latex_code string
         self.text_begin = text_begin  # location of \begin
+        self.document = document if document is not None else Document(latex_code)  # shared parsed document
         
     def run(self):  # will be invoked by wrapper, shouldn't take arguments
-        output = []
+        output = Findings('team_8', self.document)
         text = self.latex_code
         # use self
         str_line = '=' * 50
         output.append(str_line + '\n\tSyntax related comments\n' + str_line + '\n')
+        bibliography = self.extract_bibliography()
+        if bibliography is None:
+            output.append("No bibliography found: the paper has no thebibliography environment and no .bbl file for its \\bibliography.\n")
+            return output.output
         output.append('Reference'+str(' '*21)+'Number'+str(' '*3)+'Comments\n')
-        bibliography = self.extract_bibliography(text)
-        # Split the text by \bibitem{
-        split_text = bibliography.split('\\bibitem{') 
+        # The bibliography is split into its bibitems once, for the syntax, acronym and citation checks
+        items = bibliography.split('\\bibitem')[1:]
         # Create a dictionary with keys and lists starting from 1
-        my_dictionary = {item.split('}')[0]: [index + 1] for index, item in enumerate(split_text[1:])}
+        my_dictionary = {item[item.find('{')+1:item.find('}')]: [index + 1] for index, item in enumerate(items)}
         for key in my_dictionary:
             my_dictionary[key].append(0)
-        self.syntax(bibliography,output)
+        self.bibitem_places = self.places()
+        self.syntax(items,output)
         
         output.append(str_line + '\n\tAcronym related comments\n' + str_line + '\n')
         output.append('Reference'+str(' '*21)+'Number'+str(' '*3)+'Comments\n')
         EE=[]
-        self.acronym(bibliography,output,EE)
+        self.acronym(items,output,EE)
         
         output.append(str_line + '\n\tList of Electrical Engineering related Acronyms\n' + str_line + '\n')
         rs = ', '.join(EE)
@@ -50,15 +57,26 @@ class team_8:
             output.extend([key+str(' '*(30-len(key)))+str(my_dictionary[key][0])+str(' '*x)+str(my_dictionary[key][1])+"\n"])
         output.extend(["\nTotal number of references = ",str(len(my_dictionary)),"\n"])
         
-        return output
+        return output.output
 
-    def extract_bibliography(self, text):
-        bibliography_pattern = re.compile(r'\\begin{thebibliography}(.*?)\\end{thebibliography}', re.DOTALL)
-        match = bibliography_pattern.search(text)
-        if match:
-            return(match.group(1).strip())
-        else:
-            return(None)
+    def places(self):
+        # Line, column and file of every bibitem key, those of the paper take precedence over the .bbl file
+        places = {}
+        for document, file in ((self.document.bbl, self.document.bbl_name or None), (self.document, None)):
+            if document is not None:
+                places.update((item.key, (document.lines.line_of(item.start), document.lines.column_of(item.start), file))
+                              for item in document.bibitems)
+        return places
+
+    def comment(self, output, rule, refname, number, message, spacing=' '*8):
+        # A comment on a reference, listed under its key and number and located at its bibitem
+        line, column, file = self.bibitem_places.get(refname, (None, None, None))
+        output.add(rule, message, line, column=column, file=file,
+                   layout=literal(refname+str(' '*(30-len(refname)))+str(number)+spacing)+"{message}\n")
+
+    def extract_bibliography(self):
+        # Text between \begin{thebibliography} and \end{thebibliography}, of the paper, of its .bbl file or of both
+        return self.document.bibliography_text()
     def cite(self,text,output,my_dictionary):
         # Use regular expression to find \cite{...}
         pattern = re.compile(r'\\cite{([^}]+)}')
@@ -74,11 +92,10 @@ class team_8:
                 if sub_element.strip() in my_dictionary:
                     my_dictionary[sub_element.strip()][1]=my_dictionary[sub_element.strip()][1]+1
     
-    def syntax(self,bibliography,output):
-        split1=bibliography.split('\\bibitem')
-        del(split1[0])
+    def syntax(self,items,output):
+        split1=items
         #To separate bib_content into three parts
-        for i in split1:
+        for number, i in enumerate(split1, 1):
             split2=[]
             split2.append(i[:i.find("``")])
             split2.append(i[i.find("``")+2:i.find("''")])
@@ -90,14 +107,14 @@ class team_8:
             split2[1]=split2[1].strip()
             split2[2]=split2[2].strip()
             if ("``" not in i and "''" in i) or ("''" not in i and "``" in i):
-                output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        quotes are missing\n")
+                self.comment(output, 'syntax', refname, number, "quotes are missing")
              
             elif "``" in i and "''" in i:
                 #Author names check
                 if '.' not in split2[0]:
-                    output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        Author names should be in should be in short form like K.~Mehta or A.~N. Mishra\n")
+                    self.comment(output, 'syntax', refname, number, "Author names should be in should be in short form like K.~Mehta or A.~N. Mishra")
                 if '~' not in split2[0]:
-                    output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        Author names should contain ~ like K.~Mehta or A.~N. Mishra\n")
+                    self.comment(output, 'syntax', refname, number, "Author names should contain ~ like K.~Mehta or A.~N. Mishra")
                 
                 xi = None
                 index_counter = 0
@@ -105,7 +122,7 @@ class team_8:
                     x = split2[0][index_counter]   
                     if x in ['\t', ' ', '~'] and index_counter + 1 < len(split2[0]):
                         if split2[0][index_counter + 1].isalpha() and split2[0][index_counter + 1].islower() and (index_counter + 2 < len(split2[0]) and split2[0][index_counter + 2] != 'n'):
-                            output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+str(y)+"        Author names should be in should be in short form and capital like K.~Mehta\n")
+                            self.comment(output, 'syntax', refname, number, "Author names should be in should be in short form and capital like K.~Mehta", spacing=str(y)+' '*8)
                     index_counter += 1
                 #comma check
                 (ct,cc)=(0,0)
@@ -117,58 +134,58 @@ class team_8:
                 if cc<ct:
                     
                     if split2[0][-1]!=',':
-                        output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        comma is missing before opening quote\n")
+                        self.comment(output, 'syntax', refname, number, "comma is missing before opening quote")
                         cc+=1
                     if split2[1][-1]!=',':
-                        output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        comma is missing before opening quote\n")
+                        self.comment(output, 'syntax', refname, number, "comma is missing before opening quote")
                     if 'and' in split2[0]:
                         y=split2[0].find('and')
                         if ct>2 and split2[0][y-2]!=',' :
-                            output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        comma is missing before and\n")
+                            self.comment(output, 'syntax', refname, number, "comma is missing before and")
                             cc+=1
                     if cc<ct and ct>2:
-                        output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        comma is missing between author names\n")
+                        self.comment(output, 'syntax', refname, number, "comma is missing between author names")
             
             #journal,
             if 'Trans.' in split2[2]:
                 #full form check
                 if 'volume' in split2[2] or 'Volume' in split2[2]:
-                    output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        volume should be in short form like vol.~\n")
+                    self.comment(output, 'syntax', refname, number, "volume should be in short form like vol.~")
                 if 'number' in split2[2] or 'Number' in split2[2]:
-                    output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        number should be in short form like no.~\n")
+                    self.comment(output, 'syntax', refname, number, "number should be in short form like no.~")
                 if 'page number' in split2[2] or 'Page Number' in split2[2] or 'page number range' in split2[2]:
-                    output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        page number should be in short form like pp. 11--22\n")
+                    self.comment(output, 'syntax', refname, number, "page number should be in short form like pp. 11--22")
                 if 'January' in split2[2] or 'February' in split2[2] or 'March' in split2[2] or 'April' in split2[2] or 'June' in split2[2] or 'July' in split2[2] or 'August' in split2[2] or 'September' in split2[2] or 'October' in split2[2] or 'November' in split2[2] or 'December' in split2[2]:
-                    output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        month should be in short form like Jan. (except May)\n")
+                    self.comment(output, 'syntax', refname, number, "month should be in short form like Jan. (except May)")
                 #vol missing check
                 if 'vol' not in split2[2]:
-                    output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        volume is missing\n")
+                    self.comment(output, 'syntax', refname, number, "volume is missing")
                 else:
                     j=split2[2].rfind('vol')
                     if split2[2][j+3]!='.':
-                        output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        full stop is missing after vol\n")
+                        self.comment(output, 'syntax', refname, number, "full stop is missing after vol")
                     if split2[2][j+4]!='~' and split2[2][j+3]!='~':
-                        output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        Warning:~ is missing after vol.\n")
+                        self.comment(output, 'syntax', refname, number, "Warning:~ is missing after vol.")
                 #no missing check
                 if 'no' not in split2[2]:
-                    output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        number is missing\n")
+                    self.comment(output, 'syntax', refname, number, "number is missing")
                 else:
                     j=split2[2].rfind('no')
                     if split2[2][j+2]!='.':
-                        output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        full stop is missing after no\n")
+                        self.comment(output, 'syntax', refname, number, "full stop is missing after no")
                     if split2[2][j+2]!='~' and split2[2][j+3]!='~':
-                        output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        Warning:~ is missing after no.\n")
+                        self.comment(output, 'syntax', refname, number, "Warning:~ is missing after no.")
                 if 'pp' not in split2[2]:
-                    output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        pp is missing\n")
+                    self.comment(output, 'syntax', refname, number, "pp is missing")
                 else:
                     j=split2[2].rfind('pp')
                     if split2[2][j+2]!='.':
-                        output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        full stop is missing after pp\n")
+                        self.comment(output, 'syntax', refname, number, "full stop is missing after pp")
                     if '--' not in split2[2]:
-                        output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        double hyphen should be used for page number range\n")
+                        self.comment(output, 'syntax', refname, number, "double hyphen should be used for page number range")
                 #date missing check
                 if 'Jan' not in split2[2] and 'Feb' not in split2[2] and 'Mar' not in split2[2] and 'Apr' not in split2[2] and 'May' not in split2[2] and 'Jun' not in split2[2] and 'Jul' not in split2[2] and 'Aug' not in split2[2] and 'Sep' not in split2[2] and 'Oct' not in split2[2] and 'Nov' not in split2[2] and 'Dec' not in split2[2]:
-                    output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"     month is missing \n")
+                    self.comment(output, 'syntax', refname, number, "month is missing ", spacing='     ')
                 else:
                     f=0
                     for m in ['Jan.','Feb.','Mar.','Apr.','May','Jun.','Jul.','Aug.','Sep.','Oct.','Nov.','Dec.']:
@@ -176,20 +193,20 @@ class team_8:
                             f=1
                             break
                     if f==0:
-                        output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        full stop is missing after month in short form\n")
+                        self.comment(output, 'syntax', refname, number, "full stop is missing after month in short form")
             #Conference check
             if 'Proc.' in split2[2]:
                 if 'page number' in split2[2] or 'Page Number' in split2[2] or 'page number range' in split2[2]:
-                    output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"         page number should be in short form like pp. 11--22\n")
+                    self.comment(output, 'syntax', refname, number, "page number should be in short form like pp. 11--22", spacing='         ')
                 if 'January' in split2[2] or 'February' in split2[2] or 'March' in split2[2] or 'April' in split2[2] or 'June' in split2[2] or 'July' in split2[2] or 'August' in split2[2] or 'September' in split2[2] or 'October' in split2[2] or 'November' in split2[2] or 'December' in split2[2]:
-                    output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"     month should be in short form like Jan. (except May)\n")
+                    self.comment(output, 'syntax', refname, number, "month should be in short form like Jan. (except May)", spacing='     ')
                 if 'volume' in split2[2] or 'Volume' in split2[2]:
-                    output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"         volume should be in short form like vol.~\n")
+                    self.comment(output, 'syntax', refname, number, "volume should be in short form like vol.~", spacing='         ')
                 if 'number' in split2[2] or 'Number' in split2[2]:
-                    output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        number should be in short form like no.~\n")
+                    self.comment(output, 'syntax', refname, number, "number should be in short form like no.~")
 
                 if 'Jan' not in split2[2] and 'Feb' not in split2[2] and 'Mar' not in split2[2] and 'Apr' not in split2[2] and 'May' not in split2[2] and 'Jun' not in split2[2] and 'Jul' not in split2[2] and 'Aug' not in split2[2] and 'Sep' not in split2[2] and 'Oct' not in split2[2] and 'Nov' not in split2[2] and 'Dec' not in split2[2]:
-                    output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"     month is missing \n")
+                    self.comment(output, 'syntax', refname, number, "month is missing ", spacing='     ')
                 else:
                     f=0
                     for m in ['Jan.','Feb.','Mar.','Apr.','May','Jul.','Aug.','Sep.','Oct.','Nov.','Dec.']:
@@ -197,66 +214,66 @@ class team_8:
                             f=1
                             break
                     if f==0:
-                        output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        full stop is missing after month in short form\n")
+                        self.comment(output, 'syntax', refname, number, "full stop is missing after month in short form")
 
                 if 'pp' not in split2[2]:
-                    output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        pp is missing\n")
+                    self.comment(output, 'syntax', refname, number, "pp is missing")
                 else:
                     j=split2[2].rfind('pp')
                     if split2[2][j+2]!='.':
-                        output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        full stop is missing after pp\n")
+                        self.comment(output, 'syntax', refname, number, "full stop is missing after pp")
                     if '--' not in split2[2]:
-                        output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        double hyphen should be used for page number range\n")
+                        self.comment(output, 'syntax', refname, number, "double hyphen should be used for page number range")
                 if 'vol' not in split2[2]:
                     pass
                 else:
                     j=split2[2].rfind('vol')
                     if split2[2][j+3]!='.':
-                        output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        full stop is missing after vol\n")
+                        self.comment(output, 'syntax', refname, number, "full stop is missing after vol")
                     if split2[2][j+4]!='~' and split2[2][j+3]!='~':
-                        output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        Warning:~ is missing after vol.\n")
+                        self.comment(output, 'syntax', refname, number, "Warning:~ is missing after vol.")
                 if 'no' not in split2[2]:
                     pass
                 else:
                     j=split2[2].rfind('no')
                     if split2[2][j+2]!='.':
-                        output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        full stop is missing after no\n")
+                        self.comment(output, 'syntax', refname, number, "full stop is missing after no")
                     if split2[2][j+2]!='~' and split2[2][j+3]!='~':
-                        output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        Warning:~ is missing after no.\n")
+                        self.comment(output, 'syntax', refname, number, "Warning:~ is missing after no.")
             #Others check
             if 'Trans' not in split2[2] and'Proc.' not in split2[2]:
                 if 'volume' in split2[2] or 'Volume' in split2[2]:
-                    output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        volume should be in short form like vol.~\n")
+                    self.comment(output, 'syntax', refname, number, "volume should be in short form like vol.~")
                 if 'number' in split2[2] or 'Number' in split2[2]:
-                    output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        number should be in short form like no.~\n")
+                    self.comment(output, 'syntax', refname, number, "number should be in short form like no.~")
                 if 'page number' in split2[2] or 'Page Number' in split2[2] or 'page number range' in split2[2]:
-                    output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        page number should be in short form like pp. 11--22\n")
+                    self.comment(output, 'syntax', refname, number, "page number should be in short form like pp. 11--22")
                 if 'January' in split2[2] or 'February' in split2[2] or 'March' in split2[2] or 'April' in split2[2] or 'June' in split2[2] or 'July' in split2[2] or 'August' in split2[2] or 'September' in split2[2] or 'October' in split2[2] or 'November' in split2[2] or 'December' in split2[2]:
-                    output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        month should be in short form like Jan. (except May)\n")
+                    self.comment(output, 'syntax', refname, number, "month should be in short form like Jan. (except May)")
                 if 'vol' not in split2[2]:
                     pass
                 else:
                     j=split2[2].rfind('vol')
                     if split2[2][j+3]!='.':
-                        output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        full stop is missing after vol\n")
+                        self.comment(output, 'syntax', refname, number, "full stop is missing after vol")
                     if split2[2][j+4]!='~' and split2[2][j+3]!='~':
-                        output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        Warning:~ is missing after vol.\n")
+                        self.comment(output, 'syntax', refname, number, "Warning:~ is missing after vol.")
                 if 'no' not in split2[2]:
                     pass
                 else:
                     j=split2[2].rfind('no')
                     if split2[2][j+2]!='.':
-                        output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        full stop is missing after no\n")
+                        self.comment(output, 'syntax', refname, number, "full stop is missing after no")
                     if split2[2][j+2]!='~' and split2[2][j+3]!='~':
-                        output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        Warning:~ is missing after no.\n")
+                        self.comment(output, 'syntax', refname, number, "Warning:~ is missing after no.")
                 if 'pp' not in split2[2]:
                     pass
                 else:
                     j=split2[2].rfind('pp')
                     if split2[2][j+2]!='.':
-                        output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        full stop is missing after pp\n")
+                        self.comment(output, 'syntax', refname, number, "full stop is missing after pp")
                     if '--' not in split2[2]:
-                        output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        double hyphen should be used for page number range\n")
+                        self.comment(output, 'syntax', refname, number, "double hyphen should be used for page number range")
                 if 'Jan' not in split2[2] and 'Feb' not in split2[2] and 'Mar' not in split2[2] and 'Apr' not in split2[2] and 'May' not in split2[2] and 'Jun' not in split2[2] and 'Jul' not in split2[2] and 'Aug' not in split2[2] and 'Sep' not in split2[2] and 'Oct' not in split2[2] and 'Nov' not in split2[2] and 'Dec' not in split2[2]:
                     pass
                 else:
@@ -266,9 +283,9 @@ class team_8:
                             f=1
                             break
                     if f==0:
-                        output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        full stop is missing after month in short form\n")
+                        self.comment(output, 'syntax', refname, number, "full stop is missing after month in short form")
     
-    def acronym(self,bibliography,output,EE):
+    def acronym(self,items,output,EE):
         #more ee acronyms can be added to this list in future if required
         ee_acronyms = [
         "PLD", "VHDL", "ASIC", "RTL", "GUI",
@@ -329,10 +346,8 @@ class team_8:
 
         # Extend the original list with the second set of additional acronyms2
         ee_acronyms.extend(additional_acronyms_2)
-        split1=bibliography.split('\\bibitem')
-        del(split1[0])
-        #output.extend(split1[0])
-        for i in split1:
+        split1=items
+        for number, i in enumerate(split1, 1):
             split2=[]
             split2.append(i[:i.find("``")].strip())
             split2.append(i[i.find("``")+2:i.find("''")].strip())
@@ -349,7 +364,7 @@ class team_8:
                 sp = re.split(pattern, split2[1])
                 if '' in sp:
                     sp = [x for x in sp if x != '']
-                #output.extend(["In reference number [",str(split1.index(i)+1),"],",str(sp)])
+                #output.extend(["In reference number [",str(number),"],",str(sp)])
                 for word in sp:
                     c=0
                     for w in word:
@@ -357,11 +372,11 @@ class team_8:
                             c+=1
                     if c>=2:
                         if word[0]!='{' and word[-1]!='}':
-                            output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        Warning:acronym ",word," should be in curly braces\n")
+                            self.comment(output, 'acronym', refname, number, "Warning:acronym "+word+" should be in curly braces")
                         elif word[0]!='{':
-                            output.extend(refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        opening brace is missing before acronym ",word,"\n")
+                            self.comment(output, 'acronym', refname, number, "opening brace is missing before acronym "+word)
                         elif '}' not in word:
-                            output.extend([refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        closing brace is missing after acronym ",word,"\n"])
+                            self.comment(output, 'acronym', refname, number, "closing brace is missing after acronym "+word)
                 for word in sp:
                     delimiters1 = ['{', '}', '-','/']
                     # Construct a regular expression pattern with the delimiters
@@ -376,7 +391,7 @@ class team_8:
                             if wdd.isalpha() and wdd.isupper():
                                 c+=1
                         if c>=2 and c!=len(wd):
-                            output.extend([refname+str(' '*(30-len(refname)))+str(split1.index(i)+1)+"        Warning:acronym ",wd," should be in capitals\n"])
+                            self.comment(output, 'acronym', refname, number, "Warning:acronym "+wd+" should be in capitals")
                         if wd.upper() in ee_acronyms and wd.upper() not in EE:
                             EE.append(wd.upper())
 
@@ -0,0 +1,293 @@
+# Analysis pipeline shared by the GUI wrapper (main.py) and the batch CLI (batch.py)
+
+import os
+import re
+
+# The teams are registered in Common/registry.py and imported only when they run
+
+from Common import registry
+from Common.incremental import fingerprint, load_state, reusable_outputs, save_state
+from Common.diagnostics import WRITERS, over_budget, records, render
+from Common.document import Document
+from Common.project import load_project
+from Common.report import ReportSink
+from Common.timing import run_timed, write_timings
+from Common.watchdog import BudgetExceeded, WorkerPool
+
+# \bibliography{...} outside a comment: the references are then in the .bbl file written by BibTeX
+_BIBTEX_PATTERN = re.compile(r'^[^%\n]*\\bibliography\s*\{', re.MULTILINE)
+
+# Default budgets of one team on one document, see run_teams
+TEAM_TIME_LIMIT = 120.0                 # seconds
+TEAM_MEMORY_LIMIT = 2 * 1024 ** 3       # bytes
+
+
+def bbl_path(filepath):
+    # 'dir/myfile.tex' → 'dir/myfile.bbl', where BibTeX writes the references of the paper
+    return os.path.splitext(filepath)[0] + ".bbl"
+
+
+def read_input(filepath, project=None):
+    # Returns the LaTeX code, the index of \begin{document} and the sibling .bbl text (if any).
+    # The files the paper includes are part of the LaTeX code, see Common/project.py.
+    # The .bbl file is only read when the paper takes its references from BibTeX with \bibliography.
+    bbl_text = ""
+    if project is None:
+        project = load_project(filepath)
+    text = project.text
+    begin_index = text.find(r'\begin{document}')
+
+    if _BIBTEX_PATTERN.search(text) and os.path.exists(bbl_path(filepath)):
+        with open(bbl_path(filepath), 'r', errors='ignore') as bbl_file:
+            bbl_text = bbl_file.read()
+
+    return text, begin_index, bbl_text
+
+
+def log_path(filepath):
+    # 'dir/myfile.tex' → 'dir/myfile_comments.log'
+    ip_dir = os.path.dirname(filepath)
+    base_name = os.path.splitext(os.path.basename(filepath))[0]
+    return os.path.join(ip_dir, base_name + "_comments.log")
+
+
+def run_teams(text, begin_index, parallel=False, state_file=None, previous_state_file=None, cache=None,
+              sink=None, timings=None, time_limit=None, memory_limit=None, diagnostics=None, checks=None,
+              bbl_text='', bbl_name=''):
+    # Calling all team run() files, a failing team does not stop the others.
+    # The document is parsed once here and the same model is handed to every team.
+    # Outputs found in the result cache for this exact text are used as they are.
+    # With a state_file the teams whose input did not change since the stored run
+    # (or since the run stored at previous_state_file) are skipped and the new state is stored.
+    # Every team output is passed to the sink as soon as it and the teams before it are done.
+    # The time spent by every team and check is recorded in timings (a dict) when it is given.
+    # With a time_limit (seconds) or a memory_limit (bytes) the teams run in the worker pool, one after
+    # another when not parallel, and a team going over its budget is stopped and reported in its section.
+    # The findings of every team are added to diagnostics (a list of Diagnostic) when it is given.
+    # checks (from registry.select) are the teams to run, all registered teams by default.
+    # bbl_text is the .bbl file of the paper (named bbl_name), its references are read with the paper's.
+    checks = registry.CHECKS if checks is None else checks
+    names = [check.team for check in checks]
+    cached = {}
+    cache_key = None
+    if cache is not None:
+        cache_key = cache.key(text, begin_index, bbl_text)
+        cached = cache.get(cache_key) or {}
+    reused = {name: cached[name] for name in names if name in cached}
+
+    document = None
+    fingerprints = {}
+    if state_file or len(reused) < len(names):
+        document = Document(text, bbl_text, bbl_name)
+    if state_file:
+        fingerprints = {name: fingerprint(document, begin_index, name) for name in names}
+        previous = reusable_outputs(load_state(previous_state_file or state_file), text, fingerprints)
+        reused = dict(previous, **reused)
+    to_run = [name for name in names if name not in reused]
+    if (parallel or time_limit or memory_limit) and to_run:
+        warm_nlp = any(check.cost == 'nlp' for check in checks if check.team in to_run)
+        results = run_teams_parallel(text, begin_index, document, to_run, warm_nlp, time_limit, memory_limit,
+                                     workers=None if parallel else 1)
+    else:
+        results = run_teams_sequential(text, begin_index, document, to_run)
+
+    output = []
+    by_name = {}
+    ran = False
+    for name in names:
+        team_output = reused.get(name)
+        kept = True
+        if team_output is None and name in to_run:
+            team_output, record = next(results)
+            if timings is not None and record is not None:
+                timings[name] = record
+            if record is not None and record.get("over_budget"):
+                kept = False  # shown in the log but neither cached nor stored, the team will run again next time
+            else:
+                ran = ran or team_output is not None
+        elif timings is not None and team_output is not None:
+            timings[name] = {"cached": True}
+        if team_output is not None:
+            # The log shows the text of the output, its findings rendered from their records
+            logs = render(team_output)
+            output.append(logs)
+            if kept:
+                by_name[name] = team_output
+            if sink is not None:
+                sink.write_section(logs)
+            if diagnostics is not None:
+                diagnostics.extend(records(team_output))
+    if cache is not None and ran:
+        # The outputs of the teams left out of this run stay in the entry
+        cache.put(cache_key, dict(cached, **by_name))
+    if state_file:
+        save_state(state_file, text, begin_index, fingerprints, by_name)
+    return output
+
+
+def run_teams_sequential(text, begin_index, document, names):
+    # Yields the output and timing record of every team in order, None for a team that failed
+    for name in names:
+        try:
+            yield run_timed(registry.load(name), text, begin_index, document)
+        except Exception as e:
+            print(f"Error in team {name} : {e}")
+            yield None, None
+
+
+# Worker processes used to run the teams of one document side by side, or under budgets.
+# The pool is created on first use and kept alive so the NLTK models stay loaded,
+# only a worker stopped at its budget is replaced (see Common/watchdog.py).
+_team_pool = None
+
+
+def _init_team_worker(warm_nlp=True, preload=()):
+    # Loads the NLTK tokenizer and tagger once per worker instead of once per document,
+    # and imports the modules of the teams in preload so their first run is as fast as the next ones
+    for name in preload:
+        try:
+            registry.load(name)
+        except Exception as e:
+            print(f"Team {name} could not be preloaded : {e}")
+    if not warm_nlp:
+        return
+    try:
+        from Common.nlp import missing_resources, pos_tag, word_tokenize
+        if missing_resources():
+            return  # reported once by check_resources, not by every worker
+        pos_tag(word_tokenize("Warm up the tagger"))
+    except Exception as e:
+        print(f"NLTK models could not be preloaded : {e}")
+
+
+def check_resources(checks=None):
+    # Raises LookupError naming the missing NLTK data when one of the checks (all by default) needs it,
+    # the entry points call it before any team runs
+    checks = registry.CHECKS if checks is None else checks
+    if any(check.cost == 'nlp' for check in checks):
+        from Common.nlp import require_all
+        require_all()
+
+
+def _run_team(name, text, begin_index, document):
+    # Runs in a worker process, errors are returned instead of raised so one team cannot hide another.
+    # The module of the team is imported by the worker, the first time it runs that team.
+    try:
+        return run_timed(registry.load(name), text, begin_index, document) + (None,)
+    except MemoryError:
+        raise  # reported by the worker pool as over budget
+    except Exception as e:
+        return None, None, f"Error in team {name} : {e}"
+
+
+def get_team_pool(workers=None, warm_nlp=True, preload=(), time_limit=None, memory_limit=None):
+    # warm_nlp and preload are only read when the pool is created, see _init_team_worker.
+    # The pool is started again when other budgets, or another number of workers, are asked for.
+    global _team_pool
+    if _team_pool is not None and ((_team_pool.time_limit, _team_pool.memory_limit) != (time_limit, memory_limit)
+                                   or workers and _team_pool.workers != workers):
+        shutdown_team_pool()
+    if _team_pool is None:
+        workers = workers or min(len(registry.CHECKS), os.cpu_count() or 1)
+        _team_pool = WorkerPool(workers, _init_team_worker, (warm_nlp, tuple(preload)), time_limit, memory_limit)
+    return _team_pool
+
+
+def shutdown_team_pool():
+    global _team_pool
+    if _team_pool is not None:
+        _team_pool.shutdown()
+        _team_pool = None
+
+
+def run_teams_parallel(text, begin_index, document, names, warm_nlp=True, time_limit=None, memory_limit=None,
+                       workers=None):
+    # Every team runs in a worker process of the pool. The outputs and timing records are yielded
+    # in team order, each one as soon as its team is done, None for a team that failed.
+    # A team over its budget yields a one line section saying so, with an "over_budget" record.
+    pool = get_team_pool(workers, warm_nlp=warm_nlp, time_limit=time_limit, memory_limit=memory_limit)
+    futures = [pool.submit(_run_team, name, text, begin_index, document) for name in names]
+    for name, future in zip(names, futures):
+        try:
+            team_output, record, error = future.result()
+        except BudgetExceeded as e:
+            print(f"Team {name} {e}")
+            yield over_budget(name, f"{e}, its comments are missing."), {"over_budget": e.kind}
+            continue
+        except Exception as e:
+            team_output, record, error = None, None, f"Error in team {name} : {e}"
+        if error:
+            print(error)
+        yield team_output, record
+
+
+def state_path(filepath):
+    # 'dir/myfile.tex' → 'dir/myfile_comments.state', kept for the incremental mode
+    return os.path.splitext(log_path(filepath))[0] + ".state"
+
+
+def timing_path(filepath):
+    # 'dir/myfile.tex' → 'dir/myfile_comments.timing.json'
+    return os.path.splitext(log_path(filepath))[0] + ".timing.json"
+
+
+def diagnostics_path(filepath, output_format):
+    # 'dir/myfile.tex' → 'dir/myfile_comments.jsonl' or 'dir/myfile_comments.sarif'
+    return os.path.splitext(log_path(filepath))[0] + "." + output_format
+
+
+def locate_in_sources(project, diagnostics):
+    # Moves the diagnostics of a multi-file paper to their original files and lines
+    if not project.is_multi_file():
+        return
+    for diagnostic in diagnostics:
+        if diagnostic.file is not None:
+            continue    # already located, in the .bbl file
+        diagnostic.message = project.annotate([diagnostic.message])[0]
+        if diagnostic.line is not None:
+            path, diagnostic.line = project.origin(diagnostic.line)
+            diagnostic.file = project.relative(path)
+
+
+def write_log(out_filepath, output):
+    # Writing all the output logs to the log file
+    with ReportSink(out_filepath) as sink:
+        for logs in output:
+            sink.write_section(logs)
+
+
+def analyze_file(filepath, parallel=False, incremental=False, previous=None, cache=None, copies=(),
+                 listeners=(), time_limit=None, memory_limit=None, formats=(), checks=None, diagnostics=None):
+    # Runs every team on one .tex file and streams '<name>_comments.log' next to it
+    # (and to the extra copies and listeners) while the teams finish.
+    # In incremental mode the outputs stored by the previous run of this file (or of the
+    # previous revision) are reused for the teams whose input did not change.
+    # The time spent by every team and check is written to '<name>_comments.timing.json'.
+    # With a time_limit or a memory_limit every team runs under that budget (see run_teams).
+    # The findings are also written in each of the formats ('jsonl', 'sarif') next to the log.
+    # checks (from registry.select) limits the run to some of the teams.
+    # The findings are added to diagnostics (a list) when it is given.
+    # A paper split with \input, \include or \subfile is analyzed as one document and its comments
+    # and findings point at the original files and lines. Includes that could not be followed are
+    # listed in a first section of the log.
+    project = load_project(filepath)
+    text, begin_index, bbl_text = read_input(filepath, project)
+    current_state = state_path(filepath) if incremental else None
+    previous_state = state_path(previous) if incremental and previous else None
+    out_filepath = log_path(filepath)
+    timings = {}
+    if diagnostics is None and formats:
+        diagnostics = []
+    transform = project.annotate if project.is_multi_file() else None
+    with ReportSink(out_filepath, copies, listeners, transform) as sink:
+        if project.problems:
+            sink.write_section(["Included files\n"] + [f"  {problem}\n" for problem in project.problems])
+        output = run_teams(text, begin_index, parallel, current_state, previous_state, cache, sink, timings,
+                           time_limit, memory_limit, diagnostics, checks,
+                           bbl_text, os.path.basename(bbl_path(filepath)) if bbl_text else '')
+    write_timings(timing_path(filepath), timings)
+    if diagnostics:
+        locate_in_sources(project, diagnostics)
+    for output_format in formats:
+        WRITERS[output_format](diagnostics_path(filepath, output_format), diagnostics, os.path.basename(filepath))
+    return out_filepath, output, timings
@@ -0,0 +1,212 @@
+# Headless batch runner
+"""
+Runs the same teams as the GUI over many .tex files without opening any window.
+
+    python batch.py paper.tex submissions/ "corpus/**/*.tex" -j 8
+
+Directories are searched recursively for .tex files and globs are expanded by Python,
+so they also work on shells that do not expand them. Every document is analyzed in a
+separate worker process and '<name>_comments.log' is written next to it.
+
+With --parallel-teams the documents are taken one at a time and the teams of each
+document run side by side instead, which gives the lowest latency for a single paper.
+
+With --incremental the state of every document is stored next to its log
+('<name>_comments.state'), and the next run only re-runs the teams whose part of the
+document changed. --previous points at the earlier revision of a single paper to diff against:
+
+    python batch.py --incremental paper_v2.tex --previous paper_v1.tex
+
+The team outputs are kept in a cache addressed by the content of each document and the
+version of the checkers, so duplicates and unchanged papers are not analyzed again.
+The number of cache hits and misses is printed with the run summary.
+
+The teams run in worker processes kept for the whole run, under a time and a memory budget
+per team (--time-limit, --memory-limit). A team that goes over is stopped and its worker
+replaced, the log says so in its section and the comments of the other teams are still written.
+
+With --format jsonl or --format sarif the findings are also written as structured records
+('<name>_comments.jsonl', '<name>_comments.sarif') for CI tools to ingest.
+
+--include and --exclude pick the checks to run by rule id, team name or cost class
+(--list-rules shows them). The modules of the other checks are never imported:
+
+    python batch.py paper.tex --include equation-punctuation,bibliography
+    python batch.py paper.tex --exclude nlp
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import analyzer
+from Common import registry
+from Common.diagnostics import WRITERS
+from Common.resultcache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, ResultCache
+
+# Result cache of a worker process, set up by init_worker
+_cache = None
+
+
+def init_worker(cache_dir, cache_bytes):
+    global _cache
+    _cache = ResultCache(cache_dir, cache_bytes) if cache_dir else None
+
+
+def collect_files(paths):
+    # Expands directories and glob patterns into a sorted list of unique .tex files
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            matches = glob.glob(os.path.join(path, '**', '*.tex'), recursive=True)
+        elif glob.has_magic(path):
+            matches = glob.glob(path, recursive=True)
+        else:
+            matches = [path]
+        for match in matches:
+            if os.path.isfile(match) and match.endswith('.tex'):
+                files.append(os.path.abspath(match))
+            elif match == path:
+                print(f"Skipping {path} : not a .tex file", file=sys.stderr)
+    return sorted(set(files))
+
+
+def analyze_one(filepath, options=None, parallel=False):
+    # Worker entry point, only the log path and whether the cache had the document travel back.
+    # options holds the keyword arguments of analyzer.analyze_file (incremental, previous, limits)
+    hits = _cache.hits if _cache else 0
+    out_filepath, output, timings = analyzer.analyze_file(filepath, parallel, cache=_cache, **(options or {}))
+    return out_filepath, _cache is not None and _cache.hits > hits
+
+
+def run_batch_team_parallel(files, options=None, cache_dir=None, cache_bytes=DEFAULT_MAX_BYTES):
+    # Documents one after another, the teams of each document side by side
+    init_worker(cache_dir, cache_bytes)
+    done = 0
+    failed = 0
+    hits = 0
+    start = time.perf_counter()
+    try:
+        for filepath in files:
+            try:
+                out_filepath, hit = analyze_one(filepath, options, parallel=True)
+                done += 1
+                hits += hit
+                print(f"[{done + failed}/{len(files)}] {out_filepath}{' (cached)' if hit else ''}")
+            except Exception as e:
+                failed += 1
+                print(f"[{done + failed}/{len(files)}] Error in {filepath} : {e}", file=sys.stderr)
+    finally:
+        analyzer.shutdown_team_pool()
+    total = time.perf_counter() - start
+    return done, failed, hits, total
+
+
+def run_batch(files, jobs, options=None, cache_dir=None, cache_bytes=DEFAULT_MAX_BYTES):
+    done = 0
+    failed = 0
+    hits = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker,
+                             initargs=(cache_dir, cache_bytes)) as executor:
+        futures = {executor.submit(analyze_one, filepath, options): filepath for filepath in files}
+        for future in as_completed(futures):
+            filepath = futures[future]
+            try:
+                out_filepath, hit = future.result()
+                done += 1
+                hits += hit
+                print(f"[{done + failed}/{len(files)}] {out_filepath}{' (cached)' if hit else ''}")
+            except Exception as e:
+                failed += 1
+                print(f"[{done + failed}/{len(files)}] Error in {filepath} : {e}", file=sys.stderr)
+    total = time.perf_counter() - start
+    return done, failed, hits, total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze LaTeX research articles without the GUI.")
+    parser.add_argument('paths', nargs='*', help=".tex files, directories or glob patterns")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                        help="number of worker processes (default: number of cores)")
+    parser.add_argument('-t', '--parallel-teams', action='store_true',
+                        help="analyze documents one at a time, running their teams in parallel workers")
+    parser.add_argument('-i', '--incremental', action='store_true',
+                        help="reuse the outputs of the previous run for the teams whose input did not change")
+    parser.add_argument('--previous', metavar='TEX',
+                        help="earlier revision of the paper whose stored state is reused (implies --incremental)")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help=f"directory of the result cache (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024), metavar='MB',
+                        help="size bound of the result cache, least recently used entries are evicted (default: %(default)s)")
+    parser.add_argument('--no-cache', action='store_true', help="neither read nor fill the result cache")
+    parser.add_argument('--time-limit', type=float, default=analyzer.TEAM_TIME_LIMIT, metavar='SECONDS',
+                        help="stop a team that runs longer than this on one document, 0 for no limit (default: %(default)s)")
+    parser.add_argument('--memory-limit', type=int, default=analyzer.TEAM_MEMORY_LIMIT // (1024 * 1024), metavar='MB',
+                        help="memory budget of a team on one document, 0 for no limit (default: %(default)s)")
+    parser.add_argument('-f', '--format', action='append', choices=sorted(WRITERS), default=[],
+                        help="also write the findings as '<name>_comments.<format>', can be repeated")
+    parser.add_argument('--include', action='append', default=[], metavar='RULES',
+                        help="only run these checks (rule ids, team names or cost classes, comma separated)")
+    parser.add_argument('--exclude', action='append', default=[], metavar='RULES',
+                        help="do not run these checks (rule ids, team names or cost classes, comma separated)")
+    parser.add_argument('--list-rules', action='store_true', help="list the registered checks and exit")
+    args = parser.parse_args(argv)
+
+    if args.list_rules:
+        for check in registry.CHECKS:
+            print(f"{check.rule:22} {check.team:8} {check.cost:5} {check.title}")
+        return 0
+    if not args.paths:
+        parser.error("the following arguments are required: paths")
+    try:
+        checks = registry.select([name for value in args.include for name in value.split(',') if name],
+                                 [name for value in args.exclude for name in value.split(',') if name])
+    except ValueError as e:
+        parser.error(str(e))
+    if not checks:
+        parser.error("--include and --exclude leave no check to run")
+    try:
+        analyzer.check_resources(checks)
+    except LookupError as e:
+        print(f"{e}\nor leave the checks that need them out with --exclude nlp.", file=sys.stderr)
+        return 1
+
+    files = collect_files(args.paths)
+    if not files:
+        print("No .tex files found.", file=sys.stderr)
+        return 1
+    if args.previous and len(files) != 1:
+        print("--previous can only be used with a single .tex file.", file=sys.stderr)
+        return 1
+    options = {
+        'incremental': args.incremental or bool(args.previous),
+        'previous': os.path.abspath(args.previous) if args.previous else None,
+        'time_limit': args.time_limit or None,
+        'memory_limit': args.memory_limit * 1024 * 1024 or None,
+        'formats': tuple(dict.fromkeys(args.format)),
+        'checks': checks,
+    }
+    cache_dir = None if args.no_cache else args.cache_dir
+    cache_bytes = args.cache_size * 1024 * 1024
+
+    if args.parallel_teams:
+        print(f"Analyzing {len(files)} document(s), teams in parallel")
+        done, failed, hits, total = run_batch_team_parallel(files, options, cache_dir, cache_bytes)
+    else:
+        jobs = max(1, min(args.jobs, len(files)))
+        print(f"Analyzing {len(files)} document(s) with {jobs} worker(s)")
+        done, failed, hits, total = run_batch(files, jobs, options, cache_dir, cache_bytes)
+
+    rate = done / total if total > 0 else 0.0
+    print(f"\n{done} document(s) analyzed, {failed} failed in {total:.2f} s ({rate:.2f} docs/sec)")
+    if cache_dir:
+        print(f"Result cache : {hits} hit(s), {done - hits} miss(es)")
+    return 0 if failed == 0 else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,271 @@
+# Benchmark harness
+"""
+Measures how fast every team runs over the bundled papers and how its cost grows with the
+size of the document.
+
+    python benchmark.py
+    python benchmark.py ../Resources/Latex_example/AS_in_CR_OC_JOUR_v8.tex --scales 1 2 10 --json bench.json
+
+Every .tex file is first analyzed as it is. The scaled file (the largest one by default) is
+then grown 2x, 10x and 100x by replicating its sections, with their equations, and its
+bibitems. For each team the time and the peak memory (measured with tracemalloc, in a
+separate run so that tracing does not slow the timed one) are reported. A team whose time
+grows faster than the size of the document is flagged as superlinear.
+A team that takes longer than --max-seconds at one scale is not run at the larger ones.
+With --synthetic the scaling runs use generated IEEEtran papers (Common/synthetic.py) instead.
+
+The time needed to import main.py is measured first and compared with its budget;
+--startup only runs that check and exits with status 3 when it is over budget.
+"""
+
+import argparse
+import glob
+import json
+import math
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import analyzer
+from Common import registry, synthetic
+from Common.document import Document
+from Common.synthetic import DEFAULT_FEATURES
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Resources', 'Latex_example')
+DEFAULT_SCALES = (1, 2, 10, 100)
+
+# Growth exponent above which a team is flagged, 1 is linear. Timings shorter than
+# MIN_SECONDS are mostly noise and are not used for the exponent.
+SUPERLINEAR_EXPONENT = 1.3
+MIN_SECONDS = 0.05
+
+# Time allowed for importing main.py, on top of starting the interpreter
+STARTUP_BUDGET = 0.5
+
+
+def startup_time(module='main', repeat=5):
+    """Seconds spent importing module in a fresh interpreter, best of repeat runs.
+    The time to start an empty interpreter is subtracted."""
+    main_dir = os.path.dirname(os.path.abspath(__file__))
+
+    def best(code):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, '-c', code], cwd=main_dir, check=True,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    return max(best(f'import {module}') - best('pass'), 0.0)
+
+
+def check_startup(budget=STARTUP_BUDGET):
+    seconds = startup_time()
+    within = seconds <= budget
+    print(f"Startup : importing main.py takes {seconds:.3f} s (budget {budget:.2f} s)"
+          + ("" if within else "  OVER BUDGET"))
+    return seconds, within
+
+
+def scale_document(text, factor):
+    """text with its sections repeated factor times and every bibitem repeated under a new key."""
+    if factor <= 1:
+        return text
+    document = Document(text)
+    if not document.sections:
+        return text
+    body_start = document.sections[0].start
+    body = text[body_start:document.text_end]
+    scaled = text[:document.text_end] + body * (factor - 1)
+
+    if document.bibitems:
+        last_item_end = document.bibitems[-1].end
+        scaled += text[document.text_end:last_item_end]
+        for copy in range(2, factor + 1):
+            for item in document.bibitems:
+                scaled += item.text.replace('{' + item.key + '}', '{' + item.key + '_' + str(copy) + '}', 1)
+        scaled += text[last_item_end:]
+    else:
+        scaled += text[document.text_end:]
+    return scaled
+
+
+def time_team(team_class, text, begin_index):
+    # Wall time of one run, the document parsing included as every team needs it
+    start = time.perf_counter()
+    team_class(text, begin_index, Document(text)).run()
+    return time.perf_counter() - start
+
+
+def peak_memory(team_class, text, begin_index):
+    # Peak of the memory allocated while the team runs, in bytes
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        team_class(text, begin_index, Document(text)).run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(team_class, text, begin_index, memory=True):
+    try:
+        result = {'seconds': time_team(team_class, text, begin_index)}
+        if memory:
+            result['peak_bytes'] = peak_memory(team_class, text, begin_index)
+    except Exception as e:
+        result = {'error': str(e)}
+    return result
+
+
+def growth_exponent(sizes, seconds):
+    """Slope of log(time) against log(size) between the smallest and the largest usable points."""
+    points = [(size, value) for size, value in zip(sizes, seconds) if value is not None and value >= MIN_SECONDS]
+    if len(points) < 2:
+        return None
+    (size_1, time_1), (size_2, time_2) = points[0], points[-1]
+    if size_2 <= size_1:
+        return None
+    return math.log(time_2 / time_1) / math.log(size_2 / size_1)
+
+
+def run_corpus(files, checks, memory=True):
+    results = {}
+    for filepath in files:
+        text, begin_index, bbl_text = analyzer.read_input(filepath)
+        name = os.path.basename(filepath)
+        print(f"\n{name} ({len(text) / 1024:.0f} KB)")
+        results[name] = {}
+        for check in checks:
+            result = measure(registry.load(check.team), text, begin_index, memory)
+            results[name][check.team] = result
+            print("  " + format_result(check.team, result))
+    return results
+
+
+def synthetic_documents(scales, seed=0):
+    # Generated papers whose sections, equations and bibitems all grow with the factor
+    return {factor: synthetic.generate(seed, sections=DEFAULT_FEATURES['sections'] * factor,
+                                       bibitems=DEFAULT_FEATURES['bibitems'] * factor)
+            for factor in scales}
+
+
+def run_scaling(name, documents, checks, max_seconds, memory=True):
+    # documents maps every scale factor to the text of that size
+    scales = sorted(documents)
+    sizes = [len(documents[factor]) for factor in scales]
+    results = {}
+    print(f"\nScaling {name} by {', '.join(str(factor) + 'x' for factor in scales)}")
+    for check in checks:
+        team_class = registry.load(check.team)
+        team = check.team
+        runs = []
+        for factor in scales:
+            if runs and (runs[-1].get('seconds') or 0) > max_seconds:
+                runs.append({'skipped': True})
+                continue
+            scaled = documents[factor]
+            runs.append(measure(team_class, scaled, scaled.find(r'\begin{document}'), memory))
+            if 'error' in runs[-1]:
+                break
+        runs += [{'skipped': True}] * (len(scales) - len(runs))
+        exponent = growth_exponent(sizes, [run.get('seconds') for run in runs])
+        results[team] = {'runs': dict(zip((str(factor) for factor in scales), runs)),
+                         'exponent': exponent,
+                         'superlinear': exponent is not None and exponent > SUPERLINEAR_EXPONENT}
+        line = ", ".join(f"{factor}x {format_run(run)}" for factor, run in zip(scales, runs))
+        flag = ""
+        if exponent is not None:
+            flag = f"  growth n^{exponent:.2f}" + ("  SUPERLINEAR" if results[team]['superlinear'] else "")
+        print(f"  {team:8} {line}{flag}")
+    return {'file': name, 'scales': scales, 'sizes': sizes, 'teams': results}
+
+
+def format_run(run):
+    if 'error' in run:
+        return "error"
+    if run.get('skipped'):
+        return "skipped"
+    text = f"{run['seconds']:.3f} s"
+    if 'peak_bytes' in run:
+        text += f" / {run['peak_bytes'] / (1024 * 1024):.1f} MB"
+    return text
+
+
+def format_result(name, result):
+    if 'error' in result:
+        # First line that says something, NLTK errors start with a row of stars
+        message = next((line.strip() for line in result['error'].splitlines() if any(c.isalnum() for c in line)), '')
+        return f"{name:8} error : {message}"
+    return f"{name:8} {format_run(result)}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the teams over the bundled LaTeX papers.")
+    parser.add_argument('paths', nargs='*', help=".tex files or directories (default: Resources/Latex_example)")
+    parser.add_argument('--scales', type=int, nargs='+', default=list(DEFAULT_SCALES),
+                        help="size factors of the scaling runs (default: %(default)s)")
+    parser.add_argument('--scale-file', help="file used for the scaling runs (default: the largest one)")
+    parser.add_argument('--synthetic', action='store_true',
+                        help="scale a generated IEEEtran paper instead of a file of the corpus")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the generated paper (default: %(default)s)")
+    parser.add_argument('--max-seconds', type=float, default=60.0,
+                        help="stop scaling a team once one run takes longer than this (default: %(default)s)")
+    parser.add_argument('--no-memory', action='store_true', help="skip the peak memory runs")
+    parser.add_argument('--json', metavar='PATH', help="also write the results as JSON")
+    parser.add_argument('--startup', action='store_true',
+                        help="only check the time needed to import main.py against its budget")
+    parser.add_argument('--startup-budget', type=float, default=STARTUP_BUDGET,
+                        help="startup budget in seconds (default: %(default)s)")
+    parser.add_argument('--include', nargs='+', default=[], metavar='RULE',
+                        help="only benchmark these checks (rule ids, team names or cost classes)")
+    parser.add_argument('--exclude', nargs='+', default=[], metavar='RULE',
+                        help="do not benchmark these checks")
+    args = parser.parse_args(argv)
+    try:
+        checks = registry.select(args.include, args.exclude)
+    except ValueError as e:
+        parser.error(str(e))
+
+    startup_seconds, within_budget = check_startup(args.startup_budget)
+    if args.startup:
+        return 0 if within_budget else 3
+
+    files = []
+    for path in args.paths or [DEFAULT_CORPUS]:
+        if os.path.isdir(path):
+            files.extend(glob.glob(os.path.join(path, '*.tex')))
+        else:
+            files.append(path)
+    files = sorted(set(os.path.abspath(filepath) for filepath in files))
+    if not files:
+        print("No .tex files found.", file=sys.stderr)
+        return 1
+
+    memory = not args.no_memory
+    scales = sorted(set(args.scales))
+    results = {'startup': {'seconds': startup_seconds, 'budget': args.startup_budget},
+               'corpus': run_corpus(files, checks, memory)}
+    if args.synthetic:
+        documents = synthetic_documents(scales, args.seed)
+        results['scaling'] = run_scaling(f"synthetic paper (seed {args.seed})", documents, checks,
+                                         args.max_seconds, memory)
+    else:
+        scale_file = args.scale_file or max(files, key=os.path.getsize)
+        text, begin_index, bbl_text = analyzer.read_input(scale_file)
+        documents = {factor: scale_document(text, factor) for factor in scales}
+        results['scaling'] = run_scaling(os.path.basename(scale_file), documents, checks, args.max_seconds, memory)
+
+    flagged = [name for name, team in results['scaling']['teams'].items() if team['superlinear']]
+    print("\nSuperlinear teams : " + (", ".join(flagged) if flagged else "none"))
+    if args.json:
+        with open(args.json, 'w') as json_file:
+            json.dump(results, json_file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
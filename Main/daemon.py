@@ -0,0 +1,257 @@
+# Local analysis daemon
+"""
+Keeps the teams, the NLTK tokenizer and tagger and the compiled tables of every check loaded in
+a pool of worker processes, and analyzes the documents sent to it over a local socket. Editors
+can then re-check a paper without paying for starting Python and loading the models each time.
+
+    python daemon.py                      # listens on a Unix socket in the cache directory
+    python daemon.py --port 8765          # listens on localhost:8765 instead (Windows)
+    python daemon.py --send paper.tex     # analyzes one file through the running daemon
+    python daemon.py --send paper.tex --exclude nlp
+
+Requests and answers are JSON objects, one per line:
+
+    {"path": "/abs/paper.tex"}                            a file, with its includes and .bbl
+    {"text": "...", "bbl": "...", "name": "paper.tex"}    an unsaved editor buffer
+    {"command": "ping"}, {"command": "stats"}, {"command": "shutdown"}
+
+A request may also carry an "id", echoed in the answer, and "include" / "exclude" lists
+as in batch.py. The answer holds the diagnostics (see Common/diagnostics.py), the text of
+the log, the timings of the teams and the time spent on the request:
+
+    {"id": 1, "diagnostics": [...], "log": "...", "timings": {...}, "seconds": 0.031}
+
+Unchanged documents are answered from the result cache. The state of the last run of every
+document is kept, so a re-check only runs the teams whose part of the document changed
+(see Common/incremental.py). The workers run without the time and memory budgets of
+batch.py.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import socket
+import sys
+import time
+
+import analyzer
+from Common import registry
+from Common.project import load_project
+from Common.report import SECTION_END
+from Common.resultcache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, ResultCache
+
+DEFAULT_SOCKET = os.path.join(DEFAULT_CACHE_DIR, 'daemon.sock')
+
+# Longest request line accepted, a whole paper is sent in one line
+MAX_REQUEST_BYTES = 64 * 1024 * 1024
+
+
+class AnalysisDaemon:
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, cache_bytes=DEFAULT_MAX_BYTES, workers=None):
+        self.cache = ResultCache(cache_dir, cache_bytes) if cache_dir else None
+        self.state_dir = os.path.join(cache_dir or DEFAULT_CACHE_DIR, 'daemon_state')
+        os.makedirs(self.state_dir, exist_ok=True)
+        self.workers = workers
+        self.locks = {}     # one lock per document, its stored state is read and written by one request at a time
+        self.requests = 0
+        self.started = time.time()
+        self.stopped = None
+        self.clients = set()    # tasks of the open connections
+        self.idle = set()       # those waiting for their next request
+
+    def warm_up(self):
+        # Starts the worker pool with every team imported and the NLTK models loaded
+        pool = analyzer.get_team_pool(self.workers, warm_nlp=True, preload=[check.team for check in registry.CHECKS])
+        pool.submit(int).result()
+
+    def state_file(self, key):
+        return os.path.join(self.state_dir, hashlib.sha256(key.encode()).hexdigest()[:24] + '.state')
+
+    def analyze(self, request):
+        """Answer to one document request, runs in a thread of the event loop."""
+        start = time.perf_counter()
+        checks = registry.select(request.get('include', ()), request.get('exclude', ()))
+        analyzer.check_resources(checks)
+        project = None
+        if 'path' in request:
+            path = os.path.abspath(request['path'])
+            project = load_project(path)
+            text, begin_index, bbl_text = analyzer.read_input(path, project)
+            bbl_name = os.path.basename(analyzer.bbl_path(path)) if bbl_text else ''
+            key = path
+        else:
+            text = request['text']
+            begin_index = text.find(r'\begin{document}')
+            bbl_text = request.get('bbl', '')
+            bbl_name = request.get('bbl_name', '')
+            key = 'buffer:' + request.get('name', '')
+        timings = {}
+        diagnostics = []
+        output = analyzer.run_teams(text, begin_index, parallel=True, state_file=self.state_file(key),
+                                    cache=self.cache, timings=timings, diagnostics=diagnostics, checks=checks,
+                                    bbl_text=bbl_text, bbl_name=bbl_name)
+        if project is not None and project.is_multi_file():
+            output = [project.annotate(logs) for logs in output]
+            analyzer.locate_in_sources(project, diagnostics)
+        return {
+            'diagnostics': [diagnostic.as_dict() for diagnostic in diagnostics],
+            'log': "".join("".join(logs) + SECTION_END for logs in output),
+            'timings': timings,
+            'seconds': time.perf_counter() - start,
+        }
+
+    async def answer(self, request):
+        command = request.get('command')
+        if command == 'ping':
+            return {'pong': True}
+        if command == 'stats':
+            return {'requests': self.requests, 'uptime': time.time() - self.started,
+                    'cache_hits': self.cache.hits if self.cache else 0,
+                    'cache_misses': self.cache.misses if self.cache else 0}
+        if command == 'shutdown':
+            self.stopped.set()
+            return {'stopping': True}
+        if command is not None:
+            raise ValueError(f"Unknown command '{command}'")
+        if 'path' not in request and 'text' not in request:
+            raise ValueError("A request needs a 'path', a 'text' or a 'command'")
+        self.requests += 1
+        key = os.path.abspath(request['path']) if 'path' in request else 'buffer:' + request.get('name', '')
+        lock = self.locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            return await asyncio.get_running_loop().run_in_executor(None, self.analyze, request)
+
+    async def handle(self, reader, writer):
+        # One connection may send any number of requests, each answered in order.
+        # A connection is idle while it waits for its next request, idle ones are cancelled on shutdown.
+        task = asyncio.current_task()
+        self.clients.add(task)
+        try:
+            while not self.stopped.is_set():
+                self.idle.add(task)
+                line = await reader.readline()
+                self.idle.discard(task)
+                if not line:
+                    break
+                answer = {}
+                try:
+                    request = json.loads(line)
+                    answer['id'] = request.get('id')
+                    answer.update(await self.answer(request))
+                except Exception as e:
+                    answer['error'] = f"{type(e).__name__}: {e}"
+                writer.write(json.dumps(answer).encode() + b'\n')
+                await writer.drain()
+        except (asyncio.CancelledError, ConnectionError):
+            pass
+        finally:
+            self.idle.discard(task)
+            self.clients.discard(task)
+            writer.close()
+
+    async def serve(self, socket_path=None, port=None):
+        self.stopped = asyncio.Event()
+        if port:
+            server = await asyncio.start_server(self.handle, '127.0.0.1', port, limit=MAX_REQUEST_BYTES)
+            where = f"127.0.0.1:{port}"
+        else:
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)  # left by a daemon that did not stop cleanly
+            server = await asyncio.start_unix_server(self.handle, socket_path, limit=MAX_REQUEST_BYTES)
+            where = socket_path
+        print(f"Analysis daemon listening on {where}", flush=True)
+        async with server:
+            await self.stopped.wait()
+            server.close()
+            # Connections waiting for a request are closed, the others finish their answer first
+            for task in self.idle:
+                task.cancel()
+            await asyncio.gather(*self.clients, return_exceptions=True)
+        if not port:
+            os.unlink(socket_path)
+
+
+def send(request, socket_path=DEFAULT_SOCKET, port=None, timeout=None):
+    """Sends one request to a running daemon and returns its answer."""
+    if port:
+        connection = socket.create_connection(('127.0.0.1', port), timeout=timeout)
+    else:
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.settimeout(timeout)
+        connection.connect(socket_path)
+    with connection, connection.makefile('rwb') as stream:
+        stream.write(json.dumps(request).encode() + b'\n')
+        stream.flush()
+        return json.loads(stream.readline())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Keep the analyzer loaded and serve analysis requests locally.")
+    parser.add_argument('--socket', default=DEFAULT_SOCKET, help="Unix socket path (default: %(default)s)")
+    parser.add_argument('--port', type=int, help="listen on this localhost TCP port instead of a Unix socket")
+    parser.add_argument('-j', '--jobs', type=int, help="number of worker processes (default: one per team, up to the cores)")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help=f"directory of the result cache (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument('--no-cache', action='store_true', help="neither read nor fill the result cache")
+    parser.add_argument('--send', metavar='TEX', help="analyze TEX with the running daemon and print the findings")
+    parser.add_argument('--include', action='append', default=[], metavar='RULES',
+                        help="with --send, only run these checks (rule ids, team names or cost classes, comma separated)")
+    parser.add_argument('--exclude', action='append', default=[], metavar='RULES',
+                        help="with --send, do not run these checks (rule ids, team names or cost classes, comma separated)")
+    parser.add_argument('--stop', action='store_true', help="stop the running daemon")
+    args = parser.parse_args(argv)
+    if not args.port and not hasattr(socket, 'AF_UNIX'):
+        parser.error("Unix sockets are not available here, use --port")
+    include = [name for value in args.include for name in value.split(',') if name]
+    exclude = [name for value in args.exclude for name in value.split(',') if name]
+    if (include or exclude) and not args.send:
+        parser.error("--include and --exclude select the checks of a --send request")
+    try:
+        if not registry.select(include, exclude):
+            parser.error("--include and --exclude leave no check to run")
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.send or args.stop:
+        request = {'path': os.path.abspath(args.send)} if args.send else {'command': 'shutdown'}
+        if include:
+            request['include'] = include
+        if exclude:
+            request['exclude'] = exclude
+        try:
+            answer = send(request, args.socket, args.port)
+        except OSError as e:
+            print(f"No daemon is answering : {e}", file=sys.stderr)
+            return 1
+        if 'error' in answer:
+            hint = "\nor leave the checks that need them out with --exclude nlp." if answer['error'].startswith('LookupError') else ""
+            print(answer['error'] + hint, file=sys.stderr)
+            return 2
+        for diagnostic in answer.get('diagnostics', []):
+            location = f"{diagnostic['file'] or os.path.basename(args.send)}:{diagnostic['line'] or ''}"
+            print(f"{location}: {diagnostic['severity']}: {diagnostic['message']} [{diagnostic['rule']}]")
+        if args.send:
+            print(f"{len(answer['diagnostics'])} finding(s) in {answer['seconds'] * 1000:.0f} ms")
+        return 0
+
+    try:
+        analyzer.check_resources()
+    except LookupError as e:
+        print(f"{e}\nUntil then, requests that include the nlp checks are refused.", file=sys.stderr)
+    os.makedirs(os.path.dirname(os.path.abspath(args.socket)), exist_ok=True)
+    daemon = AnalysisDaemon(None if args.no_cache else args.cache_dir, workers=args.jobs)
+    daemon.warm_up()
+    try:
+        asyncio.run(daemon.serve(args.socket, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        analyzer.shutdown_team_pool()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,23 +5,18 @@ from tkinter import filedialog, messagebox
 import shutil
 import os
 
-# Teams' main file import
+# Teams are imported and run by the shared analysis pipeline
 
-from Team_0.task import team_0
-from Team_1.Task import team_1
-from Team_2.task import team_2
-from Team_3.task import team_3
-from Team_4.task import team_4
-from Team_5.task import team_5
-from Team_6.task import team_6
-from Team_7.main import team_7
-from Team_8.code_tex import team_8
+import analyzer
+from Common import registry, timing
+from Common.resultcache import ResultCache
 
 
 class wrapper:
 
     def __init__(self, master):
         self.master = master
+        self.cache = ResultCache()  # outputs of documents analyzed before, kept across sessions
         master.title("Research Article Analyzer GUI")
 
         self.title_label = Label(master, text="Research Article Analyzer", font=("Helvetica", 20))
@@ -30,6 +25,15 @@ class wrapper:
         self.description_label = Label(master, text="Select a LaTeX File to detect and analyze errors", font=("Helvetica", 15))
         self.description_label.pack(pady=5)
 
+        # One box per registered check, the modules of unticked checks are never imported
+        self.check_frame = LabelFrame(master, text="Checks")
+        self.check_frame.pack(padx=10, pady=5, fill=X)
+        self.selected = {}
+        for i, check in enumerate(registry.CHECKS):
+            self.selected[check.team] = BooleanVar(value=True)
+            Checkbutton(self.check_frame, text=f"{check.title} ({check.cost})", variable=self.selected[check.team],
+                        anchor=W).grid(row=i // 2, column=i % 2, sticky=W)
+
         self.button = Button(master, text="Upload .tex/.bbl file", command=self.show_wait_screen)
         self.button.pack(pady=20)
 
@@ -48,103 +52,84 @@ class wrapper:
 
     def run(self):
         filepath = filedialog.askopenfilename()
-        raw_data = []
-        output = []
-        bbl_text =  ""
-
-        with open(filepath,'r',errors='ignore') as file:
-            text=str(file.read())
-        begin_index = text.find(r'\begin{document}')
-
-        if filepath:
-            # Get the directory of the input file
-            ip_dir = os.path.dirname(filepath)
-
-            # Get the base filename without extension
-            base_name = os.path.splitext(os.path.basename(filepath))[0]  # e.g., 'myfile.tex' → 'myfile'
-
-            # Create the output filename with '_comments.log' appended
-            output_filename = base_name + "_comments.log"
-
-            # Create the full output path
-            out_filepath = os.path.join(ip_dir, output_filename)
-            
-            ip_dir_ext = os.path.splitext(os.path.basename(filepath))[0]
-            bbl_path = os.path.join(ip_dir, ip_dir_ext+".bbl")
-
-            if os.path.exists(bbl_path):
-                with open(bbl_path, 'r') as bbl_file:
-                    bbl_text = str(bbl_file.read())
-                    begin_index = bbl_text.find(r'\begin{document}')
-
-        # Calling all team run() files
-        team_classes = [team_1, team_2, team_3, team_4, team_5, team_6, team_7, team_8]
-        for team_class in team_classes:
-            try:
-                obj_team = team_class(text, begin_index)
-                output.append(obj_team.run())
-            except Exception as e:
-                print(f"Error in team {team_class.__name__} : {e}")
-
-        #Writing all the output logs to the log file
-        with open (out_filepath, "w") as logw:
-            for logs in output:
-                for log in logs:
-                    logw.write(log)
-                logw.write("\n")
-                logw.write("\n")
-        
-        with open ("LOGII", "w") as logw:
-            for logs in output:
-                for log in logs:
-                    logw.write(log)
-                logw.write("\n")
-                logw.write("\n")
-
-        # Close wait screen and open output screen
+        checks = [check for check in registry.CHECKS if self.selected[check.team].get()]
+        try:
+            analyzer.check_resources(checks)
+        except LookupError as e:
+            messagebox.showerror("NLTK data missing", f"{e}\nor untick the checks that need them.")
+            self.wait_screen.withdraw()  # back to the main window, the checks can be changed
+            self.master.deiconify()
+            return
+
+        # Close wait screen and open output screen, the comments appear in it while the teams finish
         self.wait_screen.destroy()
-        self.open_output_screen(out_filepath)
-
-    def open_output_screen(self, output_file_path):
+        output_screen, output_text_area = self.open_output_screen()
+
+        # Calling all team run() files, side by side when there is more than one core.
+        # A document already analyzed with the same checkers is read back from the result cache.
+        # Each team's comments are streamed once to the view, to '<name>_comments.log' and to LOGII.
+        # A team that hangs or runs out of memory is stopped at its budget, the others are still shown.
+        # Only the ticked checks run.
+        out_filepath, output, timings = analyzer.analyze_file(filepath, parallel=(os.cpu_count() or 1) > 1,
+                                                              cache=self.cache, copies=["LOGII"],
+                                                              listeners=[lambda section: self.show_section(output_text_area, section)],
+                                                              time_limit=analyzer.TEAM_TIME_LIMIT,
+                                                              memory_limit=analyzer.TEAM_MEMORY_LIMIT,
+                                                              checks=checks)
+        self.show_log_controls(output_screen, output_text_area, out_filepath, output)
+        self.show_timings(output_screen, timings)
+
+    def open_output_screen(self):
         output_screen = Toplevel()
         output_screen.title("Research Article Analyzer GUI")
 
         output_text_area = Text(output_screen)
         output_text_area.pack(fill=BOTH, expand=YES)
+        output_screen.protocol("WM_DELETE_WINDOW", self.close_program)
+        self.master.update()
+        return output_screen, output_text_area
 
-        # Display contents of LOG file if it exists
-        if os.path.exists(output_file_path):
-            with open(output_file_path, "r") as log_file:
-                output_text = log_file.read()
-            output_text_area.insert(END, output_text)
-            output_text_area.config(state=DISABLED)
-            
+    def show_section(self, output_text_area, section):
+        # Appends the comments of one team and redraws the window before the next team is done
+        output_text_area.insert(END, section)
+        self.master.update()
+
+    def show_log_controls(self, output_screen, output_text_area, output_file_path, output):
+        output_text_area.config(state=DISABLED)
+        if output:
             # Add download button if LOG file exists
             download_button = Button(output_screen, text="Download LOG File", command=lambda: self.download_log(output_file_path))
             download_button.pack(pady=10)
-
         else:
+            output_text_area.config(state=NORMAL)
             output_text_area.insert(END, "No output available.")
+            output_text_area.config(state=DISABLED)
+
+    def show_timings(self, output_screen, timings):
+        # Where the time went, slowest team first. The full report is in '<name>_comments.timing.json'
+        if timings:
+            timing_label = Label(output_screen, text="\n".join(timing.summary(timings)), justify=LEFT, font=("Courier", 9))
+            timing_label.pack(pady=5)
 
-        output_screen.protocol("WM_DELETE_WINDOW", self.close_program)
-    
     def close_program(self):
+        analyzer.shutdown_team_pool()
         self.master.destroy()
 
     def download_log(self, output_file_path):
         # Open file dialog to choose download location
         download_path = filedialog.asksaveasfilename(defaultextension=".txt", filetypes=[("Text Files", "*.txt")])
         if download_path:
-            # Copy content of LOGII to the selected location
+            # Copy the log to the selected location in chunks, without loading it into memory
             with open(output_file_path, "r") as log_file:
                 with open(download_path, "w") as download_file:
-                    download_file.write(log_file.read())
+                    shutil.copyfileobj(log_file, download_file)
             messagebox.showinfo("Download Complete", "LOG downloaded successfully.")
 
 
 # obj = wrapper()
 # obj.run()
-root = Tk()
-root.geometry("500x300")
-wrapper_gui = wrapper(root)
-root.mainloop()
\ No newline at end of file
+if __name__ == "__main__":
+    root = Tk()
+    root.geometry("500x420")
+    wrapper_gui = wrapper(root)
+    root.mainloop()
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The modules of the analyzer import each other from the Main folder (from Common import ...)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,66 @@
+from Common.document import Document
+from Team_7.task4 import Task_4
+
+
+def check(body):
+    """(text, offsets of the missing commas, offsets of the conditions without \\quad)."""
+    text = "\\documentclass{article}\n\\begin{document}\n" + body + "\n\\end{document}\n"
+    commas, spaces = Task_4(text, text.find('\\begin{document}'), Document(text)).run
+    return text, commas, spaces
+
+
+def after(text, expression):
+    # Offset right after the expression, where a missing comma is reported
+    return text.index(expression) + len(expression)
+
+
+def test_comma_and_quad():
+    assert check(r"\begin{equation} x_n=0, \quad \text{for } n<0 \end{equation}")[1:] == ([], [])
+
+
+def test_missing_comma():
+    text, commas, spaces = check(r"\begin{equation} x_n=0 \quad \text{for } n<0 \end{equation}")
+    assert commas == [after(text, 'x_n=0')]
+    assert spaces == []
+
+
+def test_missing_quad():
+    text, commas, spaces = check(r"\begin{equation} x_n=0, \text{for } n<0 \end{equation}")
+    assert commas == []
+    assert spaces == [text.index('\\text{for')]
+
+
+def test_missing_comma_and_quad_before_forall():
+    text, commas, spaces = check(r"\begin{equation} x_n=0 \forall n \end{equation}")
+    assert commas == [after(text, 'x_n=0')]
+    assert spaces == [text.index('\\forall')]
+
+
+def test_quad_before_forall():
+    assert check(r"\begin{equation} x_n=0, \quad\forall n \end{equation}")[1:] == ([], [])
+
+
+def test_cases_row_without_comma():
+    text, commas, spaces = check("\\begin{equation} x_n=\\begin{cases} 1 & n=0\\\\ 0, & \\text{otherwise} "
+                                 "\\end{cases} \\end{equation}")
+    assert commas == [after(text, '{cases} 1')]
+    assert spaces == []
+
+
+def test_condition_in_parentheses():
+    # The parenthesis stands for the comma, the \quad is still needed before it
+    assert check(r"\begin{equation} x_n=0 \quad (\text{if } n<0) \end{equation}")[1:] == ([], [])
+    text, commas, spaces = check(r"\begin{equation} x_n=0 (\text{if } n<0) \end{equation}")
+    assert commas == []
+    assert spaces == [text.index('\\text{if')]
+
+
+def test_hspace_counts_as_quad():
+    assert check(r"\begin{equation} x_n=0, \hspace{2em} \text{for } n<0 \end{equation}")[1:] == ([], [])
+
+
+def test_align_rows():
+    text, commas, spaces = check("\\begin{align} x_n&=0, \\quad \\text{for } n<0 \\\\ "
+                                 "y_n&=1 \\text{for } n>0 \\end{align}")
+    assert commas == [after(text, 'y_n&=1')]
+    assert spaces == [text.index('\\text{for } n>0')]
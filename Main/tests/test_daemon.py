@@ -0,0 +1,46 @@
+import pytest
+
+import analyzer
+import daemon
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    requests = []
+
+    def send(request, socket_path=None, port=None, timeout=None):
+        requests.append(request)
+        return {'diagnostics': [], 'seconds': 0.02}
+
+    monkeypatch.setattr(daemon, 'send', send)
+    return requests
+
+
+def test_send_forwards_the_checks(sent, tmp_path):
+    paper = tmp_path / 'paper.tex'
+    assert daemon.main(['--send', str(paper), '--exclude', 'nlp', '--include', 'fast,team_5']) == 0
+    assert sent == [{'path': str(paper), 'include': ['fast', 'team_5'], 'exclude': ['nlp']}]
+
+
+def test_send_without_checks(sent, tmp_path):
+    assert daemon.main(['--send', str(tmp_path / 'paper.tex')]) == 0
+    assert sent == [{'path': str(tmp_path / 'paper.tex')}]
+
+
+@pytest.mark.parametrize('argv', [['--send', 'paper.tex', '--exclude', 'no-such-check'],
+                                  ['--send', 'paper.tex', '--include', 'nlp', '--exclude', 'nlp'],
+                                  ['--stop', '--exclude', 'nlp']])
+def test_bad_selection(sent, argv):
+    with pytest.raises(SystemExit):
+        daemon.main(argv)
+    assert sent == []
+
+
+def test_analyze_honours_the_selection(tmp_path):
+    paper = tmp_path / 'paper.tex'
+    paper.write_text("\\documentclass{article}\n\\begin{document}\nThe value is 0.50 here.\n\\end{document}\n")
+    try:
+        answer = daemon.AnalysisDaemon(str(tmp_path / 'cache')).analyze({'path': str(paper), 'include': ['team_7']})
+    finally:
+        analyzer.shutdown_team_pool()
+    assert {diagnostic['team'] for diagnostic in answer['diagnostics']} == {'team_7'}
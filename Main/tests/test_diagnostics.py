@@ -0,0 +1,115 @@
+import json
+import os
+import re
+
+import analyzer
+from Common import registry
+from Common.diagnostics import Diagnostic, Findings, dump_output, load_output, over_budget, records, render, \
+    sarif_log, write_jsonl, write_sarif
+from Common.document import Document
+from Team_3.task import team_3
+
+EXAMPLES = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                        'Resources', 'Latex_example')
+
+# Shape of one finding in the log of each team, as the teams wrote it before they built records
+_LINE_FIRST = re.compile(r'^\s*Line (?P<line>\d+)\s*:\s*\S')
+BASELINE_FORMATS = {
+    'team_2': _LINE_FIRST,
+    'team_3': _LINE_FIRST,
+    'team_4': _LINE_FIRST,
+    'team_5': re.compile(r'^(?:Warning: |Error: )?.*\bline no is:? (?P<line>\d+)\n$'),
+    'team_7': _LINE_FIRST,
+    'team_8': re.compile(r'^\S+ {2,}\d+ {3,}[^\d\s].*\n$'),
+}
+
+DIAGNOSTICS = [
+    Diagnostic('team_7', 'math-style.trailing-zero', 12, 5, 'error', "Trailing zero error."),
+    Diagnostic('team_2', 'acronyms.keywords', None, None, 'warning', "Keywords are not in alphabetical order."),
+    Diagnostic('team_8', 'bibliography.syntax', 3, 1, 'warning', "pp is missing", file='paper.bbl'),
+]
+
+
+def paper_findings(name):
+    text, begin_index = analyzer.read_input(os.path.join(EXAMPLES, name))[:2]
+    outputs = {}
+    for check in registry.select([], ['nlp']):
+        outputs[check.team] = next(analyzer.run_teams_sequential(text, begin_index, None, [check.team]))[0]
+    return outputs
+
+
+def test_log_keeps_the_team_formats():
+    teams = set()
+    for name in ('AS_in_CR_OC_JOUR_v8.tex', 'AS_in_CR_OC_SPU_cam_ready_v5.tex'):
+        for team, output in paper_findings(name).items():
+            for diagnostic in records(output):
+                rendered = diagnostic.render()
+                match = BASELINE_FORMATS[team].match(rendered)
+                assert match, (team, rendered)
+                if 'line' in match.groupdict() and diagnostic.line is not None:
+                    assert int(match.group('line')) == diagnostic.line
+                # the log line is the message in its layout, the text the teams printed before
+                assert diagnostic.message in rendered
+                teams.add(team)
+    assert teams == set(BASELINE_FORMATS) - {'team_3'}  # the example papers spell the scientist names well
+
+
+def test_scientist_name_format():
+    text = "\\begin{document}\nWe use the gaussian noise and the Gauss method.\n\\end{document}"
+    [diagnostic] = records(team_3(text, 0).run())
+    assert diagnostic.render() == " Line 2 : All words in scientist name 'gaussian' should start with a capital letter.\n"
+    assert diagnostic.column == text.split('\n')[1].index('gaussian') + 1
+
+
+def test_findings_locate_offsets():
+    document = Document("\\begin{document}\nfirst line\nsecond line\n")
+    findings = Findings('team_6', document, "ERROR in line:{line}   {message}\n", 'error')
+    findings.append("Heading\n")
+    diagnostic = findings.add('capitalization', "Capitalize it", offset=document.text.index('second') + 3)
+    assert (diagnostic.rule, diagnostic.line, diagnostic.column, diagnostic.severity) == \
+           ('heading-case.capitalization', 3, 4, 'error')
+    assert render(findings.output) == ["Heading\n", "ERROR in line:3   Capitalize it\n"]
+
+
+def test_over_budget_section():
+    output = over_budget('team_3', "timed out after 2 s, its comments are missing.")
+    assert render(output) == ["team_3 : timed out after 2 s, its comments are missing.\n"]
+    assert records(output)[0].rule == 'analyzer.over-budget'
+
+
+def test_stored_output_round_trip():
+    output = ["Heading\n"] + DIAGNOSTICS
+    assert load_output(json.loads(json.dumps(dump_output(output)))) == output
+
+
+def test_jsonl_round_trip(tmp_path):
+    path = tmp_path / 'paper_comments.jsonl'
+    write_jsonl(str(path), DIAGNOSTICS, 'paper.tex')
+    read = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [Diagnostic(**record) for record in read] == \
+           [Diagnostic(**dict(diagnostic.as_dict(), file=diagnostic.file or 'paper.tex')) for diagnostic in DIAGNOSTICS]
+    assert set(read[0]) == {'team', 'rule', 'line', 'column', 'severity', 'message', 'file'}
+
+
+def test_sarif_shape(tmp_path):
+    path = tmp_path / 'paper_comments.sarif'
+    write_sarif(str(path), DIAGNOSTICS, 'dir\\paper.tex')
+    log = json.loads(path.read_text())
+    assert log == sarif_log(DIAGNOSTICS, 'dir\\paper.tex')
+    assert log['version'] == '2.1.0'
+    assert log['$schema'].endswith('sarif-2.1.0.json')
+    [run] = log['runs']
+    rules = [rule['id'] for rule in run['tool']['driver']['rules']]
+    assert rules == sorted(diagnostic.rule for diagnostic in DIAGNOSTICS)
+    assert len(run['results']) == len(DIAGNOSTICS)
+    for result, diagnostic in zip(run['results'], DIAGNOSTICS):
+        assert rules[result['ruleIndex']] == result['ruleId'] == diagnostic.rule
+        assert result['level'] in ('error', 'warning', 'note')
+        assert result['message']['text'] == diagnostic.message
+        [location] = result['locations']
+        physical = location['physicalLocation']
+        assert physical['artifactLocation']['uri'] == (diagnostic.file or 'dir/paper.tex')
+        if diagnostic.line is None:
+            assert 'region' not in physical
+        else:
+            assert physical['region'] == {'startLine': diagnostic.line, 'startColumn': diagnostic.column}
@@ -0,0 +1,84 @@
+import os
+
+import analyzer
+from Common import registry
+from Common.document import Document
+from Common.incremental import fingerprint, line_map, remap_lines
+from Common.diagnostics import Diagnostic
+
+EXAMPLES = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                        'Resources', 'Latex_example')
+
+# Teams 1 and 6 need the NLTK data, which the tests do not rely on
+CHECKS = registry.select([], ['nlp'])
+
+
+def example(name):
+    return analyzer.read_input(os.path.join(EXAMPLES, name))[:2]
+
+
+def run(text, begin_index, bbl_text='', **options):
+    diagnostics = []
+    output = analyzer.run_teams(text, begin_index, checks=CHECKS, diagnostics=diagnostics, bbl_text=bbl_text,
+                                **options)
+    return output, diagnostics
+
+
+def test_revision_pair_matches_a_full_run(tmp_path):
+    previous_state = str(tmp_path / 'v7.state')
+    run(*example('AS_in_CR_OC_JOUR_v7.tex'), state_file=previous_state)
+    text, begin_index = example('AS_in_CR_OC_JOUR_v8.tex')
+    incremental = run(text, begin_index, state_file=str(tmp_path / 'v8.state'), previous_state_file=previous_state)
+    assert incremental == run(text, begin_index)
+
+
+def test_reused_output_moves_with_the_text(tmp_path):
+    # Lines added before the bibliography: team_8 is reused with its findings moved down
+    text, begin_index = example('AS_in_CR_OC_SPU_cam_ready_v5.tex')
+    state = str(tmp_path / 'paper.state')
+    run(text, begin_index, state_file=state)
+    position = text.index('\\section')
+    edited = text[:position] + 'A new paragraph.\n\nAnd another one.\n\n' + text[position:]
+    timings = {}
+    incremental = run(edited, begin_index, state_file=state, timings=timings)
+    assert [name for name, record in timings.items() if record.get('cached')] == ['team_8']
+    assert any(diagnostic.team == 'team_8' for diagnostic in incremental[1])
+    assert incremental == run(edited, begin_index)
+
+
+def test_bbl_edit_runs_only_the_bibliography_team(tmp_path):
+    text, begin_index = example('AS_in_CR_OC_SPU_cam_ready_v5.tex')
+    with open(os.path.join(EXAMPLES, 'AS_in_CR_OC_SPU_cam_ready_v5.bbl')) as bbl_file:
+        bbl_text = bbl_file.read()
+    state = str(tmp_path / 'paper.state')
+    run(text, begin_index, bbl_text, state_file=state)
+    edited = bbl_text.replace('\\bibitem{Goldsmith_2009_PIEEE}', '\\bibitem{Goldsmith_2009_PIEEE}\nA.~Goldsmith, ', 1)
+    timings = {}
+    output, diagnostics = run(text, begin_index, edited, state_file=state, timings=timings)
+    assert [name for name, record in timings.items() if not record.get('cached')] == ['team_8']
+    assert (output, diagnostics) == run(text, begin_index, edited)
+
+
+def test_fingerprints_follow_the_regions():
+    text, begin_index = example('AS_in_CR_OC_JOUR_v8.tex')
+    before = Document(text)
+    title = before.title.text
+    after = Document(text.replace(title, title + ' Revisited', 1))
+    section = before.sections[0].title
+    renamed = Document(text.replace('{' + section + '}', '{' + section + ' Revisited}', 1))
+
+    def changed(document):
+        return {check.team for check in registry.CHECKS
+                if fingerprint(document, begin_index, check.team) != fingerprint(before, begin_index, check.team)}
+
+    whole_text = {'team_2', 'team_3', 'team_4', 'team_5', 'team_7'}
+    assert changed(after) == whole_text | {'team_1'}
+    assert changed(renamed) == whole_text | {'team_6'}
+
+
+def test_remap_moves_lines_and_references():
+    mapping = line_map('a\nb\nc\n', 'new\na\nb\nc\n')
+    moved = remap_lines([Diagnostic('team_2', 'acronyms.first-use', 2, None, 'warning', 'at lines 0002, 3')], mapping)
+    assert (moved[0].line, moved[0].message) == (3, 'at lines 0003, 4')
+    # A finding whose line is gone makes the team run again
+    assert remap_lines([Diagnostic('team_2', 'acronyms.first-use', 2, None, 'warning', 'x')], line_map('a\nb', 'a\nc')) is None
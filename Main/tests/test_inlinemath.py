@@ -0,0 +1,43 @@
+from Team_7.Inlinemath import Inline
+
+
+def fractions(body):
+    """(numerator, denominator) of every inline fraction, the built-up starts and the parenthesis findings."""
+    text = "\\documentclass{article}\n\\begin{document}\n" + body + "\n\\end{document}\n"
+    inline = Inline(text, text.find('\\begin{document}'))
+    found = inline.getfrac()
+    return [(text[fraction.numerator_start:fraction.numerator_end],
+             text[fraction.denominator_start:fraction.denominator_end]) for fraction in found], \
+        [text[start:start + 6] for start in inline.get_builtup(found)], \
+        [text[start:start + 3] for start in inline.get_paren(found)]
+
+
+def test_nested_braces():
+    assert fractions("The gain $\\frac{a+\\sqrt{b}}{c}$ is high.") == \
+           ([('a+\\sqrt{b}', 'c')], ['\\frac{'], ['a+\\'])
+
+
+def test_dfrac_and_tfrac():
+    assert fractions("Both $\\dfrac{x}{y}$ and $\\tfrac{1}{2}$ are used.")[:2] == \
+           ([('x', 'y'), ('1', '2')], ['\\dfrac', '\\tfrac'])
+
+
+def test_arguments_without_braces():
+    assert fractions("A half $\\frac12$ and $\\frac\\alpha\\beta$ here.")[0] == [('1', '2'), ('\\alpha', '\\beta')]
+
+
+def test_spaces_between_the_arguments():
+    assert fractions("The ratio $\\frac {a} {b-1}$ is low.") == ([('a', 'b-1')], ['\\frac '], ['b-1'])
+
+
+def test_parentheses_are_enough():
+    assert fractions("The ratio $\\frac{(a+b)}{-c}$ is low.")[2] == []
+
+
+def test_display_math_is_ignored():
+    assert fractions("We have\n\\begin{equation}\nx=\\frac{a+b}{c}\n\\end{equation}\nand $$\\frac{1}{2}$$ too.") == \
+           ([], [], [])
+
+
+def test_escaped_braces():
+    assert fractions("The set $\\frac{\\{a\\}}{b}$ is small.")[0] == [('\\{a\\}', 'b')]
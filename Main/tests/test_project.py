@@ -0,0 +1,67 @@
+import analyzer
+from Common import registry
+from Common.project import load_project
+
+
+def write(directory, files):
+    for name, text in files.items():
+        path = directory / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    return str(directory / 'main.tex')
+
+
+def test_source_map(tmp_path):
+    main = write(tmp_path, {
+        'main.tex': "\\documentclass{article}\n\\begin{document}\n\\input{sections/a}\nMain text.\n\\end{document}\n",
+        'sections/a.tex': "First line of a.\nSecond line of a.\n% \\input{missing}\n",
+    })
+    project = load_project(main)
+    assert project.text == ("\\documentclass{article}\n\\begin{document}\nFirst line of a.\nSecond line of a.\n"
+                            "% \\input{missing}\n\nMain text.\n\\end{document}\n")
+    assert project.problems == []
+    assert project.is_multi_file()
+    assert project.origin(1) == (str(tmp_path / 'main.tex'), 1)
+    assert project.origin(4) == (str(tmp_path / 'sections' / 'a.tex'), 2)
+    assert project.origin(7) == (str(tmp_path / 'main.tex'), 4)
+    assert project.annotate(["Line 4: x\n", "at lines 3, 7\n"]) == \
+           ["Line 2 (sections/a.tex): x\n", "at lines 1 (sections/a.tex), 4 (main.tex)\n"]
+
+
+def test_subfile_body(tmp_path):
+    main = write(tmp_path, {
+        'main.tex': "\\begin{document}\n\\subfile{part}\n\\end{document}\n",
+        'part.tex': "\\documentclass[main]{subfiles}\n\\begin{document}\nPart text.\n\\end{document}\n",
+    })
+    assert load_project(main).text == "\\begin{document}\n\nPart text.\n\n\\end{document}\n"
+
+
+def test_cycle_and_missing_file(tmp_path):
+    main = write(tmp_path, {
+        'main.tex': "\\begin{document}\n\\input{a}\n\\input{nowhere}\n\\end{document}\n",
+        'a.tex': "A.\n\\input{b}\n",
+        'b.tex': "B.\n\\input{a}\n",
+    })
+    project = load_project(main)
+    assert project.problems == [
+        "\\input{a} (line 2 of b.tex) : include cycle a.tex -> b.tex -> a.tex.",
+        "\\input{nowhere} (line 3 of main.tex) : file not found.",
+    ]
+    assert project.text.count("A.") == 1 and project.text.count("B.") == 1
+
+
+def test_file_included_twice_is_expanded_once(tmp_path):
+    main = write(tmp_path, {
+        'main.tex': "\\documentclass{article}\n\\begin{document}\n\\input{a}\n\\input{b}\n\\end{document}\n",
+        'a.tex': "The value is 0.50 here.\n\\input{b}\n",
+        'b.tex': "The gain is 1.200 there.\n",
+    })
+    project = load_project(main)
+    assert project.problems == ["\\input{b} (line 4 of main.tex) : already included at line 2 of a.tex."]
+    assert project.text.count("1.200") == 1
+    diagnostics = []
+    analyzer.analyze_file(main, checks=registry.select(['team_7'], []), diagnostics=diagnostics)
+    assert sorted((diagnostic.file, diagnostic.line, diagnostic.rule) for diagnostic in diagnostics) == [
+        ('a.tex', 1, 'math-style.trailing-zero'), ('b.tex', 1, 'math-style.trailing-zero')]
+    with open(analyzer.log_path(main)) as log:
+        assert log.read().count("(b.tex)") == 1
@@ -0,0 +1,54 @@
+import os
+
+from Common import resultcache
+from Common.diagnostics import Diagnostic
+from Common.resultcache import ResultCache
+
+OUTPUTS = {
+    'team_7': ["=====\n", Diagnostic('team_7', 'math-style.long-exponent', 12, 5, 'warning',
+                                     "Long Exponential expression warning.", layout="Line {line}: {message}\n")],
+    'team_8': ["No bibliography found.\n"],
+}
+
+
+def test_hit_after_put(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    key = cache.key("\\begin{document} text", 0)
+    assert cache.get(key) is None
+    cache.put(key, OUTPUTS)
+    assert cache.get(key) == OUTPUTS
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_key_follows_the_content():
+    cache = ResultCache()
+    assert cache.key("text", 0) == cache.key("text", 0)
+    assert len({cache.key("text", 0), cache.key("text!", 0), cache.key("text", 1),
+                cache.key("text", 0, "bbl")}) == 4
+
+
+def test_miss_after_a_checker_change(tmp_path, monkeypatch):
+    cache = ResultCache(str(tmp_path))
+    cache.put(cache.key("text", 0), OUTPUTS)
+    monkeypatch.setattr(resultcache, 'checker_version', lambda: 'edited checkers')
+    assert cache.get(cache.key("text", 0)) is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResultCache(str(tmp_path), max_bytes=10 ** 9)
+    keys = [cache.key(f"paper {number}", 0) for number in range(4)]
+    for age, key in enumerate(keys):
+        cache.put(key, OUTPUTS)
+        os.utime(cache._path(key), (1000 + age, 1000 + age))
+    cache.get(keys[0])  # the oldest entry is used again
+    cache.max_bytes = 2 * os.path.getsize(cache._path(keys[0]))
+    cache.evict()
+    assert [cache.get(key) is not None for key in keys] == [True, False, False, True]
+
+
+def test_write_error_goes_to_stderr(tmp_path, capsys):
+    blocker = tmp_path / 'file'
+    blocker.write_text('')
+    ResultCache(str(blocker / 'cache')).put('key', OUTPUTS)
+    out, err = capsys.readouterr()
+    assert out == '' and 'Result cache could not be written' in err
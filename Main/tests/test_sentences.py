@@ -0,0 +1,84 @@
+from Common.document import Document
+from Team_7.numstart import NumStart
+
+
+def paper(body):
+    return "\\documentclass{article}\n\\begin{document}\n" + body + "\n\\end{document}\n"
+
+
+def sentences(body):
+    # The first words of every sentence of the body
+    text = paper(body)
+    return [text[start:].split()[0] for start in Document(text).sentences]
+
+
+def numeral_starts(body):
+    text = paper(body)
+    return [text[index:].split()[0] for index in NumStart(text, text.find('\\begin{document}')).run()]
+
+
+def test_period_and_blank_end_a_sentence():
+    assert sentences("The gain is high. It grows? Yes! Then it stops.") == ['The', 'It', 'Yes!', 'Then']
+
+
+def test_abbreviation_before_a_number():
+    assert sentences("See Fig. 3 for the setup. It works.") == ['See', 'It']
+    assert numeral_starts("See Fig. 3 for the setup. It works.") == []
+
+
+def test_et_al_before_a_year():
+    assert sentences("The scheme of Smith et al. 2020 is used here. Then more.") == ['The', 'Then']
+    assert numeral_starts("The scheme of Smith et al. 2020 is used here.") == []
+
+
+def test_et_al_closes_a_sentence_before_a_capital():
+    assert sentences("It was shown by Smith et al. The gain is high.") == ['It', 'The']
+
+
+def test_i_e_before_a_number():
+    assert sentences("We use many, i.e. 5 antennas are used. It works.") == ['We', 'It']
+    assert numeral_starts("We use many, i.e. 5 antennas are used.") == []
+
+
+def test_initials():
+    assert sentences("The method of B. M. Sadler is used. It works.") == ['The', 'It']
+
+
+def test_enumerated_label():
+    # The sentence starts after "2.", the label itself is not a numeral at a sentence start
+    body = "The cases are\n\\begin{enumerate}\n\\item{2. the second case.}\n\\end{enumerate}"
+    assert sentences(body) == ['The', 'the']
+    assert numeral_starts(body) == []
+
+
+def test_numeral_after_a_paragraph_break():
+    body = "The first paragraph ends here\n\n20 users are served."
+    assert sentences(body) == ['The', '20']
+    assert numeral_starts(body) == ['20']
+
+
+def test_numeral_after_a_heading():
+    body = "\\section{Results}\n20 users are served."
+    assert sentences(body) == ['20']
+    assert numeral_starts(body) == ['20']
+
+
+def test_period_ending_a_displayed_equation():
+    body = "We have\n\\begin{equation}\nx=1.\n\\end{equation}\n5 users remain."
+    assert numeral_starts(body) == ['5']
+    # A comma continues the sentence after the equation
+    assert numeral_starts(body.replace('x=1.', 'x=1,')) == []
+
+
+def test_period_inside_inline_math():
+    assert sentences("The value $x=1. 5$ is small. It works.") == ['The', 'It']
+
+
+def test_comments_are_skipped():
+    assert sentences("The gain is high. % Not here. 20 times\nIt works.") == ['The', 'It']
+
+
+def test_inline_math_at_a_sentence_start():
+    assert numeral_starts("Fine. $20$ users are served.") == ['$20$']
+    assert numeral_starts("Fine. $x$ is the gain.") == []
+    assert numeral_starts("Fine. $0\\leq x$ holds here.") == ['$0\\leq']
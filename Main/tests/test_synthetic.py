@@ -0,0 +1,60 @@
+import re
+
+import pytest
+
+import benchmark
+from Common import synthetic
+from Common.document import Document
+from Common.mathindex import INLINE
+
+FEATURES = dict(sections=5, subsections_per_section=3, paragraphs_per_subsection=2, inline_math_per_paragraph=3,
+                equations_per_section=2, align_blocks_per_section=1, multline_blocks_per_section=2,
+                comments_per_section=4, acronyms=6, citations_per_paragraph=1, bibitems=40)
+
+
+def test_feature_counts():
+    text = synthetic.generate(seed=3, **FEATURES)
+    document = Document(text)
+    sections = FEATURES['sections']
+    assert len([section for section in document.sections if section.level == 1]) == sections
+    assert len([section for section in document.sections if section.level == 2]) == \
+           sections * FEATURES['subsections_per_section']
+    assert len(document.environments_named('equation')) == sections * FEATURES['equations_per_section']
+    assert len(document.environments_named('align')) == sections * FEATURES['align_blocks_per_section']
+    assert len(document.environments_named('multline')) == sections * FEATURES['multline_blocks_per_section']
+    assert len(document.bibitems) == FEATURES['bibitems']
+    # The abstract is one more paragraph
+    paragraphs = 1 + sections * FEATURES['subsections_per_section'] * FEATURES['paragraphs_per_subsection']
+    inline = [region for region in document.math.regions if region.kind == INLINE]
+    assert len(inline) == paragraphs * FEATURES['inline_math_per_paragraph']
+    assert len(re.findall(r'\\cite\{ref(\d+)\}', text)) == paragraphs * FEATURES['citations_per_paragraph']
+    assert text.count('\n% ') == sections * FEATURES['comments_per_section']
+
+
+def test_acronyms_are_expanded_at_their_first_use():
+    text = synthetic.generate(seed=3, **dict(FEATURES, sections=20))
+    defined = re.findall(r'\(([A-Z]{2,})\)', text)
+    assert 0 < len(set(defined)) <= FEATURES['acronyms']
+    assert len(defined) == len(set(defined))
+    for short in defined:
+        assert text.index(short) == text.index('(' + short + ')') + 1
+
+
+def test_seeded():
+    assert synthetic.generate(seed=5, **FEATURES) == synthetic.generate(seed=5, **FEATURES)
+    assert synthetic.generate(seed=5, **FEATURES) != synthetic.generate(seed=6, **FEATURES)
+
+
+def test_unknown_feature():
+    with pytest.raises(ValueError, match='figures'):
+        synthetic.generate(figures=3)
+
+
+def test_scaling_inputs_grow_with_the_factor():
+    documents = benchmark.synthetic_documents([1, 2, 10])
+    for factor, text in documents.items():
+        document = Document(text)
+        assert len([section for section in document.sections if section.level == 1]) == \
+               synthetic.DEFAULT_FEATURES['sections'] * factor
+        assert len(document.bibitems) == synthetic.DEFAULT_FEATURES['bibitems'] * factor
+    assert 8 < len(documents[10]) / len(documents[1]) < 12
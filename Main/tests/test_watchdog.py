@@ -0,0 +1,63 @@
+import os
+import time
+
+import pytest
+
+from Common.watchdog import BudgetExceeded, WorkerPool
+
+
+def pid():
+    return os.getpid()
+
+
+def sleep(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+def allocate(size):
+    return len(bytearray(size))
+
+
+def fail():
+    raise ValueError("no luck")
+
+
+@pytest.fixture
+def pool():
+    pool = WorkerPool(1, time_limit=1.0, memory_limit=256 * 1024 * 1024)
+    yield pool
+    pool.shutdown()
+
+
+def test_call_within_budget(pool):
+    assert pool.submit(sleep, 0.01).result() == 0.01
+    # The same worker serves the next call
+    assert pool.submit(pid).result() == pool.submit(pid).result()
+
+
+def test_time_budget(pool):
+    first = pool.submit(pid).result()
+    with pytest.raises(BudgetExceeded) as error:
+        pool.submit(sleep, 30).result()
+    assert (error.value.kind, error.value.limit) == ('time', 1.0)
+    # The worker was killed and a new one serves the next call
+    assert pool.submit(pid).result() != first
+
+
+@pytest.mark.skipif(os.name == 'nt', reason="the memory budget needs the resource module")
+def test_memory_budget(pool):
+    first = pool.submit(pid).result()
+    with pytest.raises(BudgetExceeded) as error:
+        pool.submit(allocate, 1024 * 1024 * 1024).result()
+    assert error.value.kind == 'memory'
+    assert pool.submit(pid).result() != first
+    assert pool.submit(allocate, 1024).result() == 1024
+
+
+def test_exception_keeps_the_worker(pool):
+    first = pool.submit(pid).result()
+    with pytest.raises(RuntimeError, match="ValueError: no luck"):
+        pool.submit(fail).result()
+    assert pool.submit(pid).result() == first
+
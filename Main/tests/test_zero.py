@@ -0,0 +1,44 @@
+import pytest
+
+from Team_7.zero import zero
+
+
+def literals(body):
+    text = "\\documentclass{article}\n\\begin{document}\n" + body + "\n\\end{document}\n"
+    z = zero(text, text.find('\\begin{document}'))
+    leading, trailing = z.run()
+    return [(text[literal.start:literal.end], literal.region) for literal in z.numeric_literals()], \
+        [text[index:index + 3] for index in leading], [text[index - 2:index + 1] for index in trailing]
+
+
+def test_leading_zero():
+    assert literals("A gain of .25 is low.") == ([('.25', 'prose')], ['.25'], [])
+
+
+def test_trailing_zero():
+    assert literals("A gain of 0.50 is low.") == ([('0.50', 'prose')], [], ['.50'])
+    assert literals("A gain of 1.200 is low.") == ([('1.200', 'prose')], [], ['200'])
+
+
+def test_after_a_thin_space():
+    assert literals("A gain of $x=\\,.5$ is low.") == ([('.5', 'inline')], ['.5$'], [])
+
+
+def test_display_math():
+    assert literals("We have\n\\begin{equation}\nx = 0.5 + .25\n\\end{equation}") == \
+           ([('0.5', 'display'), ('.25', 'display')], ['.25'], [])
+
+
+@pytest.mark.parametrize('body', [
+    "Version 1.2.10 of the code.",
+    "\\vspace{-.5em} Then more.",
+    "\\includegraphics[width=.8\\linewidth]{plot}",
+    "See Eq. \\ref{eq:1.0} above.",
+    "See \\eqref{eq:2.50} above.",
+    "\\section{Results}\\label{sec:3.10} Then more.",
+    "\\begin{equation}\nx = 1 \\label{eq:1.0}\n\\end{equation}",
+    "As in \\cite[p.~4]{smith1.0}.",
+    "% a comment with 0.50 in it",
+])
+def test_not_numbers_of_the_paper(body):
+    assert literals(body) == ([], [], [])
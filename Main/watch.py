@@ -0,0 +1,211 @@
+# Watch mode
+"""
+Analyzes a paper again every time it is saved, and prints only what changed in the findings.
+
+    python watch.py paper.tex
+    python watch.py paper.tex --include fast --debounce 1
+
+The main .tex file, every file it includes with \\input, \\include or \\subfile and its .bbl
+file are polled. Editors often write a file several times in a row on one save, so a run only
+starts once the files have been left alone for the debounce delay. The set of watched files is
+read again after every run, so a newly added \\input is followed.
+
+Every run is incremental (see Common/incremental.py): only the checks reading the part of the
+paper that changed run again, for instance only the bibliography check after an edit of the
+.bbl file. '<name>_comments.log' is rewritten after every run, as batch.py would write it.
+
+A finding is the same across runs when its rule, its file, its message (line numbers left
+out) and the text of its line are the same, so findings that only moved with an edit are
+neither new nor resolved. New findings are printed with '+', resolved ones with '-'.
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import defaultdict
+
+import analyzer
+from Common import registry
+from Common.incremental import LINE_REFERENCE
+from Common.project import load_project
+from Common.resultcache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, ResultCache
+
+POLL_INTERVAL = 0.2     # seconds between two looks at the files
+DEBOUNCE_DELAY = 0.5    # seconds without a write before a run starts
+
+
+def watched_files(filepath):
+    # The main file, its included files and its .bbl file (watched even before it exists)
+    try:
+        files = load_project(filepath).files
+    except OSError:
+        files = [os.path.abspath(filepath)]
+    return files + [analyzer.bbl_path(os.path.abspath(filepath))]
+
+
+def snapshot(files):
+    # (modification time, size) of every file, None for a missing file
+    stamps = {}
+    for path in files:
+        try:
+            status = os.stat(path)
+            stamps[path] = (status.st_mtime_ns, status.st_size)
+        except OSError:
+            stamps[path] = None
+    return stamps
+
+
+def wait_for_change(files, stamps, debounce=DEBOUNCE_DELAY, poll=POLL_INTERVAL):
+    """Blocks until one of the files changes and then stays unchanged for debounce seconds.
+    Returns the new snapshot and the paths that changed."""
+    current = stamps
+    while current == stamps:
+        time.sleep(poll)
+        current = snapshot(files)
+    settled = time.monotonic() + debounce
+    while time.monotonic() < settled:
+        time.sleep(poll)
+        latest = snapshot(files)
+        if latest != current:
+            current = latest
+            settled = time.monotonic() + debounce
+    return current, [path for path in files if current.get(path) != stamps.get(path)]
+
+
+def _unnumbered(message):
+    return LINE_REFERENCE.sub(lambda match: match.group(1) or match.group(3), message)
+
+
+def identities(diagnostics, root_dir, main_name):
+    """Key of every diagnostic that stays the same when the finding only moved to another line."""
+    lines = {}
+
+    def source_line(diagnostic):
+        if diagnostic.line is None:
+            return None
+        name = diagnostic.file or main_name
+        if name not in lines:
+            try:
+                with open(os.path.join(root_dir, name), 'r', errors='ignore') as file:
+                    lines[name] = file.read().split('\n')
+            except OSError:
+                lines[name] = []
+        text = lines[name]
+        return text[diagnostic.line - 1].strip() if 0 < diagnostic.line <= len(text) else None
+
+    return [(diagnostic.rule, diagnostic.file, _unnumbered(diagnostic.message), source_line(diagnostic))
+            for diagnostic in diagnostics]
+
+
+def compare(previous, current):
+    """(new, resolved) between two lists of (identity, Diagnostic). A finding reported twice
+    in both runs is matched twice, one more occurrence is new."""
+    left = defaultdict(list)
+    for identity, diagnostic in previous:
+        left[identity].append(diagnostic)
+    new = []
+    for identity, diagnostic in current:
+        if left[identity]:
+            left[identity].pop()
+        else:
+            new.append(diagnostic)
+    resolved = [diagnostic for diagnostics in left.values() for diagnostic in diagnostics]
+    return new, resolved
+
+
+def describe(diagnostic, main_name):
+    line = diagnostic.line if diagnostic.line is not None else ''
+    return f"{diagnostic.file or main_name}:{line}: {diagnostic.severity}: {diagnostic.message} [{diagnostic.rule}]"
+
+
+def analyze(filepath, cache, checks):
+    # One incremental run, returns the (identity, Diagnostic) pairs and the time it took
+    start = time.perf_counter()
+    diagnostics = []
+    analyzer.analyze_file(filepath, parallel=True, incremental=True, cache=cache, checks=checks,
+                          diagnostics=diagnostics)
+    keys = identities(diagnostics, os.path.dirname(filepath), os.path.basename(filepath))
+    return list(zip(keys, diagnostics)), time.perf_counter() - start
+
+
+def watch(filepath, cache=None, checks=None, debounce=DEBOUNCE_DELAY, poll=POLL_INTERVAL):
+    filepath = os.path.abspath(filepath)
+    main_name = os.path.basename(filepath)
+    files = watched_files(filepath)
+    stamps = snapshot(files)
+    findings, seconds = analyze(filepath, cache, checks)
+    for _, diagnostic in findings:
+        print("  " + describe(diagnostic, main_name))
+    print(f"{len(findings)} finding(s) in {seconds:.2f} s, watching {len(files) - 1} file(s)"
+          f"{' and the .bbl file' if stamps[files[-1]] else ''}. Ctrl+C stops.", flush=True)
+    while True:
+        stamps, changed = wait_for_change(files, stamps, debounce, poll)
+        if stamps[filepath] is None:
+            print(f"{main_name} is gone, waiting for it to come back.", flush=True)
+            continue
+        names = ", ".join(os.path.relpath(path, os.path.dirname(filepath)) for path in changed)
+        try:
+            current, seconds = analyze(filepath, cache, checks)
+        except Exception as e:
+            print(f"{time.strftime('%H:%M:%S')} {names} changed, analysis failed : {e}", flush=True)
+            continue
+        new, resolved = compare(findings, current)
+        findings = current
+        for diagnostic in new:
+            print("+ " + describe(diagnostic, main_name))
+        for diagnostic in resolved:
+            print("- " + describe(diagnostic, main_name))
+        print(f"{time.strftime('%H:%M:%S')} {names} changed : {len(new)} new, {len(resolved)} resolved, "
+              f"{len(findings)} finding(s) in {seconds:.2f} s", flush=True)
+        # The includes may have changed with the edit. The stamps taken before the run stay the
+        # baseline, so a file saved during the run is analyzed again, only new files are stamped now.
+        files = watched_files(filepath)
+        added = [path for path in files if path not in stamps]
+        stamps = {path: stamps[path] for path in files if path in stamps}
+        stamps.update(snapshot(added))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze a LaTeX paper again on every save.")
+    parser.add_argument('path', help="main .tex file of the paper")
+    parser.add_argument('--debounce', type=float, default=DEBOUNCE_DELAY, metavar='SECONDS',
+                        help="quiet time after the last write before a run starts (default: %(default)s)")
+    parser.add_argument('--poll', type=float, default=POLL_INTERVAL, metavar='SECONDS',
+                        help="interval between two looks at the files (default: %(default)s)")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help=f"directory of the result cache (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument('--no-cache', action='store_true', help="neither read nor fill the result cache")
+    parser.add_argument('--include', action='append', default=[], metavar='RULES',
+                        help="only run these checks (rule ids, team names or cost classes, comma separated)")
+    parser.add_argument('--exclude', action='append', default=[], metavar='RULES',
+                        help="do not run these checks (rule ids, team names or cost classes, comma separated)")
+    args = parser.parse_args(argv)
+
+    try:
+        checks = registry.select([name for value in args.include for name in value.split(',') if name],
+                                 [name for value in args.exclude for name in value.split(',') if name])
+    except ValueError as e:
+        parser.error(str(e))
+    if not checks:
+        parser.error("--include and --exclude leave no check to run")
+    try:
+        analyzer.check_resources(checks)
+    except LookupError as e:
+        print(f"{e}\nor leave the checks that need them out with --exclude nlp.", file=sys.stderr)
+        return 1
+    if not os.path.isfile(args.path):
+        print(f"{args.path} is not a file.", file=sys.stderr)
+        return 1
+    cache = None if args.no_cache else ResultCache(args.cache_dir, DEFAULT_MAX_BYTES)
+    try:
+        watch(args.path, cache, checks, args.debounce, args.poll)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        analyzer.shutdown_team_pool()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())